@@ -7,12 +7,21 @@ import { RegionsChart } from '@/components/charts/RegionsChart';
 import { IndustryChart } from '@/components/charts/IndustryChart';
 import { SalaryDistChart } from '@/components/charts/SalaryDistChart';
 import { useDashboardData } from '@/hooks/useDashboardData';
+import { useJobNameSuggestions } from '@/hooks/useJobNameSuggestions';
 import { dashboardConfig } from '@/config/dashboardConfig';
+import type { DashboardPanel } from '@/types/market';
+
+// Only the panels the layout renders (plus the header's meta) are fetched
+const panels: DashboardPanel[] = ['meta', ...dashboardConfig.map((config) => config.type)];
 
 function App() {
   const [searchTerm, setSearchTerm] = useState('');
   const [activeFilter, setActiveFilter] = useState<string | null>(null);
-  const { data, loading, error, refetch } = useDashboardData(activeFilter ?? undefined);
+  const { data, loading, panelLoading, error, refetch } = useDashboardData(
+    activeFilter ?? undefined,
+    panels,
+  );
+  const suggestions = useJobNameSuggestions(searchTerm);
 
   const handleSearch = (e: FormEvent) => {
     e.preventDefault();
@@ -28,15 +37,15 @@ function App() {
   const renderChart = (type: string) => {
     switch (type) {
       case 'trend':
-        return <TrendChart data={data?.trend} loading={loading} />;
+        return <TrendChart data={data?.trend} loading={panelLoading.trend} />;
       case 'skills':
-        return <SkillsChart data={data?.skills} loading={loading} />;
+        return <SkillsChart data={data?.skills} loading={panelLoading.skills} />;
       case 'regions':
-        return <RegionsChart data={data?.regions} loading={loading} />;
+        return <RegionsChart data={data?.regions} loading={panelLoading.regions} />;
       case 'industries':
-        return <IndustryChart data={data?.industries} loading={loading} />;
+        return <IndustryChart data={data?.industries} loading={panelLoading.industries} />;
       case 'salary':
-        return <SalaryDistChart data={data?.salaryDist} loading={loading} />;
+        return <SalaryDistChart data={data?.salaryDist} loading={panelLoading.salary} />;
       default:
         return null;
     }
@@ -65,9 +74,17 @@ function App() {
                 type="text"
                 value={searchTerm}
                 onChange={(e) => setSearchTerm(e.target.value)}
+                list="job-name-suggestions"
                 placeholder="搜尋職缺名稱，例如：Python、前端工程師..."
                 className="w-full pl-10 pr-10 py-2 text-sm border border-slate-200 rounded-xl bg-white/50 focus:outline-none focus:ring-2 focus:ring-primary-500/30 focus:border-primary-500 transition-all"
               />
+              <datalist id="job-name-suggestions">
+                {suggestions.map((suggestion) => (
+                  <option key={`${suggestion.kind}:${suggestion.label}`} value={suggestion.label}>
+                    {suggestion.count.toLocaleString()}
+                  </option>
+                ))}
+              </datalist>
               {searchTerm && (
                 <button
                   type="button"
@@ -1,59 +1,106 @@
-import { useState, useEffect, useCallback } from 'react';
-import type { DashboardData } from '@/types/market';
+import { useState, useEffect, useCallback, useRef } from 'react';
+import type { DashboardData, DashboardPanel } from '@/types/market';
+
+export const ALL_PANELS: DashboardPanel[] = [
+  'meta',
+  'trend',
+  'skills',
+  'regions',
+  'industries',
+  'salary',
+];
+
+// Panel name -> key in DashboardData
+const PANEL_KEYS: Record<DashboardPanel, keyof DashboardData> = {
+  meta: 'meta',
+  trend: 'trend',
+  skills: 'skills',
+  regions: 'regions',
+  industries: 'industries',
+  salary: 'salaryDist',
+};
 
 interface UseDashboardDataResult {
-  data: DashboardData | null;
+  data: Partial<DashboardData> | null;
   loading: boolean;
+  panelLoading: Record<DashboardPanel, boolean>;
   error: string | null;
   refetch: (jobName?: string) => void;
 }
 
+const idle = (): Record<DashboardPanel, boolean> =>
+  Object.fromEntries(ALL_PANELS.map((panel) => [panel, false])) as Record<DashboardPanel, boolean>;
+
 /**
  * Custom hook for fetching dashboard data
- * Handles loading, error states, and refetch capability
+ * Each panel is fetched from its own endpoint (/api/dashboard/{panel}) in parallel,
+ * so charts render as soon as their own data arrives and unused panels are never queried.
  *
  * @param jobName - Optional job name filter for searching jobs
+ * @param panels - Panels to fetch (defaults to all)
  */
-export function useDashboardData(jobName?: string): UseDashboardDataResult {
-  const [data, setData] = useState<DashboardData | null>(null);
-  const [loading, setLoading] = useState(true);
+export function useDashboardData(
+  jobName?: string,
+  panels: DashboardPanel[] = ALL_PANELS,
+): UseDashboardDataResult {
+  const [data, setData] = useState<Partial<DashboardData> | null>(null);
+  const [panelLoading, setPanelLoading] = useState(idle);
   const [error, setError] = useState<string | null>(null);
+  const controllerRef = useRef<AbortController | null>(null);
+  const panelsKey = panels.join(',');
 
   const fetchData = useCallback(async (filterJobName?: string) => {
-    setLoading(true);
+    // Drop responses of a previous filter that are still in flight
+    controllerRef.current?.abort();
+    const controller = new AbortController();
+    controllerRef.current = controller;
+
+    const selected = panelsKey.split(',') as DashboardPanel[];
     setError(null);
+    setPanelLoading((prev) => ({ ...prev, ...Object.fromEntries(selected.map((p) => [p, true])) }));
 
-    try {
-      const params = new URLSearchParams();
-      const searchTerm = filterJobName ?? jobName;
-      if (searchTerm) {
-        params.set('job_name', searchTerm);
-      }
-
-      const url = params.toString()
-        ? `/api/dashboard?${params.toString()}`
-        : '/api/dashboard';
-
-      const response = await fetch(url);
-
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-
-      const result = await response.json() as DashboardData;
-      setData(result);
-    } catch (err) {
-      const errorMessage = err instanceof Error ? err.message : '載入數據失敗';
-      setError(errorMessage);
-      console.error('Failed to fetch dashboard data:', err);
-    } finally {
-      setLoading(false);
+    const params = new URLSearchParams();
+    const searchTerm = filterJobName ?? jobName;
+    if (searchTerm) {
+      params.set('job_name', searchTerm);
     }
-  }, [jobName]);
+    const query = params.toString() ? `?${params.toString()}` : '';
+
+    await Promise.all(
+      selected.map(async (panel) => {
+        try {
+          const response = await fetch(`/api/dashboard/${panel}${query}`, {
+            signal: controller.signal,
+          });
+
+          if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+          }
+
+          const result = await response.json();
+          setData((prev) => ({ ...prev, [PANEL_KEYS[panel]]: result }));
+        } catch (err) {
+          if (controller.signal.aborted) {
+            return;
+          }
+          const errorMessage = err instanceof Error ? err.message : '載入數據失敗';
+          setError(errorMessage);
+          console.error(`Failed to fetch dashboard panel ${panel}:`, err);
+        } finally {
+          if (!controller.signal.aborted) {
+            setPanelLoading((prev) => ({ ...prev, [panel]: false }));
+          }
+        }
+      }),
+    );
+  }, [jobName, panelsKey]);
 
   useEffect(() => {
     fetchData();
+    return () => controllerRef.current?.abort();
   }, [fetchData]);
 
-  return { data, loading, error, refetch: fetchData };
+  const loading = Object.values(panelLoading).some(Boolean);
+
+  return { data, loading, panelLoading, error, refetch: fetchData };
 }
@@ -0,0 +1,49 @@
+import { useEffect, useState } from 'react';
+import type { JobNameSuggestion } from '@/types/market';
+
+const DEBOUNCE_MS = 150;
+
+/**
+ * Typeahead suggestions for the job name search box
+ * Served by /api/job-names/suggest from the backend's in-memory index (no database query),
+ * debounced so only a pause in typing sends a request.
+ *
+ * @param query - Text typed so far
+ */
+export function useJobNameSuggestions(query: string): JobNameSuggestion[] {
+  const [suggestions, setSuggestions] = useState<JobNameSuggestion[]>([]);
+
+  useEffect(() => {
+    const trimmed = query.trim();
+    if (!trimmed) {
+      setSuggestions([]);
+      return;
+    }
+
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const params = new URLSearchParams({ q: trimmed });
+        const response = await fetch(`/api/job-names/suggest?${params.toString()}`, {
+          signal: controller.signal,
+        });
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const result = await response.json();
+        setSuggestions(result.suggestions);
+      } catch (err) {
+        if (!controller.signal.aborted) {
+          console.error('Failed to fetch job name suggestions:', err);
+        }
+      }
+    }, DEBOUNCE_MS);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [query]);
+
+  return suggestions;
+}
@@ -7,6 +7,7 @@ export interface TimeSeriesPoint {
   date: string;
   jobCount: number;
   avgSalary: number;
+  uniqueCount: number; // jobCount without near-duplicate reposts
 }
 
 export interface CategoryPoint {
@@ -29,6 +30,16 @@ export interface DashboardData {
   salaryDist: CategoryPoint[];
 }
 
+/** Panels served by /api/dashboard/{panel} (and selectable with ?panels=) */
+export type DashboardPanel = 'meta' | 'trend' | 'skills' | 'regions' | 'industries' | 'salary';
+
+/** Typeahead entry from /api/job-names/suggest */
+export interface JobNameSuggestion {
+  label: string;
+  kind: 'jobName' | 'jobFamily';
+  count: number;
+}
+
 export interface ChartConfig {
   id: string;
   title: string;
@@ -1,8 +1,11 @@
 from sqlalchemy import (
     JSON,
+    VARBINARY,
     BigInteger,
     Column,
     Date,
+    DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -10,6 +13,7 @@ from sqlalchemy import (
     String,
     Table,
     Text,
+    UniqueConstraint,
     func,
     text,
 )
@@ -38,22 +42,36 @@ salary_type: Table = Table(
     metadata_obj,
     Column("type", Integer, primary_key=True),
     Column("name", String(16)),
+    # 換算成月薪的倍數, 面議/論件計酬無法換算為 NULL
+    Column("monthly_factor", Float, comment="換算月薪倍數"),
 )
 
 # 3. 職缺主表 (dim_job)
 # 用途：核心事實表，包含職缺詳細資訊、薪資與地理位置索引
+# 依 appear_date 做每月 RANGE 分割, 分割由 pipeline 自動新增 (TjmaDatabase.ensure_monthly_partitions),
+# 過期分割可整塊搬到封存表 (TjmaDatabase.archive_partitions)
+# MySQL 分割表的限制:
+#   1. 所有 unique key (含 PK) 都必須包含分割欄位, 所以 PK 為 (id, appear_date), 業務鍵為 (job_id, appear_date)
+#   2. 不支援 foreign key (參照別人或被參照都不行), 所以 salary_type 與下面擴充表/bridge 表的
+#      job_uid 都只保留欄位, 不再宣告 FK
+# 分割前建立的資料庫用 --mode partition 轉換一次 (TjmaDatabase.partition_by_month)
+DIM_JOB_PARTITION_BY = "RANGE COLUMNS(appear_date) (PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+
 dim_job: Table = Table(
     "dim_job",
     metadata_obj,
     # --- 主鍵與業務鍵 ---
     Column("id", BigInteger, primary_key=True, autoincrement=True, comment="內部代理鍵"),
-    Column("job_id", String(40), nullable=False, unique=True, comment="外部業務鍵"),
+    Column("job_id", String(40), nullable=False, comment="外部業務鍵"),
     Column("job_name", String(250)),
+    Column("job_family", String(50), comment="標準化職位類別 (_classify_job_title)"),
     Column("work_type", String(100)),
     # --- 薪資與獎金 ---
-    Column("salary_type", Integer, ForeignKey("salary_type.type"), server_default=text("30")),
+    Column("salary_type", Integer, server_default=text("30"), comment="參照 salary_type.type"),
     Column("salary_min", Integer, server_default=text("0")),
     Column("salary_max", Integer, server_default=text("0")),
+    # ETL 依 salary_type.monthly_factor 預先算好的月薪中位數, 查詢不必逐列計算, 也能走索引
+    Column("salary_monthly_mid", Integer, comment="正規化月薪 (min+max)/2, 無法換算為 NULL"),
     # --- 核心維度 (修正處) ---
     # [修正 1] 對齊 SQL: address_area (20)
     Column("address_area", String(20)),
@@ -66,16 +84,50 @@ dim_job: Table = Table(
     Column("vacation_policy", String(200)),
     # --- 元數據與弱關聯 ---
     Column("cust_no", String(24)),
-    Column("appear_date", Date),
+    # 同公司重複刊登 (換 job_id 重貼) 的近似職缺指向最早的一筆 (src/transformers/dedup.py)
+    Column(
+        "canonical_job_uid",
+        BigInteger,
+        comment="近似重複職缺的代表 dim_job.id, 代表本身為自己的 id; 描述太短無法比對為 NULL",
+    ),
+    Column("appear_date", Date, primary_key=True, comment="分割鍵"),
     Column(
         "updated_date", Date, server_default=text("(CURDATE())")
     ),  # MySQL 需要用 CURDATE() 而非 CURRENT_DATE
+    # web server 的相似職缺索引據此找出某個資料版本之後重新載入 (可能已改寫) 的職缺
+    Column("etl_run_id", BigInteger, comment="最後一次載入此職缺的 etl_runs.id"),
     # --- 索引定義 (修正處) ---
     Index("idx_salary", "salary_min"),
     # [修正 4] 索引欄位名稱需與 Column 定義一致 (原為 city, district)
-    Index("idx_location", "address_area", "address_region"),
-    Index("idx_job_id", "job_id"),
+    # 地區篩選 (縣市 + 鄉鎮區) 再加日期區間, 三者可連續使用索引前綴
+    Index("idx_location", "address_area", "address_region", "appear_date"),
     Index("idx_cust", "cust_no"),
+    # 趨勢圖 (依日期 AVG 月薪) 與日期區間查詢的 covering index
+    Index("idx_appear_salary", "appear_date", "salary_monthly_mid"),
+    # 薪資分布的區間計數可直接做 index range scan
+    Index("idx_salary_monthly", "salary_monthly_mid"),
+    # 職缺列表 (/api/jobs) 依 (appear_date, id) 倒序做 keyset 分頁, 每頁都是固定長度的 index range scan;
+    # 地區/職類篩選各有以其開頭的複合索引, 職類索引同時取代原本的單欄 idx_job_family;
+    # idx_location 雖然也以 address_area 開頭, 但第二欄是 address_region, 只篩縣市時無法依日期順序讀取
+    # (web_server 的 tests/test_query_plans.py 檢查列表查詢用到這些索引且不需 filesort)
+    Index("idx_appear_id", "appear_date", "id"),
+    Index("idx_area_appear", "address_area", "appear_date", "id"),
+    Index("idx_family_appear", "job_family", "appear_date", "id"),
+    # 儀表板常見的多條件篩選組合 (職類 + 地區 / 薪資, 學歷 + 經驗, 薪資類別 + 日期);
+    # 等值條件放前面, 範圍條件 (薪資, 日期) 放最後, 讓 MySQL 能用到完整的索引前綴
+    Index("idx_family_area", "job_family", "address_area", "address_region"),
+    Index("idx_family_salary", "job_family", "salary_monthly_mid"),
+    Index("idx_edu_exp", "edu", "work_exp", "job_family"),
+    Index("idx_salary_type", "salary_type", "appear_date"),
+    Index("idx_canonical", "canonical_job_uid"),
+    Index("idx_etl_run", "etl_run_id"),
+    # 同一職缺 (job_id) 在表內只會有一筆, 但 MySQL 無法在分割表上宣告 job_id 單獨 unique,
+    # 這由 pipeline 保證: appear_date 變動時先用 sync_partition_column 把舊列搬到新日期, upsert 才會
+    # 命中同一列。不經 pipeline 直接寫入 dim_job 需自行比照處理, 否則會出現同 job_id 不同日期的兩列。
+    # 這個 key 以 job_id 開頭, 也就是依 job_id 查詢用的索引 (原本的 idx_job_id 因此移除)
+    UniqueConstraint("job_id", "appear_date", name="uq_job_appear"),
+    mysql_partition_by=DIM_JOB_PARTITION_BY,
+    info={"dropped_indexes": ("idx_job_id",)},
 )
 
 
@@ -85,8 +137,8 @@ dim_job: Table = Table(
 job_detail: Table = Table(
     "job_detail",
     metadata_obj,
-    # job_uid 同時是 PK 與 FK，構成 1:1 關係
-    Column("job_uid", BigInteger, ForeignKey("dim_job.id", ondelete="CASCADE"), primary_key=True),
+    # job_uid 同時是 PK 與 dim_job.id 的邏輯參照，構成 1:1 關係 (dim_job 為分割表, 無法宣告 FK)
+    Column("job_uid", BigInteger, primary_key=True),
     Column("need_emp", String(20)),
     Column("manage_resp", String(50)),
     Column("business_trip", String(50)),
@@ -101,7 +153,7 @@ job_detail: Table = Table(
 welfare: Table = Table(
     "welfare",
     metadata_obj,
-    Column("job_uid", BigInteger, ForeignKey("dim_job.id", ondelete="CASCADE"), primary_key=True),
+    Column("job_uid", BigInteger, primary_key=True),
     Column("tags", JSON, comment="福利標籤 List"),
     Column("legal_tags", JSON, comment="法定標籤 List"),
     Column("welfare_description", Text),
@@ -112,32 +164,69 @@ welfare: Table = Table(
 )
 
 # ==========================================
-# 5. Bridge Tables (Many-to-Many Associations)
+# 5. Dictionary Tables (名稱字典表)
 # ==========================================
+# 技能/專長/職類名稱只在字典表存一次, bridge 表只存整數 id, 讓 PK 與 GROUP BY 都走短的整數
+# 名稱用 utf8mb4_bin, 與 transformer 端 name -> id 快取的比對規則 (大小寫敏感) 一致
+
+dim_skill: Table = Table(
+    "dim_skill",
+    metadata_obj,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("skill_name", String(250, collation="utf8mb4_bin"), nullable=False, unique=True),
+    comment="技能字典表",
+)
+
+dim_specialty: Table = Table(
+    "dim_specialty",
+    metadata_obj,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("specialty_name", String(250, collation="utf8mb4_bin"), nullable=False, unique=True),
+    comment="專長字典表",
+)
+
+dim_category: Table = Table(
+    "dim_category",
+    metadata_obj,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("category_name", String(100, collation="utf8mb4_bin"), nullable=False, unique=True),
+    comment="職類字典表",
+)
+
+# ==========================================
+# 6. Bridge Tables (Many-to-Many Associations)
+# ==========================================
+# 技能/專長/職類在字典表之前的 schema 存名稱欄位 (info["legacy_columns"]);
+# create_tables 遇到還有這些欄位的表會中止, 需先執行 info["migration"] 指定的模式轉成字典表 id
 
 # 技能表
 bridge_skills: Table = Table(
     "bridge_skills",
     metadata_obj,
-    Column("job_uid", BigInteger, ForeignKey("dim_job.id", ondelete="CASCADE"), primary_key=True),
-    Column("skill_name", String(250), primary_key=True),  # 複合主鍵
+    Column("job_uid", BigInteger, primary_key=True),
+    Column("skill_id", Integer, ForeignKey("dim_skill.id"), primary_key=True),  # 複合主鍵
+    # 依技能彙總 (GROUP BY skill_id) 時可以只掃這個索引
+    Index("idx_skill_id", "skill_id"),
     comment="職缺-技能關聯表",
+    info={"legacy_columns": ("skill_name",), "migration": "dictionary"},
 )
 
 # 專長表
 bridge_specialties: Table = Table(
     "bridge_specialties",
     metadata_obj,
-    Column("job_uid", BigInteger, ForeignKey("dim_job.id", ondelete="CASCADE"), primary_key=True),
-    Column("specialty_name", String(250), primary_key=True),
+    Column("job_uid", BigInteger, primary_key=True),
+    Column("specialty_id", Integer, ForeignKey("dim_specialty.id"), primary_key=True),
+    Index("idx_specialty_id", "specialty_id"),
     comment="職缺-專長關聯表",
+    info={"legacy_columns": ("specialty_name",), "migration": "dictionary"},
 )
 
 # 科系表
 bridge_major: Table = Table(
     "bridge_major",
     metadata_obj,
-    Column("job_uid", BigInteger, ForeignKey("dim_job.id", ondelete="CASCADE"), primary_key=True),
+    Column("job_uid", BigInteger, primary_key=True),
     Column("major_name", String(50), primary_key=True),
     comment="職缺-科系要求關聯表",
 )
@@ -146,16 +235,31 @@ bridge_major: Table = Table(
 bridge_category: Table = Table(
     "bridge_category",
     metadata_obj,
-    Column("job_uid", BigInteger, ForeignKey("dim_job.id", ondelete="CASCADE"), primary_key=True),
-    Column("category_name", String(100), primary_key=True),
+    Column("job_uid", BigInteger, primary_key=True),
+    Column("category_id", Integer, ForeignKey("dim_category.id"), primary_key=True),
+    Index("idx_category_id", "category_id"),
     comment="職缺-職類關聯表",
+    info={"legacy_columns": ("category_name",), "migration": "dictionary"},
+)
+
+# 從職缺描述比對出的技能/專長 (src/transformers/skill_extractor.py)
+# 不論 condition.skill / condition.specialty 有沒有填都會比對, name_id 依 kind 指向不同字典表, 所以不宣告 FK
+bridge_extracted_skill: Table = Table(
+    "bridge_extracted_skill",
+    metadata_obj,
+    Column("job_uid", BigInteger, primary_key=True),
+    Column("kind", String(10), primary_key=True, comment="skill 或 specialty"),
+    Column("name_id", Integer, primary_key=True, comment="dim_skill.id 或 dim_specialty.id"),
+    Column("match_count", Integer, nullable=False, comment="名稱在描述中出現的次數"),
+    Index("idx_kind_name", "kind", "name_id"),
+    comment="職缺描述抽取的技能/專長關聯表",
 )
 
 # 語言表 (含屬性欄位)
 bridge_language: Table = Table(
     "bridge_language",
     metadata_obj,
-    Column("job_uid", BigInteger, ForeignKey("dim_job.id", ondelete="CASCADE"), primary_key=True),
+    Column("job_uid", BigInteger, primary_key=True),
     Column("language", String(50), primary_key=True),  # 複合主鍵
     # 關聯屬性 (Association Attributes)
     Column("listening", String(30)),
@@ -164,3 +268,156 @@ bridge_language: Table = Table(
     Column("writing", String(30)),
     comment="職缺-語言能力要求表",
 )
+
+# ==========================================
+# 7. ETL 執行紀錄
+# ==========================================
+# 每次 bronze_to_silver 成功結束時寫入一筆, 最新的 id 就是 silver 資料的版本號
+# web server 只需 SELECT MAX(id) 就能判斷快取是否過期
+etl_runs: Table = Table(
+    "etl_runs",
+    metadata_obj,
+    Column("id", BigInteger, primary_key=True, autoincrement=True, comment="資料版本號"),
+    Column("finished_at", DateTime, server_default=func.now()),
+    Column("job_count", Integer, comment="本次載入的職缺數"),
+    Column("job_name_regex", String(250)),
+    comment="ETL 執行紀錄 (資料版本)",
+)
+
+# ==========================================
+# 8. 彙總表 (Materialized Aggregates)
+# ==========================================
+# 由 bronze_to_silver 依本批職缺增量維護 (見 src/loaders/aggregates.py), 所有彙總都以 job_family 分組,
+# dashboard 在沒有 job_name 篩選時直接讀這些小表, 成本與 dim_job 大小無關
+# 維度值為 NULL 的 (e.g. 沒有地區) 以空字串存放, 因為 PK 欄位不可為 NULL
+
+# 每日職缺數與月薪加總 (平均月薪 = salary_sum / salary_count)
+agg_daily_jobs: Table = Table(
+    "agg_daily_jobs",
+    metadata_obj,
+    Column("appear_date", Date, primary_key=True),
+    Column("job_family", String(50), primary_key=True),
+    Column("job_count", BigInteger, nullable=False),
+    Column("salary_sum", BigInteger, nullable=False, comment="salary_monthly_mid 加總"),
+    Column("salary_count", BigInteger, nullable=False, comment="有 salary_monthly_mid 的職缺數"),
+    Column(
+        "unique_count",
+        BigInteger,
+        nullable=False,
+        server_default=text("0"),
+        comment="不含近似重複刊登的職缺數 (canonical_job_uid 為自己或 NULL)",
+    ),
+    comment="每日職缺數彙總",
+)
+
+agg_skill_counts: Table = Table(
+    "agg_skill_counts",
+    metadata_obj,
+    Column("job_family", String(50), primary_key=True),
+    Column("skill_id", Integer, primary_key=True),
+    Column("job_count", BigInteger, nullable=False),
+    comment="技能職缺數彙總",
+)
+
+# 每週各技能 / 專長的職缺數, web server 由此計算「成長最快的技能」; week 存該週週一
+agg_skill_weekly: Table = Table(
+    "agg_skill_weekly",
+    metadata_obj,
+    Column("week", Date, primary_key=True, comment="appear_date 所在週的週一"),
+    Column("job_family", String(50), primary_key=True),
+    Column("skill_id", Integer, primary_key=True),
+    Column("job_count", BigInteger, nullable=False),
+    comment="每週技能職缺數彙總",
+)
+
+agg_specialty_weekly: Table = Table(
+    "agg_specialty_weekly",
+    metadata_obj,
+    Column("week", Date, primary_key=True, comment="appear_date 所在週的週一"),
+    Column("job_family", String(50), primary_key=True),
+    Column("specialty_id", Integer, primary_key=True),
+    Column("job_count", BigInteger, nullable=False),
+    comment="每週專長職缺數彙總",
+)
+
+agg_region_counts: Table = Table(
+    "agg_region_counts",
+    metadata_obj,
+    Column("job_family", String(50), primary_key=True),
+    Column("address_area", String(20), primary_key=True),
+    Column("job_count", BigInteger, nullable=False),
+    comment="地區職缺數彙總",
+)
+
+agg_industry_counts: Table = Table(
+    "agg_industry_counts",
+    metadata_obj,
+    Column("job_family", String(50), primary_key=True),
+    Column("industry", String(100), primary_key=True),
+    Column("job_count", BigInteger, nullable=False),
+    comment="產業職缺數彙總",
+)
+
+agg_salary_buckets: Table = Table(
+    "agg_salary_buckets",
+    metadata_obj,
+    Column("job_family", String(50), primary_key=True),
+    Column("salary_bucket", Integer, primary_key=True, comment="月薪區間下限"),
+    Column("job_count", BigInteger, nullable=False),
+    comment="月薪區間職缺數彙總",
+)
+
+# 地區 → 鄉鎮區 → 職類 → 月份的 drill-down cube; 任意切片或上捲 (e.g. 台北市各區, 單一區逐月)
+# 都由這張表 GROUP BY 回答, 不必掃 dim_job. PK 順序讓縣市 / 縣市 + 區的切片走 PK 前綴
+agg_region_cube: Table = Table(
+    "agg_region_cube",
+    metadata_obj,
+    Column("address_area", String(20), primary_key=True),
+    Column("address_region", String(30), primary_key=True),
+    Column("job_family", String(50), primary_key=True),
+    Column("month", Date, primary_key=True, comment="appear_date 所在月份的 1 號"),
+    Column("job_count", BigInteger, nullable=False),
+    Column("salary_sum", BigInteger, nullable=False, comment="salary_monthly_mid 加總"),
+    Column("salary_count", BigInteger, nullable=False, comment="有 salary_monthly_mid 的職缺數"),
+    # 只依職類 / 月份切片時使用
+    Index("idx_cube_family_month", "job_family", "month"),
+    comment="地區 / 職類 / 月份職缺數彙總 (drill-down cube)",
+)
+
+# ==========================================
+# 9. 全文檢索表 (FULLTEXT Search)
+# ==========================================
+# MySQL 的分割表不支援 FULLTEXT 索引, 所以 job_name 另存一份到未分割的 job_search
+# ngram parser 讓中文職稱也能斷詞; 被封存的職缺列會留著, 查詢時一律 JOIN dim_job 過濾
+job_search: Table = Table(
+    "job_search",
+    metadata_obj,
+    Column("job_uid", BigInteger, primary_key=True, autoincrement=False, comment="參照 dim_job.id"),
+    Column("job_name", String(250)),
+    Index("ft_job_name", "job_name", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+    comment="職缺名稱全文檢索表",
+)
+
+
+# ==========================================
+# 10. 近似重複偵測 (MinHash / LSH)
+# ==========================================
+# 每個職缺描述的 MinHash 簽章; 新批次只與 bucket 相同的職缺比對, 不必重算舊職缺的簽章
+job_minhash: Table = Table(
+    "job_minhash",
+    metadata_obj,
+    Column("job_uid", BigInteger, primary_key=True, autoincrement=False, comment="參照 dim_job.id"),
+    Column("cust_no", String(24)),
+    Column("signature", VARBINARY(256), nullable=False, comment="NUM_PERM 個 uint32"),
+    comment="職缺描述 MinHash 簽章",
+)
+
+# LSH bucket: 簽章每一段 (連同 cust_no 與段號) 的雜湊, 相同 band_hash 的職缺即為候選
+job_minhash_band: Table = Table(
+    "job_minhash_band",
+    metadata_obj,
+    Column("band_hash", BigInteger, primary_key=True, autoincrement=False),
+    Column("job_uid", BigInteger, primary_key=True, autoincrement=False),
+    Index("idx_minhash_band_job", "job_uid"),
+    comment="職缺描述 MinHash LSH bucket",
+)
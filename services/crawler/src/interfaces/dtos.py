@@ -18,11 +18,13 @@ class DimJob(pa.DataFrameModel):
     # 注意: id (Auto Increment) 通常在 Insert 前的 DataFrame 不存在，故不列入驗證
     job_id: Series[str] = pa.Field()
     job_name: Series[str] = pa.Field()
+    job_family: Series[str] = pa.Field()
     work_type: Series[str] = pa.Field(nullable=True)
 
     salary_type: Series[int] = pa.Field(isin=[10, 20, 30, 40, 50, 60, 70])
     salary_min: Series[int] = pa.Field(ge=0)
     salary_max: Series[int] = pa.Field(ge=0)
+    salary_monthly_mid: Series[pd.Int64Dtype] = pa.Field(ge=0, nullable=True)
 
     address_area: Series[str] = pa.Field()
     address_region: Series[str] = pa.Field()
@@ -56,6 +58,15 @@ class JobDetail(pa.DataFrameModel):
         strict = True
 
 
+class JobSearch(pa.DataFrameModel):
+    job_uid: Series[int] = pa.Field()
+    job_name: Series[str] = pa.Field()
+
+    class Config:
+        coerce = True
+        strict = True
+
+
 class Welfare(pa.DataFrameModel):
     job_uid: Series[int] = pa.Field(coerce=True)
     tags: Series[object] = pa.Field()  # list of strings
@@ -103,6 +114,48 @@ class Category(pa.DataFrameModel):
         strict = True  # 嚴格模式 (DataFrame 不能有 Schema 未定義的欄位)
 
 
+# --- Dictionary-encoded Bridge Tables ---
+# 名稱經 NameIdCache 轉成字典表 id 後, 實際寫入 bridge 表的形狀
+
+
+class SkillBridge(pa.DataFrameModel):
+    job_uid: Series[int] = pa.Field()
+    skill_id: Series[int] = pa.Field()
+
+    class Config:
+        coerce = True
+        strict = True
+
+
+class SpecialtyBridge(pa.DataFrameModel):
+    job_uid: Series[int] = pa.Field()
+    specialty_id: Series[int] = pa.Field()
+
+    class Config:
+        coerce = True
+        strict = True
+
+
+class CategoryBridge(pa.DataFrameModel):
+    job_uid: Series[int] = pa.Field()
+    category_id: Series[int] = pa.Field()
+
+    class Config:
+        coerce = True
+        strict = True
+
+
+class ExtractedSkillBridge(pa.DataFrameModel):
+    job_uid: Series[int] = pa.Field()
+    kind: Series[str] = pa.Field(isin=["skill", "specialty"])
+    name_id: Series[int] = pa.Field()
+    match_count: Series[int] = pa.Field(ge=1)
+
+    class Config:
+        coerce = True
+        strict = True
+
+
 class Language(pa.DataFrameModel):
     job_uid: Series[int] = pa.Field()
     language: Series[str] = pa.Field()
@@ -1,6 +1,7 @@
 import sqlalchemy as sa
 import pandas as pd
 from collections.abc import Iterator
+from datetime import date
 from typing import Protocol
 
 
@@ -13,6 +14,8 @@ class BronzeJobRepository(Protocol):
 class SilverJobRepository(Protocol):
     def insert_stage(self, table: sa.Table, df: pd.DataFrame) -> None: ...
 
+    def replace_stage(self, table: sa.Table, df: pd.DataFrame, job_uids: list[int]) -> None: ...
+
     def select_stage(
         self,
         table: sa.Table,
@@ -20,6 +23,39 @@ class SilverJobRepository(Protocol):
         condition: dict | None = None,
     ) -> pd.DataFrame: ...
 
+    def ensure_monthly_partitions(self, table: sa.Table, since: date, until: date) -> list[str]: ...
+
+    def sync_partition_column(
+        self, table: sa.Table, df: pd.DataFrame, key_col: str, partition_col: str
+    ) -> None: ...
+
+    def select_aggregate_contributions(self, job_ids: list[str]) -> dict[str, pd.DataFrame]: ...
+
+    def select_job_ids_with_industry_change(self, cust_df: pd.DataFrame) -> list[str]: ...
+
+    def apply_aggregate_deltas(self, deltas: dict[str, pd.DataFrame]) -> None: ...
+
+    def iter_job_descriptions(
+        self, batch_size: int = 5000
+    ) -> Iterator[list[tuple[int, str | None]]]: ...
+
+    def select_minhash_candidates(self, band_hashes: list[int]) -> pd.DataFrame: ...
+
+    def replace_minhash(
+        self, signature_df: pd.DataFrame, band_df: pd.DataFrame, job_uids: list[int]
+    ) -> None: ...
+
+    def update_canonical_job_uids(self, canonical_df: pd.DataFrame) -> None: ...
+
+    def iter_jobs_for_dedup(self, batch_size: int = 5000) -> Iterator[pd.DataFrame]: ...
+
+    def record_etl_run(
+        self,
+        job_count: int | None = None,
+        job_name_regex: str | None = None,
+        jobs: pd.DataFrame | None = None,
+    ) -> int: ...
+
 
 class Crawler(Protocol):
     def harvest_jobs(self, keyword, area) -> Iterator: ...
@@ -0,0 +1,188 @@
+from dataclasses import dataclass
+
+import sqlalchemy as sa
+
+from config.mysql_schema import (
+    agg_daily_jobs,
+    agg_industry_counts,
+    agg_region_counts,
+    agg_region_cube,
+    agg_salary_buckets,
+    agg_skill_counts,
+    agg_skill_weekly,
+    agg_specialty_weekly,
+)
+
+# 月薪區間下限, 需與 web server 的 DatabaseRepository.SALARY_BUCKETS 對齊
+SALARY_BUCKET_BOUNDS = (0, 30000, 40000, 50000, 60000, 80000, 100000)
+
+
+@dataclass(frozen=True)
+class AggregateSpec:
+    """
+    一張彙總表的定義。
+
+    query 需輸出 keys + measures 欄位, 並保留 {where} 讓呼叫端帶入條件;
+    conditions 是這個彙總本身固定的條件 (e.g. 只算有月薪的職缺)。
+    """
+
+    table: sa.Table
+    keys: tuple[str, ...]
+    measures: tuple[str, ...]
+    query: str
+    conditions: tuple[str, ...] = ()
+
+    def select_sql(self, extra_conditions: tuple[str, ...] = ()) -> str:
+        conditions = self.conditions + extra_conditions
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.query.format(where=where)
+
+
+def _week_start(column: str) -> str:
+    """該日期所在週的週一 (WEEKDAY: 週一 = 0)。"""
+    return f"DATE_SUB({column}, INTERVAL WEEKDAY({column}) DAY)"
+
+
+def _salary_bucket_case(column: str) -> str:
+    whens = " ".join(
+        f"WHEN {column} >= {bound} THEN {bound}" for bound in reversed(SALARY_BUCKET_BOUNDS[1:])
+    )
+    return f"CASE {whens} ELSE {SALARY_BUCKET_BOUNDS[0]} END"
+
+
+# 每個 job 對彙總表的「貢獻」都用同一組 SQL 計算:
+# 不帶條件 = 全表重建, 帶 job_id 條件 = 只算本批職缺 (增量維護用)
+AGGREGATES: dict[str, AggregateSpec] = {
+    "daily": AggregateSpec(
+        table=agg_daily_jobs,
+        keys=("appear_date", "job_family"),
+        measures=("job_count", "salary_sum", "salary_count", "unique_count"),
+        # 近似重複的刊登只算代表那一筆 (canonical_job_uid 見 src/transformers/dedup.py)
+        query="""
+            SELECT
+                dj.appear_date,
+                COALESCE(dj.job_family, '') AS job_family,
+                COUNT(*) AS job_count,
+                COALESCE(SUM(dj.salary_monthly_mid), 0) AS salary_sum,
+                COUNT(dj.salary_monthly_mid) AS salary_count,
+                COALESCE(SUM(dj.canonical_job_uid IS NULL OR dj.canonical_job_uid = dj.id), 0)
+                    AS unique_count
+            FROM dim_job dj
+            {where}
+            GROUP BY dj.appear_date, COALESCE(dj.job_family, '')
+        """,
+    ),
+    "skills": AggregateSpec(
+        table=agg_skill_counts,
+        keys=("job_family", "skill_id"),
+        measures=("job_count",),
+        query="""
+            SELECT
+                COALESCE(dj.job_family, '') AS job_family,
+                bs.skill_id,
+                COUNT(*) AS job_count
+            FROM bridge_skills bs
+            JOIN dim_job dj ON bs.job_uid = dj.id
+            {where}
+            GROUP BY COALESCE(dj.job_family, ''), bs.skill_id
+        """,
+    ),
+    "skills_weekly": AggregateSpec(
+        table=agg_skill_weekly,
+        keys=("week", "job_family", "skill_id"),
+        measures=("job_count",),
+        query=f"""
+            SELECT
+                {_week_start("dj.appear_date")} AS week,
+                COALESCE(dj.job_family, '') AS job_family,
+                bs.skill_id,
+                COUNT(*) AS job_count
+            FROM bridge_skills bs
+            JOIN dim_job dj ON bs.job_uid = dj.id
+            {{where}}
+            GROUP BY week, COALESCE(dj.job_family, ''), bs.skill_id
+        """,
+    ),
+    "specialties_weekly": AggregateSpec(
+        table=agg_specialty_weekly,
+        keys=("week", "job_family", "specialty_id"),
+        measures=("job_count",),
+        query=f"""
+            SELECT
+                {_week_start("dj.appear_date")} AS week,
+                COALESCE(dj.job_family, '') AS job_family,
+                bsp.specialty_id,
+                COUNT(*) AS job_count
+            FROM bridge_specialties bsp
+            JOIN dim_job dj ON bsp.job_uid = dj.id
+            {{where}}
+            GROUP BY week, COALESCE(dj.job_family, ''), bsp.specialty_id
+        """,
+    ),
+    "regions": AggregateSpec(
+        table=agg_region_counts,
+        keys=("job_family", "address_area"),
+        measures=("job_count",),
+        query="""
+            SELECT
+                COALESCE(dj.job_family, '') AS job_family,
+                COALESCE(dj.address_area, '') AS address_area,
+                COUNT(*) AS job_count
+            FROM dim_job dj
+            {where}
+            GROUP BY COALESCE(dj.job_family, ''), COALESCE(dj.address_area, '')
+        """,
+    ),
+    "industries": AggregateSpec(
+        table=agg_industry_counts,
+        keys=("job_family", "industry"),
+        measures=("job_count",),
+        query="""
+            SELECT
+                COALESCE(dj.job_family, '') AS job_family,
+                COALESCE(ci.industry, '') AS industry,
+                COUNT(*) AS job_count
+            FROM dim_job dj
+            JOIN cust_info ci ON dj.cust_no = ci.cust_no
+            {where}
+            GROUP BY COALESCE(dj.job_family, ''), COALESCE(ci.industry, '')
+        """,
+    ),
+    "salary_buckets": AggregateSpec(
+        table=agg_salary_buckets,
+        keys=("job_family", "salary_bucket"),
+        measures=("job_count",),
+        query=f"""
+            SELECT
+                COALESCE(dj.job_family, '') AS job_family,
+                {_salary_bucket_case("dj.salary_monthly_mid")} AS salary_bucket,
+                COUNT(*) AS job_count
+            FROM dim_job dj
+            {{where}}
+            GROUP BY COALESCE(dj.job_family, ''), salary_bucket
+        """,
+        conditions=("dj.salary_monthly_mid IS NOT NULL",),
+    ),
+    "region_cube": AggregateSpec(
+        table=agg_region_cube,
+        keys=("address_area", "address_region", "job_family", "month"),
+        measures=("job_count", "salary_sum", "salary_count"),
+        query="""
+            SELECT
+                COALESCE(dj.address_area, '') AS address_area,
+                COALESCE(dj.address_region, '') AS address_region,
+                COALESCE(dj.job_family, '') AS job_family,
+                DATE_SUB(dj.appear_date, INTERVAL DAYOFMONTH(dj.appear_date) - 1 DAY) AS month,
+                COUNT(*) AS job_count,
+                COALESCE(SUM(dj.salary_monthly_mid), 0) AS salary_sum,
+                COUNT(dj.salary_monthly_mid) AS salary_count
+            FROM dim_job dj
+            {where}
+            GROUP BY
+                COALESCE(dj.address_area, ''),
+                COALESCE(dj.address_region, ''),
+                COALESCE(dj.job_family, ''),
+                month
+        """,
+    ),
+}
@@ -0,0 +1,166 @@
+"""
+職缺描述 (job_detail.job_description) 的倒排索引。
+
+ETL 每次載入後重建, 以 .npy 檔發布到 DESCRIPTION_INDEX_DIR, web server 用 memory map
+開啟並以排序陣列交集查詢, 描述全文檢索不需要掃 MySQL 的 TEXT 欄位。
+
+目錄結構:
+    CURRENT          目前版本的子目錄名稱 (以 os.replace 原子更新)
+    <build_id>/
+        terms.npy    排序過的 term (UTF-8 bytes)
+        offsets.npy  每個 term 的 postings 起點 (int64), 長度為 term 數 + 1
+        postings.npy 文件編號 (int32), 同一 term 內遞增
+        jobs.npy     文件編號 -> dim_job.id (int64); 文件依 appear_date, id 由新到舊編號
+        meta.json    建置時間與大小
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+from array import array
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = "data/description_index"
+POINTER_FILE = "CURRENT"
+
+# 斷詞規則需與 web server 的 src.db.similar.tokenize_description 及
+# src.db.description_index.MAX_TERM_BYTES 對齊, 否則查詢的 term 對不上索引
+CJK_RUN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+LATIN_WORD = re.compile(r"[a-z0-9][a-z0-9+#]+")
+# 過長的英文字 (網址、雜湊) 截斷, 讓 terms.npy 的固定寬度維持精簡; CJK bigram 為 6 bytes
+MAX_TERM_BYTES = 32
+
+
+def description_terms(text: str) -> set[str]:
+    """描述中不重複的 term: 小寫英文字 (截斷至 MAX_TERM_BYTES) 與 CJK bigram (單字則為本身)。"""
+    text = text.lower()
+    terms = {word[:MAX_TERM_BYTES] for word in LATIN_WORD.findall(text)}
+    for run in CJK_RUN.findall(text):
+        if len(run) == 1:
+            terms.add(run)
+        else:
+            terms.update(run[i : i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def index_directory() -> Path:
+    return Path(os.getenv("DESCRIPTION_INDEX_DIR", DEFAULT_DIRECTORY))
+
+
+class DescriptionIndexBuilder:
+    """
+    逐筆加入職缺描述, 最後一次寫出排序好的 postings。
+
+    (term id, 文件編號) 以 array 累積, 文件依加入順序編號, 所以穩定排序 term id 後
+    每個 term 的 postings 自然遞增, 不需要再排序。
+    """
+
+    KEEP_BUILDS = 2  # 保留前一版, web server 切換前仍可能開著它
+
+    def __init__(self) -> None:
+        self.vocabulary: dict[str, int] = {}
+        self.job_uids = array("q")
+        self.term_ids = array("i")
+        self.rows = array("i")
+
+    def __len__(self) -> int:
+        return len(self.job_uids)
+
+    def add(self, job_uid: int, description: str | None) -> None:
+        row = len(self.job_uids)
+        self.job_uids.append(job_uid)
+        for term in description_terms(description or ""):
+            term_id = self.vocabulary.setdefault(term, len(self.vocabulary))
+            self.term_ids.append(term_id)
+            self.rows.append(row)
+
+    def _arrays(self) -> dict[str, np.ndarray]:
+        """依 term 排序後的 terms / offsets / postings / jobs 陣列。"""
+        encoded = [term.encode() for term in self.vocabulary]
+        width = max((len(term) for term in encoded), default=1)
+        terms = np.array(encoded, dtype=f"S{width}")
+        order = np.argsort(terms, kind="stable")
+        # 原 term id -> 排序後的 term id
+        rank = np.empty(order.size, dtype=np.int64)
+        rank[order] = np.arange(order.size)
+
+        term_ids = rank[np.frombuffer(self.term_ids, dtype=np.int32)]
+        by_term = np.argsort(term_ids, kind="stable")
+        counts = np.bincount(term_ids, minlength=order.size)
+        return {
+            "terms": terms[order],
+            "offsets": np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            "postings": np.frombuffer(self.rows, dtype=np.int32)[by_term],
+            "jobs": np.frombuffer(self.job_uids, dtype=np.int64).copy(),
+        }
+
+    def publish(self, directory: Path) -> Path:
+        """
+        寫到新的子目錄後再切換 CURRENT, 讀取端不會看到寫到一半的索引。
+
+        Args:
+            directory: 索引根目錄 (DESCRIPTION_INDEX_DIR)
+
+        Returns:
+            新版本的子目錄
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        build_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        staging = directory / f".{build_id}.tmp"
+        staging.mkdir()
+
+        arrays = self._arrays()
+        for name, values in arrays.items():
+            np.save(staging / f"{name}.npy", values)
+        meta = {
+            "builtAt": datetime.now().isoformat(timespec="seconds"),
+            "jobs": len(arrays["jobs"]),
+            "terms": len(arrays["terms"]),
+            "postings": len(arrays["postings"]),
+        }
+        (staging / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+        target = directory / build_id
+        staging.rename(target)
+        pointer = directory / f".{POINTER_FILE}.tmp"
+        pointer.write_text(build_id, encoding="utf-8")
+        os.replace(pointer, directory / POINTER_FILE)
+
+        # build_id 依時間排序, 只留最新的幾版
+        builds = sorted(p for p in directory.iterdir() if p.is_dir() and not p.name.startswith("."))
+        for old in builds[: -self.KEEP_BUILDS]:
+            shutil.rmtree(old, ignore_errors=True)
+        return target
+
+
+def build_description_index(
+    batches: Iterable[list[tuple[int, str | None]]], directory: Path | None = None
+) -> Path:
+    """
+    從 (job_uid, job_description) 批次建立並發布描述倒排索引。
+
+    Args:
+        batches: 依 appear_date, id 由新到舊排序的職缺批次 (TjmaDatabase.iter_job_descriptions)
+        directory: 索引根目錄, 預設取 DESCRIPTION_INDEX_DIR
+
+    Returns:
+        新版本的子目錄
+    """
+    builder = DescriptionIndexBuilder()
+    for batch in batches:
+        for job_uid, description in batch:
+            builder.add(job_uid, description)
+    target = builder.publish(directory or index_directory())
+    logger.info(
+        f"Published description index {target.name}: {len(builder)} jobs, "
+        f"{len(builder.vocabulary)} terms, {len(builder.rows)} postings."
+    )
+    return target
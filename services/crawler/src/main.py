@@ -1,25 +1,36 @@
 import logging
+import time
 from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import click
 import pandas as pd
+import sqlalchemy as sa
 
 from config.config_log import set_up_logging
 from config.mysql_schema import (
     bridge_category,
+    bridge_extracted_skill,
     bridge_language,
     bridge_major,
     bridge_skills,
     bridge_specialties,
     cust_info,
+    dim_category,
     dim_job,
+    dim_skill,
+    dim_specialty,
     job_detail,
+    job_search,
     metadata_obj,
     salary_type,
     welfare,
 )
+from src.interfaces.dtos import CategoryBridge, SkillBridge, SpecialtyBridge
 from src.interfaces.interfaces import BronzeJobRepository, SilverJobRepository
 from src.extractors.crawler import Crawler, OneZeroFourCrawler
+from src.loaders.aggregates import AGGREGATES
+from src.loaders.description_index import build_description_index
 from src.loaders.repo import MongoDB_one_zero_four
 from src.loaders.sql_repo import TjmaDatabase
 from src.transformers.cleaner import (
@@ -28,6 +39,10 @@ from src.transformers.cleaner import (
     make_dim_job,
     make_original_df,
 )
+from src.transformers.aggregates import diff_aggregate_contributions
+from src.transformers.dedup import Deduplicator
+from src.transformers.dictionary import NameIdCache
+from src.transformers.skill_extractor import SkillExtractor
 
 set_up_logging(debug=False)
 logger = logging.getLogger(__name__)
@@ -37,17 +52,33 @@ logger = logging.getLogger(__name__)
 
 class JobDataPipeline:
     BATCH_SIZE = 100
+    LOAD_WORKERS = 4  # 同時寫入 silver 表的 thread 數, 需 <= silver repo 的 connection pool 大小
+
+    # bridge DataFrame 名稱 -> (字典表, 名稱欄位, bridge 的 id 欄位, 輸出 schema)
+    DICTIONARY_BRIDGES = {
+        "skills": (dim_skill, "skill_name", "skill_id", SkillBridge),
+        "specialties": (dim_specialty, "specialty_name", "specialty_id", SpecialtyBridge),
+        "category": (dim_category, "category_name", "category_id", CategoryBridge),
+    }
+    # 從描述抽取技能時比對的字典表: bridge_extracted_skill.kind -> DICTIONARY_BRIDGES 的 key
+    EXTRACTION_VOCABULARIES = {"skill": "skills", "specialty": "specialties"}
+    # 每次都整批取代 (先刪本批職缺的舊列) 而非 upsert 的表
+    REPLACED_TABLES = (bridge_extracted_skill,)
 
     def __init__(
         self,
         crawler: Crawler,
         bronze_repo: BronzeJobRepository,
         silver_repo: SilverJobRepository | None = None,
+        load_workers: int | None = None,
     ):
         # 有在猶豫無狀態是否還要弄成 class, 最終決定避免在一次任務中重複建立 instance
         self.crawler = crawler
         self.bronze_repo = bronze_repo
         self.silver_repo = silver_repo
+        self.load_workers = load_workers or self.LOAD_WORKERS
+        # 字典表的 name -> id 快取, 跟著 pipeline instance 存活, 重複執行時不必再查已知名稱
+        self._name_caches: dict[str, NameIdCache] = {}
 
     def fetch_data_and_save_to_repo(self, keyword: str, area: str):
         if not isinstance(keyword, str) and not isinstance(area, str):
@@ -86,7 +117,9 @@ class JobDataPipeline:
         3. 將 cust_info 存入 Silver Repo (MySQL)
         4. 將 dim_job 存入 Silver Repo
         5. 從 Silver Repo 取回 job_id -> id 的映射
-        6. 將其他 DataFrames 存入 Silver Repo
+        6. 技能/專長/職類名稱轉成字典表 id, 並從描述抽取提到的技能/專長
+        7. 將其他 DataFrames 存入 Silver Repo, 標記近似重複的刊登, 並增量更新彙總表
+        8. 寫入 etl_runs, 更新資料版本
         """
         if self.silver_repo is None:
             raise ValueError("Silver repo (TjmaDatabase) is not initialized.")
@@ -99,15 +132,16 @@ class JobDataPipeline:
 
         # Step 0.5: 插入 salary_type 參考資料
         logger.info("Inserting salary_type reference data...")
+        # monthly_factor: 換算月薪的倍數 (時薪以每月 176 小時、日薪以每月 22 天計)
         salary_type_data = pd.DataFrame(
             [
-                {"type": 10, "name": "面議"},
-                {"type": 20, "name": "時薪"},
-                {"type": 30, "name": "論件計酬"},
-                {"type": 40, "name": "日薪"},
-                {"type": 50, "name": "月薪"},
-                {"type": 60, "name": "年薪"},
-                {"type": 70, "name": "部分工時(月薪)"},
+                {"type": 10, "name": "面議", "monthly_factor": None},
+                {"type": 20, "name": "時薪", "monthly_factor": 176.0},
+                {"type": 30, "name": "論件計酬", "monthly_factor": None},
+                {"type": 40, "name": "日薪", "monthly_factor": 22.0},
+                {"type": 50, "name": "月薪", "monthly_factor": 1.0},
+                {"type": 60, "name": "年薪", "monthly_factor": 1 / 12},
+                {"type": 70, "name": "部分工時(月薪)", "monthly_factor": 1.0},
             ]
         )
         self.silver_repo.insert_stage(salary_type, salary_type_data)
@@ -124,15 +158,33 @@ class JobDataPipeline:
         # Step 2: 轉換為原始 DataFrame
         original_df = make_original_df(documents)
 
-        # Step 3: 製作並存入 cust_info
-        logger.info("Processing and inserting cust_info...")
+        # Step 2.5: 記下本批職缺載入前對彙總表的貢獻, 載入後相減即為增量;
+        # 公司產業別改變時, 該公司其他已入庫職缺的產業別彙總也會變, 一併納入
         cust_df = make_cust_df(original_df)
+        job_ids = list(
+            dict.fromkeys(
+                original_df["job_id"].astype(str).tolist()
+                + self.silver_repo.select_job_ids_with_industry_change(cust_df)
+            )
+        )
+        old_contributions = self.silver_repo.select_aggregate_contributions(job_ids)
+
+        # Step 3: 存入 cust_info
+        logger.info("Processing and inserting cust_info...")
         self.silver_repo.insert_stage(cust_info, cust_df)
         logger.info(f"Inserted {len(cust_df)} records into cust_info.")
 
         # Step 4: 製作並存入 dim_job
         logger.info("Processing and inserting dim_job...")
-        dim_job_df = make_dim_job(original_df)
+        dim_job_df = make_dim_job(original_df, salary_type_data)
+        # dim_job 依 appear_date 每月分割: 先補齊本批日期需要的分割,
+        # 再把 appear_date 有變動的既有職缺搬到新日期, upsert 才會命中同一列 (id 不變)
+        self.silver_repo.ensure_monthly_partitions(
+            dim_job,
+            since=dim_job_df["appear_date"].min().date(),
+            until=dim_job_df["appear_date"].max().date(),
+        )
+        self.silver_repo.sync_partition_column(dim_job, dim_job_df, "job_id", "appear_date")
         self.silver_repo.insert_stage(dim_job, dim_job_df)
         logger.info(f"Inserted {len(dim_job_df)} records into dim_job.")
 
@@ -145,26 +197,215 @@ class JobDataPipeline:
         logger.info("Processing job-related DataFrames...")
         all_dfs = make_all_job_related_dfs(original_df, job_uid_df)
 
+        # Step 6.5: 技能/專長/職類名稱轉成字典表 id (字典表需先於 bridge 表寫入)
+        logger.info("Encoding skill/specialty/category names into dictionary ids...")
+        all_dfs = self._encode_dictionary_names(all_dfs)
+
+        # Step 6.6: 以技能/專長字典建自動機, 每份描述掃一次抽出提到的名稱
+        logger.info("Extracting skills from job descriptions...")
+        extractor = SkillExtractor(self._extraction_vocabularies())
+        all_dfs["extracted_skill"] = extractor.extract(all_dfs["job_detail"])
+
         # Step 7: 存入各個表
         table_mapping = {
             "job_detail": job_detail,
+            "job_search": job_search,
             "welfare": welfare,
             "major": bridge_major,
             "skills": bridge_skills,
             "specialties": bridge_specialties,
             "category": bridge_category,
             "language": bridge_language,
+            "extracted_skill": bridge_extracted_skill,
         }
 
-        for df_name, df in all_dfs.items():
-            table = table_mapping[df_name]
-            if not df.empty:
-                logger.info(f"Inserting {len(df)} records into {table.name}...")
-                self.silver_repo.insert_stage(table, df)
+        # 這些表彼此獨立 (只依賴 dim_job.id), 所以可以平行寫入
+        self._load_tables_concurrently(
+            {table_mapping[df_name]: df for df_name, df in all_dfs.items()},
+            job_uids=all_dfs["job_detail"]["job_uid"].tolist(),
+        )
+
+        # Step 7.2: 以 MinHash/LSH 找出同公司重複刊登的近似職缺, 寫入 dim_job.canonical_job_uid;
+        # 需在 Step 7.5 之前完成, 彙總表的 unique_count 才會算到
+        logger.info("Detecting near-duplicate postings...")
+        jobs_df = (
+            dim_job_df[["job_id", "cust_no", "appear_date"]]
+            .merge(job_uid_df.rename(columns={"id": "job_uid"}), on="job_id")
+            .merge(all_dfs["job_detail"][["job_uid", "job_description"]], on="job_uid", how="left")
+        )
+        canonical_df = Deduplicator(self.silver_repo).deduplicate(jobs_df)
+        self.silver_repo.update_canonical_job_uids(canonical_df)
+
+        # Step 7.5: 依本批職缺的增量更新彙總表
+        logger.info("Updating aggregate tables...")
+        new_contributions = self.silver_repo.select_aggregate_contributions(job_ids)
+        deltas = {}
+        for name, spec in AGGREGATES.items():
+            deltas[name] = diff_aggregate_contributions(
+                old_contributions[name], new_contributions[name], spec.keys, spec.measures
+            )
+        self.silver_repo.apply_aggregate_deltas(deltas)
+
+        # Step 7.8: 重建職缺描述倒排索引; 在寫入 etl_runs 之前發布,
+        # web server 看到新的資料版本時, 對應的索引已經就緒
+        self.rebuild_description_index()
+
+        # Step 8: 記錄本次 ETL, 新的 etl_runs.id 即資料版本, web server 據此讓快取失效
+        # 本批職缺標上新版本, web server 的相似職缺索引據此重建這些職缺的向量
+        batch_jobs = jobs_df[["job_uid", "appear_date"]].rename(columns={"job_uid": "id"})
+        self.silver_repo.record_etl_run(len(dim_job_df), job_name_regex, batch_jobs)
+
+        logger.info("bronze_to_silver pipeline completed successfully.")
+
+    def _name_cache(self, df_name: str) -> NameIdCache:
+        if self.silver_repo is None:
+            raise ValueError("Silver repo (TjmaDatabase) is not initialized.")
+        if df_name not in self._name_caches:
+            table, name_col, _, _ = self.DICTIONARY_BRIDGES[df_name]
+            self._name_caches[df_name] = NameIdCache(self.silver_repo, table, name_col)
+        return self._name_caches[df_name]
+
+    def _extraction_vocabularies(self) -> dict[str, dict[str, int]]:
+        """{kind: {name: id}}, 含本批剛寫入字典表的新名稱。"""
+        return {
+            kind: self._name_cache(df_name).mapping()
+            for kind, df_name in self.EXTRACTION_VOCABULARIES.items()
+        }
+
+    def extract_skills_from_silver(self) -> None:
+        """
+        對 silver 內所有職缺的描述重新抽取技能 (首次啟用 bridge_extracted_skill 時回填用)。
+
+        自動機只建一次, 描述以 server-side cursor 分批讀出、分批寫入; 完成後寫入 etl_runs。
+        """
+        if self.silver_repo is None:
+            raise ValueError("Silver repo (TjmaDatabase) is not initialized.")
+
+        self.silver_repo.create_tables(metadata_obj)
+        extractor = SkillExtractor(self._extraction_vocabularies())
+        total = 0
+        for batch in self.silver_repo.iter_job_descriptions():
+            job_detail_df = pd.DataFrame(batch, columns=["job_uid", "job_description"])
+            extracted_df = extractor.extract(job_detail_df)
+            self.silver_repo.replace_stage(
+                bridge_extracted_skill, extracted_df, job_detail_df["job_uid"].tolist()
+            )
+            total += len(extracted_df)
+        logger.info(f"Backfilled {total} rows into bridge_extracted_skill.")
+        self.silver_repo.record_etl_run()
+
+    def deduplicate_silver(self) -> None:
+        """
+        對 silver 內所有職缺重算 canonical_job_uid (首次啟用近似重複偵測時回填用)。
+
+        依 appear_date, id 由舊到新分批處理, 每批只與先前批次 bucket 相同的職缺比對;
+        canonical_job_uid 全部寫完後再重建彙總表, 並寫入 etl_runs 讓 web server 換掉舊的 uniqueCount。
+        """
+        if self.silver_repo is None:
+            raise ValueError("Silver repo (TjmaDatabase) is not initialized.")
+
+        self.silver_repo.create_tables(metadata_obj)
+        deduplicator = Deduplicator(self.silver_repo)
+        total = 0
+        for jobs_df in self.silver_repo.iter_jobs_for_dedup():
+            canonical_df = deduplicator.deduplicate(jobs_df)
+            self.silver_repo.update_canonical_job_uids(canonical_df)
+            total += len(canonical_df)
+        logger.info(f"Backfilled canonical_job_uid of {total} jobs.")
+        self.silver_repo.rebuild_aggregates()
+        self.silver_repo.record_etl_run()
+
+    def rebuild_description_index(self) -> None:
+        """
+        從 silver 表重建描述倒排索引並發布到 DESCRIPTION_INDEX_DIR。
+
+        索引是衍生資料, 寫檔失敗 (OSError, e.g. 磁碟已滿) 只記錄錯誤, 不讓已載入的 ETL 失敗;
+        web server 會繼續使用前一版索引。讀取資料庫的錯誤照常拋出。
+        """
+        if self.silver_repo is None:
+            raise ValueError("Silver repo (TjmaDatabase) is not initialized.")
+
+        logger.info("Rebuilding job description index...")
+        try:
+            build_description_index(self.silver_repo.iter_job_descriptions())
+        except (OSError, ValueError):
+            logger.exception("Failed to rebuild description index.")
+
+    def _encode_dictionary_names(self, all_dfs: dict[str, pd.DataFrame]) -> dict[str, pd.DataFrame]:
+        """
+        將 DICTIONARY_BRIDGES 內的 bridge DataFrame 由名稱轉成字典表 id。
+
+        Args:
+            all_dfs: make_all_job_related_dfs 的輸出
+
+        Returns:
+            同樣 key 的 dict, 對應的 bridge DataFrame 已換成 (job_uid, id)
+        """
+        if self.silver_repo is None:
+            raise ValueError("Silver repo (TjmaDatabase) is not initialized.")
+
+        encoded = dict(all_dfs)
+        for df_name, (_, _, id_col, schema) in self.DICTIONARY_BRIDGES.items():
+            encoded[df_name] = self._name_cache(df_name).encode(all_dfs[df_name], id_col, schema)
+        return encoded
+
+    def _load_tables_concurrently(
+        self, table_dfs: dict[sa.Table, pd.DataFrame], job_uids: list[int]
+    ) -> None:
+        """
+        用 thread pool 平行寫入互不依賴的 silver 表。
+
+        每張表各自計時並記錄結果; 任何一張表失敗, 等其他表結束後整個 run 會失敗。
+        REPLACED_TABLES 先刪掉本批職缺的舊列再寫入, 其餘表 upsert。
+
+        Args:
+            table_dfs: {目標表: 要寫入的 DataFrame}
+            job_uids: 本批所有職缺的 dim_job.id
+
+        Raises:
+            RuntimeError: 至少一張表寫入失敗
+        """
+        if self.silver_repo is None:
+            raise ValueError("Silver repo (TjmaDatabase) is not initialized.")
+        silver_repo = self.silver_repo
+
+        def load(table: sa.Table, df: pd.DataFrame) -> float:
+            start = time.perf_counter()
+            if table in self.REPLACED_TABLES:
+                silver_repo.replace_stage(table, df, job_uids)
             else:
+                silver_repo.insert_stage(table, df)
+            return time.perf_counter() - start
+
+        pending = {}
+        for table, df in table_dfs.items():
+            # 取代式的表即使沒有新列也要執行, 才會刪掉舊列
+            if df.empty and table not in self.REPLACED_TABLES:
                 logger.debug(f"Skipping {table.name} (empty DataFrame).")
+                continue
+            pending[table] = df
 
-        logger.info("bronze_to_silver pipeline completed successfully.")
+        failures: dict[str, BaseException] = {}
+        with ThreadPoolExecutor(
+            max_workers=self.load_workers, thread_name_prefix="silver-load"
+        ) as executor:
+            futures = {executor.submit(load, table, df): table for table, df in pending.items()}
+            for future in as_completed(futures):
+                table = futures[future]
+                try:
+                    elapsed = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to insert into {table.name}: {e}")
+                    failures[table.name] = e
+                else:
+                    logger.info(
+                        f"Inserted {len(pending[table])} records into {table.name} "
+                        f"in {elapsed:.2f}s."
+                    )
+
+        if failures:
+            first_error = next(iter(failures.values()))
+            raise RuntimeError(f"Failed to load silver tables: {sorted(failures)}") from first_error
 
     def _flush_buffer(self, data: list[dict]):
         """Helper method to write data to repo"""
@@ -179,12 +420,52 @@ class JobDataPipeline:
 # CLI 入口點
 # cmd pattern: uv run python -m src.main --keyword "python" --area "6001001000" --mode "crawl"
 # cmd pattern: uv run python -m src.main --mode "transform"
+# 以下改寫 silver 資料的模式完成後都會寫入 etl_runs, web server 才會換到新的資料版本
+# cmd pattern: uv run python -m src.main --mode "archive" --retention-months 12
+# cmd pattern: uv run python -m src.main --mode "aggregate"  (完整重建彙總表)
+# cmd pattern: uv run python -m src.main --mode "search-index"  (重建職缺描述倒排索引)
+# cmd pattern: uv run python -m src.main --mode "extract-skills"  (回填描述抽取的技能)
+# cmd pattern: uv run python -m src.main --mode "partition"  (既有未分割的 dim_job 轉成每月分割表)
+# cmd pattern: uv run python -m src.main --mode "dictionary"  (既有存名稱的 bridge 表轉成存字典表 id)
+# cmd pattern: uv run python -m src.main --mode "dedup"  (回填近似重複職缺的 canonical_job_uid, 既有資料庫升級後執行一次)
 @click.command()
 @click.option("--keyword", "-k", default="python", help="Search keyword for job listings")
 @click.option("--area", "-a", default="6001001000", help="Area code for job search")
-@click.option("--mode", "-m", type=click.Choice(["crawl", "transform"]), default="crawl")
+@click.option(
+    "--mode",
+    "-m",
+    type=click.Choice(
+        [
+            "crawl",
+            "transform",
+            "archive",
+            "aggregate",
+            "search-index",
+            "extract-skills",
+            "dedup",
+            "partition",
+            "dictionary",
+        ]
+    ),
+    default="crawl",
+)
 @click.option("--regex", "-r", default=None, help="Job name regex for transform mode")
-def main(keyword: str, area: str, mode: str, regex: str | None):
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=JobDataPipeline.LOAD_WORKERS,
+    help="Max tables loaded concurrently in transform mode",
+)
+@click.option(
+    "--retention-months",
+    type=click.IntRange(min=1),
+    default=12,
+    help="Months of dim_job kept online in archive mode; older partitions are archived",
+)
+def main(
+    keyword: str, area: str, mode: str, regex: str | None, workers: int, retention_months: int
+):
     """Taiwan Job Market Analysis - Data Pipeline"""
     if mode == "crawl":
         crawler = OneZeroFourCrawler()
@@ -194,9 +475,55 @@ def main(keyword: str, area: str, mode: str, regex: str | None):
     elif mode == "transform":
         crawler = OneZeroFourCrawler()
         bronze_repo = MongoDB_one_zero_four()
-        silver_repo = TjmaDatabase()
-        pipeline = JobDataPipeline(crawler, bronze_repo, silver_repo)
+        # connection pool 與 worker 數一致, 每個 thread 都拿得到自己的 connection
+        silver_repo = TjmaDatabase(pool_size=workers)
+        pipeline = JobDataPipeline(crawler, bronze_repo, silver_repo, load_workers=workers)
         pipeline.bronze_to_silver(job_name_regex=regex)
+    elif mode == "archive":
+        # 保留本月在內的 retention_months 個月, 更早的月分割整塊搬到封存表
+        current_month = pd.Timestamp.today().to_period("M")
+        cutoff = (current_month - (retention_months - 1)).to_timestamp().date()
+        silver_repo = TjmaDatabase()
+        archived = silver_repo.archive_partitions(dim_job, before=cutoff)
+        logger.info(f"Archived {len(archived)} partitions of dim_job older than {cutoff}.")
+        if archived:
+            # 封存的職缺要從彙總表、描述索引與 LSH bucket 扣掉
+            silver_repo.rebuild_aggregates()
+            build_description_index(silver_repo.iter_job_descriptions())
+            silver_repo.purge_minhash()
+            silver_repo.record_etl_run()
+    elif mode == "aggregate":
+        silver_repo = TjmaDatabase()
+        silver_repo.rebuild_aggregates()
+        silver_repo.record_etl_run()
+    elif mode == "search-index":
+        # web server 在下一個資料版本 (或重啟) 時才會切換到這一版
+        build_description_index(TjmaDatabase().iter_job_descriptions())
+    elif mode == "extract-skills":
+        pipeline = JobDataPipeline(OneZeroFourCrawler(), MongoDB_one_zero_four(), TjmaDatabase())
+        pipeline.extract_skills_from_silver()
+    elif mode == "dedup":
+        pipeline = JobDataPipeline(OneZeroFourCrawler(), MongoDB_one_zero_four(), TjmaDatabase())
+        pipeline.deduplicate_silver()
+    elif mode == "partition":
+        # 分割前的 schema 建立的 dim_job 一次性轉成每月分割表
+        silver_repo = TjmaDatabase()
+        silver_repo.create_tables(metadata_obj)
+        silver_repo.partition_by_month(dim_job, "appear_date")
+        # 分割時會以 updated_date 補上空的 appear_date
+        silver_repo.record_etl_run()
+    elif mode == "dictionary":
+        # 字典表之前的 schema 建立的 bridge 表一次性轉成存字典表 id, 之後 transform 才能執行
+        silver_repo = TjmaDatabase()
+        bridges = {
+            "skills": bridge_skills,
+            "specialties": bridge_specialties,
+            "category": bridge_category,
+        }
+        for df_name, bridge in bridges.items():
+            dictionary, name_col, id_col, _ = JobDataPipeline.DICTIONARY_BRIDGES[df_name]
+            silver_repo.migrate_to_dictionary(bridge, dictionary, name_col, id_col)
+        silver_repo.record_etl_run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+import pandas as pd
+
+
+def diff_aggregate_contributions(
+    old_df: pd.DataFrame, new_df: pd.DataFrame, keys: tuple[str, ...], measures: tuple[str, ...]
+) -> pd.DataFrame:
+    """
+    計算本批職缺載入前後對彙總表的差量 (new - old)。
+
+    Args:
+        old_df: 載入前本批職缺的貢獻 (keys + measures)
+        new_df: 載入後本批職缺的貢獻 (keys + measures)
+        keys: 彙總表的 key 欄位
+        measures: 要相減的數值欄位
+
+    Returns:
+        keys + measures 的 DataFrame, 只保留有變動的列
+    """
+    key_list = list(keys)
+    measure_list = list(measures)
+    old_sum = old_df.groupby(key_list)[measure_list].sum()
+    new_sum = new_df.groupby(key_list)[measure_list].sum()
+
+    delta = new_sum.sub(old_sum, fill_value=0).astype("int64")
+    delta = delta[(delta != 0).any(axis=1)]
+    return delta.reset_index()
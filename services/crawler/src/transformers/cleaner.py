@@ -11,6 +11,7 @@ from src.interfaces.dtos import (
     CustInfo,
     DimJob,
     JobDetail,
+    JobSearch,
     Language,
     Major,
     Skills,
@@ -208,7 +209,33 @@ def make_cust_df(original_df: pd.DataFrame) -> pd.DataFrame:
     return cast(DataFrame[CustInfo], validate_df)
 
 
-def make_dim_job(original_df: pd.DataFrame) -> pd.DataFrame:
+# 104 以 salaryMax = 9999999 表示「xx 元以上」, 沒有上限
+OPEN_ENDED_SALARY_MAX = 9999999
+
+
+def _monthly_salary_mid(dim_job: pd.DataFrame, salary_type_df: pd.DataFrame) -> pd.Series:
+    """
+    依 salary_type 參考表的 monthly_factor 將薪資區間換算成月薪中位數。
+
+    Args:
+        dim_job: 含 salary_type, salary_min, salary_max 的 DataFrame
+        salary_type_df: salary_type 參考表 (type, name, monthly_factor)
+
+    Returns:
+        Int64 Series, 面議/論件計酬或沒有薪資下限的職缺為 <NA>
+    """
+    factor = dim_job["salary_type"].map(salary_type_df.set_index("type")["monthly_factor"])
+
+    # 沒有上限 (0 或 9999999) 時只用下限, 避免中位數被灌到數百萬
+    has_upper = (dim_job["salary_max"] > 0) & (dim_job["salary_max"] < OPEN_ENDED_SALARY_MAX)
+    salary_max = dim_job["salary_max"].where(has_upper, dim_job["salary_min"])
+
+    mid = (dim_job["salary_min"] + salary_max) / 2 * factor
+    mid = mid.where(dim_job["salary_min"] > 0)
+    return mid.round().astype("Int64")
+
+
+def make_dim_job(original_df: pd.DataFrame, salary_type_df: pd.DataFrame) -> pd.DataFrame:
     dim_job = original_df[["job_id", "custNo"]].copy()
 
     header_sub = pd.json_normalize(original_df["header"].to_list()).loc[
@@ -238,6 +265,7 @@ def make_dim_job(original_df: pd.DataFrame) -> pd.DataFrame:
     dim_job["salary_min"] = dim_job["salaryMin"].astype(int)
     dim_job["salary_max"] = dim_job["salaryMax"].astype(int)
     dim_job["salary_type"] = dim_job["salaryType"].astype(int)
+    dim_job["salary_monthly_mid"] = _monthly_salary_mid(dim_job, salary_type_df)
 
     dim_job.drop(columns=["salaryMin", "salaryMax", "salaryType"], inplace=True)
 
@@ -267,6 +295,9 @@ def make_dim_job(original_df: pd.DataFrame) -> pd.DataFrame:
         dim_job["appear_date"], format="%Y/%m/%d", errors="coerce"
     )
 
+    # 標準化職位類別, 彙總表與 dashboard 的 job_family 篩選都依此分組
+    dim_job["job_family"] = dim_job["job_name"].map(_classify_job_title)
+
     validate_df = DimJob.validate(dim_job)
     return cast(DataFrame[DimJob], validate_df)
 
@@ -330,6 +361,33 @@ def make_job_detail(original_df: pd.DataFrame, job_uid_df: pd.DataFrame) -> pd.D
         raise
 
 
+def make_job_search(original_df: pd.DataFrame, job_uid_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    製作 JobSearch DataFrame (job_name 的全文檢索副本)。
+
+    Args:
+        original_df: 原始資料 DataFrame
+        job_uid_df: 包含 job_id 與 job_uid 映射的 DataFrame
+
+    Returns:
+        符合 JobSearch Schema 的 DataFrame
+    """
+    try:
+        merged_df = _merge_job_uid(original_df, job_uid_df)
+        header_sub = pd.json_normalize(merged_df["header"].to_list())
+
+        result_df = pd.DataFrame(
+            {"job_uid": merged_df["job_uid"], "job_name": header_sub["jobName"]}
+        )
+
+        validate_df = JobSearch.validate(result_df)
+        return cast(DataFrame[JobSearch], validate_df)
+
+    except (KeyError, ValueError, TypeError) as e:
+        logger.exception(f"Failed to make JobSearch DataFrame: {e}")
+        raise
+
+
 def make_welfare(original_df: pd.DataFrame, job_uid_df: pd.DataFrame) -> pd.DataFrame:
     """
     製作 Welfare DataFrame。
@@ -599,6 +657,7 @@ def make_all_job_related_dfs(
     Returns:
         包含所有 DataFrame 的字典:
         - job_detail: JobDetail DataFrame
+        - job_search: JobSearch DataFrame
         - welfare: Welfare DataFrame
         - major: Major DataFrame
         - skills: Skills DataFrame
@@ -608,6 +667,7 @@ def make_all_job_related_dfs(
     """
     return {
         "job_detail": make_job_detail(original_df, job_uid_df),
+        "job_search": make_job_search(original_df, job_uid_df),
         "welfare": make_welfare(original_df, job_uid_df),
         "major": make_major(original_df, job_uid_df),
         "skills": make_skills(original_df, job_uid_df),
@@ -0,0 +1,272 @@
+import logging
+import re
+import zlib
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.interfaces.interfaces import SilverJobRepository
+
+logger = logging.getLogger(__name__)
+
+# 只保留英數字與 CJK, 空白、標點、換行格式的差異不影響比對
+_NON_TEXT = re.compile(r"[^0-9a-z\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+
+def normalize_description(text: str) -> str:
+    return _NON_TEXT.sub("", text.lower())
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 的 finalizer (uint64 溢位即 mod 2^64)。"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class NearDuplicateDetector:
+    """
+    以 MinHash + LSH 找出同一公司重複刊登的近似職缺。
+
+    描述正規化後取字元 SHINGLE_SIZE-gram。簽章用 one permutation hashing: 每個 shingle
+    只雜湊一次, 依雜湊值最高幾位分到 SIGNATURE_SIZE 個 bin, 各 bin 取最小值;
+    空的 bin 借右邊最近一個非空 bin 的值 (rotation densification)。兩份簽章相同位置相等
+    的比例即 Jaccard 相似度的估計, 成本與描述長度成正比, 不必對每個 shingle 算
+    SIGNATURE_SIZE 次雜湊。
+
+    簽章切成 BANDS 段, 每段連同 cust_no 雜湊成一個 bucket key: 只有至少一段完全相同
+    (且同公司) 的職缺才會成為候選, 再以完整簽章驗證是否達 THRESHOLD, 整體接近線性時間。
+    """
+
+    SIGNATURE_SIZE = 64  # 需為 2 的次方
+    BANDS = 16  # 16 段 x 4 列: Jaccard 0.8 的配對有 99.9% 以上的機率成為候選
+    SHINGLE_SIZE = 5
+    THRESHOLD = 0.8
+    # 簽章會存進資料庫, 改動上面的參數或雜湊方式需重新回填 (--mode dedup)
+    MAX_BATCH_CHARS = 10_000_000  # 每次一起雜湊的字元數, 控制記憶體
+
+    def __init__(self) -> None:
+        self.rows = self.SIGNATURE_SIZE // self.BANDS
+        self.bin_shift = np.uint64(64 - (self.SIGNATURE_SIZE.bit_length() - 1))
+
+    def _shingles(self, normalized: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """所有描述的 shingle 雜湊值 (依描述排列) 與每份描述的 shingle 數。"""
+        lengths = np.array([len(text) for text in normalized], dtype=np.int64)
+        counts = np.maximum(lengths - self.SHINGLE_SIZE + 1, 0)
+        codes = np.frombuffer("".join(normalized).encode("utf-32-le"), dtype=np.uint32)
+        codes = codes.astype(np.uint64)
+        # 先對串接後的每個位置算多項式雜湊 (連續切片, 不需 gather), 再取出不跨描述的起點
+        width = codes.size - self.SHINGLE_SIZE + 1
+        if width <= 0:
+            return np.zeros(0, dtype=np.uint64), counts
+        rolling = codes[:width].copy()
+        for offset in range(1, self.SHINGLE_SIZE):
+            rolling *= np.uint64(1_000_003)
+            rolling += codes[offset : offset + width]
+        starts = np.repeat(np.cumsum(lengths) - lengths, counts)
+        starts += np.arange(starts.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        return _mix(rolling[starts]), counts
+
+    def _densify(self, signatures: np.ndarray) -> np.ndarray:
+        """空 bin 改用右邊 (循環) 最近的非空 bin 值, 再依距離加上固定偏移, 避免與該 bin 相同。"""
+        size = self.SIGNATURE_SIZE
+        doubled = np.concatenate((signatures, signatures), axis=1)
+        positions = np.where(doubled != np.iinfo(np.uint32).max, np.arange(2 * size), 2 * size - 1)
+        donors = np.minimum.accumulate(positions[:, ::-1], axis=1)[:, ::-1][:, :size]
+        distance = (donors - np.arange(size)).astype(np.uint32)
+        values = np.take_along_axis(doubled, donors, axis=1)
+        return values + distance * np.uint32(0x9E3779B1)
+
+    def signatures(self, texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Args:
+            texts: 描述文字
+
+        Returns:
+            (n x SIGNATURE_SIZE 的 uint32 簽章, 是否有簽章); 太短 (沒有任何 shingle) 的描述沒有簽章
+        """
+        normalized = [normalize_description(text) for text in texts]
+        size = self.SIGNATURE_SIZE
+        signatures = np.full((len(texts), size), np.iinfo(np.uint32).max, dtype=np.uint32)
+        has_signature = np.zeros(len(texts), dtype=bool)
+        # 依字元數切批, 每批內以 minimum.at 一次算完所有 (描述, bin) 的最小值
+        start = 0
+        while start < len(texts):
+            end, chars = start, 0
+            while end < len(texts) and (
+                end == start or chars + len(normalized[end]) <= self.MAX_BATCH_CHARS
+            ):
+                chars += len(normalized[end])
+                end += 1
+            hashes, counts = self._shingles(normalized[start:end])
+            cells = np.repeat(np.arange(end - start, dtype=np.int64) * size, counts)
+            cells += (hashes >> self.bin_shift).astype(np.int64)
+            values = (hashes >> np.uint64(16)).astype(np.uint32)  # bin 以外的位元
+            batch = signatures[start:end].reshape(-1)
+            np.minimum.at(batch, cells, values)
+            has_signature[start:end] = counts > 0
+            start = end
+
+        signed = np.flatnonzero(has_signature)
+        signatures[signed] = self._densify(signatures[signed])
+        return signatures, has_signature
+
+    def band_keys(self, signatures: np.ndarray, cust_nos: Sequence[str]) -> np.ndarray:
+        """每份簽章 BANDS 段的 bucket key (n x BANDS, int64), 已混入 cust_no 與段號, 各段互不相撞。"""
+        cust = np.array([zlib.crc32(str(c).encode()) for c in cust_nos], dtype=np.uint64)
+        rows = signatures.reshape(len(signatures), self.BANDS, self.rows).astype(np.uint64)
+        keys = _mix((cust[:, None] << np.uint64(8)) + np.arange(self.BANDS, dtype=np.uint64))
+        for row in range(self.rows):
+            keys = _mix(keys * np.uint64(0x100000001B3) + rows[:, :, row])
+        return keys.view(np.int64)
+
+    def assign(
+        self,
+        signatures: np.ndarray,
+        band_keys: np.ndarray,
+        n_existing: int,
+    ) -> np.ndarray:
+        """
+        把相似度達 THRESHOLD 的職缺併成群, 回傳每列所屬群的代表列。
+
+        列的順序即優先順序: 前 n_existing 列是已入庫的候選, 其後是本批職缺
+        (呼叫端依 appear_date, id 由舊到新排好), 每群以最前面的一列為代表, 已入庫的
+        職缺因此不會被新職缺取代。同一 bucket 內每列只與 bucket 的第一列和前一列驗證,
+        配對數與列數呈線性; 已入庫職缺彼此之間不再比對。
+
+        Returns:
+            長度為列數的陣列, 值為代表列的序號
+        """
+        n = len(signatures)
+        left_parts, right_parts = [], []
+        for band in range(self.BANDS):
+            order = np.argsort(band_keys[:, band], kind="stable")
+            keys = band_keys[order, band]
+            group_start = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            sizes = np.diff(np.r_[group_start, n])
+            leaders = np.repeat(order[group_start], sizes)
+            # bucket 的第一列沒有同 bucket 的前一列, 以自己代替 (之後濾掉)
+            previous = np.r_[order[:1], order[:-1]]
+            previous[group_start] = order[group_start]
+            for other in (leaders, previous):
+                pair = other != order
+                left_parts.append(other[pair])
+                right_parts.append(order[pair])
+        left = np.concatenate(left_parts) if left_parts else np.empty(0, dtype=np.int64)
+        right = np.concatenate(right_parts) if right_parts else np.empty(0, dtype=np.int64)
+
+        # 兩端都是已入庫職缺的配對不處理; 其餘以完整簽章驗證
+        keep = (left >= n_existing) | (right >= n_existing)
+        left, right = left[keep], right[keep]
+        pairs = np.unique(np.minimum(left, right) * n + np.maximum(left, right))
+        left, right = pairs // n, pairs % n
+        similarity = (signatures[left] == signatures[right]).mean(axis=1)
+        similar = similarity >= self.THRESHOLD
+        left, right = left[similar], right[similar]
+
+        # 連通元件: 反覆傳遞最小列號 (即優先順序最高的一列) 直到不再變動
+        labels = np.arange(n)
+        while True:
+            updated = labels.copy()
+            np.minimum.at(updated, left, labels[right])
+            np.minimum.at(updated, right, labels[left])
+            updated = updated[updated]
+            if np.array_equal(updated, labels):
+                return labels
+            labels = updated
+
+
+class Deduplicator:
+    """
+    計算本批職缺的 canonical_job_uid, 並保存 MinHash 簽章供之後的批次比對。
+
+    與 NameIdCache 一樣直接使用 silver repo: 候選來自 job_minhash_band 的 bucket 查詢,
+    不需要讀出所有職缺的描述。已入庫職缺的 canonical_job_uid 不會被改寫,
+    彙總表因此可以只依本批職缺增量維護。
+    """
+
+    def __init__(self, repo: SilverJobRepository) -> None:
+        self.repo = repo
+        self.detector = NearDuplicateDetector()
+
+    def deduplicate(self, jobs_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Args:
+            jobs_df: 本批職缺 (job_uid, cust_no, appear_date, job_description)
+
+        Returns:
+            (id, appear_date, canonical_job_uid) 的 DataFrame;
+            描述太短無法比對的職缺 canonical_job_uid 為 NULL
+        """
+        columns = ["id", "appear_date", "canonical_job_uid"]
+        if jobs_df.empty:
+            return pd.DataFrame(columns=columns)
+
+        jobs_df = jobs_df.sort_values(["appear_date", "job_uid"], kind="stable")
+        job_uids = jobs_df["job_uid"].to_numpy(dtype=np.int64)
+        signatures, has_signature = self.detector.signatures(
+            jobs_df["job_description"].fillna("").astype(str).tolist()
+        )
+        cust_nos = jobs_df["cust_no"].fillna("").astype(str).tolist()
+        band_keys = self.detector.band_keys(signatures, cust_nos)
+        signed = np.flatnonzero(has_signature)
+
+        band_df = pd.DataFrame(
+            {
+                "band_hash": band_keys[signed].ravel(),
+                "job_uid": np.repeat(job_uids[signed], self.detector.BANDS),
+            }
+        )
+        # 已入庫且至少一段 bucket 相同的職缺 (依 appear_date, id 由舊到新), 本批重新載入的除外
+        existing = self.repo.select_minhash_candidates(band_df["band_hash"].unique().tolist())
+        existing = existing[~existing["job_uid"].isin(job_uids)].reset_index(drop=True)
+        existing_signatures = np.array(
+            [np.frombuffer(sig, dtype=np.uint32) for sig in existing["signature"]],
+            dtype=np.uint32,
+        ).reshape(len(existing), self.detector.SIGNATURE_SIZE)
+        existing_keys = self.detector.band_keys(
+            existing_signatures, existing["cust_no"].fillna("").astype(str).tolist()
+        )
+        existing_canonical = (
+            existing["canonical_job_uid"].fillna(existing["job_uid"]).to_numpy(dtype=np.int64)
+        )
+
+        n_existing = len(existing)
+        labels = self.detector.assign(
+            np.concatenate((existing_signatures, signatures[signed])),
+            np.concatenate((existing_keys, band_keys[signed])),
+            n_existing,
+        )
+        leaders = labels[n_existing:]
+        # 代表列是已入庫職缺時沿用它的 canonical, 否則就是本批最早的那筆
+        candidates = np.concatenate((existing_canonical, job_uids[signed]))
+        canonical = candidates[leaders]
+
+        self.repo.replace_minhash(
+            pd.DataFrame(
+                {
+                    "job_uid": job_uids[signed],
+                    "cust_no": np.array(cust_nos, dtype=object)[signed],
+                    "signature": [row.tobytes() for row in signatures[signed]],
+                }
+            ),
+            band_df,
+            job_uids.tolist(),
+        )
+
+        result_df = pd.DataFrame(
+            {
+                "id": job_uids,
+                "appear_date": pd.to_datetime(jobs_df["appear_date"]).dt.date.to_numpy(),
+                "canonical_job_uid": pd.NA,
+            }
+        )
+        result_df["canonical_job_uid"] = result_df["canonical_job_uid"].astype("Int64")
+        result_df.loc[signed, "canonical_job_uid"] = canonical
+        duplicates = int((canonical != job_uids[signed]).sum())
+        logger.info(
+            f"Deduplicated {len(jobs_df)} jobs: {duplicates} near-duplicates "
+            f"({n_existing} existing candidates, {len(jobs_df) - signed.size} without signature)."
+        )
+        return result_df
@@ -0,0 +1,103 @@
+import logging
+from collections.abc import Iterable
+from typing import cast
+
+import pandas as pd
+import pandera.pandas as pa
+import sqlalchemy as sa
+
+from src.interfaces.interfaces import SilverJobRepository
+
+logger = logging.getLogger(__name__)
+
+
+class NameIdCache:
+    """
+    字典表 (dim_skill / dim_specialty / dim_category) 的 name -> id 快取。
+
+    快取在 process 內, 同一次 pipeline 只有第一次遇到的新名稱需要寫回資料庫;
+    已知的名稱直接從 dict 取 id, 不再逐筆查表。
+
+    名稱一律先去掉前後空白: utf8mb4_bin 是 PAD SPACE collation, 'Python' 與 'Python '
+    在 unique key 上視為相同, 不先正規化的話 upsert 會命中另一個名稱的列,
+    dict 裡卻找不到對應的 key。
+    """
+
+    def __init__(self, repo: SilverJobRepository, table: sa.Table, name_col: str) -> None:
+        self.repo = repo
+        self.table = table
+        self.name_col = name_col
+        self._ids: dict[str, int] = {}
+        self._loaded = False
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return name.strip()
+
+    def _reload(self) -> None:
+        """從字典表重新載入全部 name -> id (字典表只有數千筆, 整表讀取成本很低)"""
+        df = self.repo.select_stage(self.table, columns=["id", self.name_col])
+        # 正規化之前寫入、帶空白的舊名稱
+        names = df[self.name_col].astype(str).map(self.normalize)
+        self._ids = dict(zip(names, df["id"].astype(int), strict=True))
+        self._loaded = True
+        logger.debug(f"Loaded {len(self._ids)} entries from {self.table.name}.")
+
+    def mapping(self) -> dict[str, int]:
+        """字典表目前全部的 name -> id (描述抽取技能時當作比對的詞彙)"""
+        if not self._loaded:
+            self._reload()
+        return dict(self._ids)
+
+    def get_ids(self, names: Iterable[str]) -> dict[str, int]:
+        """
+        取得名稱對應的 id, 不存在的名稱會先寫入字典表。
+
+        Args:
+            names: 要查詢的名稱 (已正規化, 見 normalize)
+
+        Returns:
+            {name: id}
+        """
+        wanted = {self.normalize(name) for name in names}
+        if not self._loaded:
+            self._reload()
+
+        missing = wanted - self._ids.keys()
+        if missing:
+            logger.info(f"Inserting {len(missing)} new names into {self.table.name}...")
+            self.repo.insert_stage(self.table, pd.DataFrame({self.name_col: sorted(missing)}))
+            self._reload()
+
+        unresolved = wanted - self._ids.keys()
+        if unresolved:
+            raise ValueError(f"Failed to resolve ids in {self.table.name}: {sorted(unresolved)}")
+
+        return {name: self._ids[name] for name in wanted}
+
+    def encode(
+        self, df: pd.DataFrame, id_col: str, schema: type[pa.DataFrameModel]
+    ) -> pd.DataFrame:
+        """
+        把 (job_uid, name) 的 bridge DataFrame 轉成 (job_uid, id)。
+
+        Args:
+            df: 含 job_uid 與 name_col 的 DataFrame
+            id_col: 輸出的 id 欄位名稱 (e.g. skill_id)
+            schema: 輸出 DataFrame 的 pandera schema
+
+        Returns:
+            符合 schema 的 DataFrame, 同一職缺重複的名稱只保留一筆; 空白名稱會被略過
+        """
+        names = df[self.name_col].astype(str).map(self.normalize)
+        keep = (names != "").to_numpy()
+        if not keep.any():
+            return pd.DataFrame(columns=["job_uid", id_col])
+
+        ids = self.get_ids(names[keep].unique())
+        result_df = pd.DataFrame(
+            {"job_uid": df["job_uid"].values[keep], id_col: names[keep].map(ids).values}
+        ).drop_duplicates()
+
+        validate_df = schema.validate(result_df)
+        return cast(pd.DataFrame, validate_df)
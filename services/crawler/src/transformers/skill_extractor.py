@@ -0,0 +1,306 @@
+import logging
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+from typing import cast
+
+import numpy as np
+import pandas as pd
+
+from src.interfaces.dtos import ExtractedSkillBridge
+
+logger = logging.getLogger(__name__)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+class SkillAutomaton:
+    """
+    技能/專長名稱的 Aho-Corasick 自動機, 每份描述只掃一次就找出所有出現的名稱。
+
+    字元先壓成類別碼。state 依 BFS 順序編號, 前 dense_states 個 state (根與淺層, 掃描時
+    絕大多數時間停在這裡) 的轉移預先解開 failure link, 存成稠密的 DFA 表, 一次查表就得到
+    下一個 state; 更深的 state 的 trie 邊存成排序過的 (state * 類別數 + 類別碼) 陣列,
+    用 searchsorted 查表, 沒有邊時沿 failure link 退回稠密區。掃描時一批描述接成一個
+    UTF-32 陣列, 依長度由長到短排列, 第 t 步同時推進所有長度 > t 的描述,
+    所以 Python 迴圈次數只跟最長的描述有關, 與描述數、名稱數無關。
+
+    比對不分大小寫; 以英數字開頭/結尾的名稱需落在英數字邊界上 (避免 "Go" 命中 "Google")。
+    """
+
+    MIN_PATTERN_LENGTH = 2  # 單一字元的名稱 (e.g. "C", "R") 誤判太多, 不比對
+    MAX_BATCH_CHARS = 10_000_000  # 每批描述的總字元數上限, 控制每字元暫存陣列的記憶體
+    MAX_DENSE_CELLS = 16_000_000  # 稠密 DFA 表的格數上限 (int32, 64 MB)
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.patterns = sorted(
+            {name.strip().lower() for name in names if len(name.strip()) >= self.MIN_PATTERN_LENGTH}
+        )
+
+        # trie: 每個 state 的子節點; state 0 是根
+        children: list[dict[str, int]] = [{}]
+        output = [-1]  # 在此 state 結束的 pattern, 沒有為 -1
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                child = children[state].get(ch)
+                if child is None:
+                    child = len(children)
+                    children[state][ch] = child
+                    children.append({})
+                    output.append(-1)
+                state = child
+            output[state] = index
+
+        # 依 BFS 順序重新編號: 深度小的 state 編號小, failure link 一定指向編號更小的 state,
+        # 所以任何一段編號前綴都對 failure link 封閉 (稠密表只需涵蓋前綴)
+        bfs = [0]
+        for state in bfs:  # 迭代中持續 append, 即 BFS
+            bfs.extend(children[state].values())
+        renumber = [0] * len(bfs)
+        for new, old in enumerate(bfs):
+            renumber[old] = new
+        children = [{ch: renumber[child] for ch, child in children[old].items()} for old in bfs]
+        output = [output[old] for old in bfs]
+
+        # BFS 建 failure link 與 output link (最近一個有 pattern 結尾的 proper suffix state)
+        fail = [0] * len(children)
+        output_link = [0] * len(children)
+        queue = deque(children[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in children[state].items():
+                suffix = fail[state]
+                while suffix and ch not in children[suffix]:
+                    suffix = fail[suffix]
+                fail[child] = children[suffix].get(ch, 0)
+                output_link[child] = (
+                    fail[child] if output[fail[child]] >= 0 else output_link[fail[child]]
+                )
+                queue.append(child)
+
+        # 字元壓成連續的類別碼: 0 = 不在任何名稱裡的字元, 讀到它一定回到根
+        alphabet = sorted({ch for pattern in self.patterns for ch in pattern})
+        self.classes = np.zeros(max((ord(ch) for ch in alphabet), default=0) + 1, dtype=np.int32)
+        self.classes[[ord(ch) for ch in alphabet]] = np.arange(1, len(alphabet) + 1)
+        self.n_classes = len(alphabet) + 1
+
+        # 前 dense_states 個 state 的完整轉移: 先繼承 failure state 的列, 再蓋上自己的 trie 邊
+        self.dense_states = max(1, min(len(children), self.MAX_DENSE_CELLS // self.n_classes))
+        dense = np.zeros((self.dense_states, self.n_classes), dtype=np.int32)
+        for state in range(self.dense_states):
+            if state:
+                dense[state] = dense[fail[state]]
+            for ch, child in children[state].items():
+                dense[state, self.classes[ord(ch)]] = child
+        self.dense = dense.ravel()
+
+        # 其餘 state 的 trie 邊存成排序過的 key
+        deep = range(self.dense_states, len(children))
+        keys = [
+            parent * self.n_classes + int(self.classes[ord(ch)])
+            for parent in deep
+            for ch in children[parent]
+        ]
+        targets = [child for parent in deep for child in children[parent].values()]
+        order = np.argsort(np.array(keys, dtype=np.int64))
+        self.edge_keys = np.array(keys, dtype=np.int64)[order]
+        self.edge_targets = np.array(targets, dtype=np.int32)[order]
+        self.fail = np.array(fail, dtype=np.int32)
+        self.output = np.array(output, dtype=np.int64)
+        self.output_link = np.array(output_link, dtype=np.int32)
+        self.has_output = (self.output >= 0) | (self.output_link > 0)
+
+        self.pattern_lengths = np.array([len(p) for p in self.patterns], dtype=np.int64)
+        self.starts_word = np.array([_is_word_char(p[0]) for p in self.patterns], dtype=bool)
+        self.ends_word = np.array([_is_word_char(p[-1]) for p in self.patterns], dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    @property
+    def states(self) -> int:
+        return len(self.fail)
+
+    def _goto(self, states: np.ndarray, classes: np.ndarray) -> np.ndarray:
+        """稠密區以外的 state 在 trie 上的直接轉移, 沒有這條邊為 -1。"""
+        if self.edge_keys.size == 0:
+            return np.full(states.shape, -1, dtype=np.int32)
+        keys = states.astype(np.int64) * self.n_classes + classes
+        positions = np.minimum(np.searchsorted(self.edge_keys, keys), self.edge_keys.size - 1)
+        return np.where(self.edge_keys[positions] == keys, self.edge_targets[positions], -1)
+
+    def _step(self, states: np.ndarray, classes: np.ndarray) -> np.ndarray:
+        """所有描述各讀入一個字元後的 state; 深層 state 沒有邊的沿 failure link 往回找。"""
+        deep = states >= self.dense_states
+        if not deep.any():
+            return self.dense[states * self.n_classes + classes]
+
+        targets = np.empty_like(states)
+        shallow = ~deep
+        targets[shallow] = self.dense[states[shallow] * self.n_classes + classes[shallow]]
+        pending = np.flatnonzero(deep)
+        current = states[pending]
+        while pending.size:
+            found = self._goto(current, classes[pending])
+            hit = found >= 0
+            targets[pending[hit]] = found[hit]
+            pending, current = pending[~hit], self.fail[current[~hit]]
+            # 退回稠密區的直接查表
+            done = current < self.dense_states
+            targets[pending[done]] = self.dense[
+                current[done] * self.n_classes + classes[pending[done]]
+            ]
+            pending, current = pending[~done], current[~done]
+        return targets
+
+    def _scan_batch(self, texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """一批描述中每次命中的 (描述序號, pattern 序號), 已做英數字邊界檢查。"""
+        lowered = [text.lower() for text in texts]
+        lengths = np.array([len(text) for text in lowered], dtype=np.int64)
+        order = np.argsort(-lengths, kind="stable")
+        lengths = lengths[order]
+        offsets = np.cumsum(lengths) - lengths
+        flat = np.frombuffer(
+            "".join(lowered[i] for i in order).encode("utf-32-le"), dtype=np.uint32
+        )
+        word = ((flat >= ord("0")) & (flat <= ord("9"))) | ((flat >= ord("a")) & (flat <= ord("z")))
+        classes = np.where(
+            flat < self.classes.size, self.classes[np.minimum(flat, self.classes.size - 1)], 0
+        )
+
+        # 第 t 步仍在掃描的描述數 (lengths 由大到小, 所以是一段前綴);
+        # 字元重排成「第 t 步的所有字元」相鄰, 每一步讀的是連續的一段
+        active = np.searchsorted(-lengths, -np.arange(int(lengths.max(initial=0))), side="left")
+        step_offsets = np.cumsum(active) - active
+        doc_of_char = np.repeat(np.arange(len(texts), dtype=np.int32), lengths)
+        position = np.arange(flat.size) - offsets[doc_of_char]
+        step_major = np.empty(flat.size, dtype=np.int32)
+        step_major[step_offsets[position] + doc_of_char] = classes
+        del doc_of_char, position, classes
+
+        state = np.zeros(len(texts), dtype=np.int32)
+        hit_docs, hit_ends, hit_states = [], [], []
+        for t, (start, count) in enumerate(
+            zip(step_offsets.tolist(), active.tolist(), strict=True)
+        ):
+            state[:count] = self._step(state[:count], step_major[start : start + count])
+            hits = np.flatnonzero(self.has_output[state[:count]])
+            if hits.size:
+                hit_docs.append(hits)
+                hit_ends.append(np.full(hits.size, t, dtype=np.int64))
+                hit_states.append(state[hits])
+        if not hit_docs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        docs = np.concatenate(hit_docs)
+        ends = np.concatenate(hit_ends)
+        states = np.concatenate(hit_states)
+        # 展開 output link: 一個位置可能同時是好幾個 pattern 的結尾
+        match_docs, match_ends, match_patterns = [], [], []
+        while states.size:
+            patterns = self.output[states]
+            found = patterns >= 0
+            match_docs.append(docs[found])
+            match_ends.append(ends[found])
+            match_patterns.append(patterns[found])
+            states = self.output_link[states]
+            more = states > 0
+            docs, ends, states = docs[more], ends[more], states[more]
+        docs = np.concatenate(match_docs)
+        ends = np.concatenate(match_ends)
+        patterns = np.concatenate(match_patterns)
+
+        # 英數字邊界: pattern 前一個 / 後一個字元不可以也是英數字
+        end_pos = offsets[docs] + ends
+        start_pos = end_pos - self.pattern_lengths[patterns] + 1
+        before = np.where(ends - self.pattern_lengths[patterns] >= 0, start_pos - 1, -1)
+        after = np.where(ends + 1 < lengths[docs], end_pos + 1, -1)
+        bad_start = self.starts_word[patterns] & (before >= 0) & word[np.maximum(before, 0)]
+        bad_end = self.ends_word[patterns] & (after >= 0) & word[np.maximum(after, 0)]
+        keep = ~(bad_start | bad_end)
+        return order[docs[keep]], patterns[keep]
+
+    def scan(self, texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        找出每份描述中出現的名稱與次數。
+
+        Args:
+            texts: 描述文字
+
+        Returns:
+            (描述序號, pattern 序號, 次數) 三個等長陣列, 依描述序號、pattern 序號排序
+        """
+        n_patterns = max(len(self.patterns), 1)
+        keys_parts: list[np.ndarray] = []
+        first = 0
+        while first < len(texts):
+            # 依總字元數切批
+            last, chars = first, 0
+            while last < len(texts) and (last == first or chars < self.MAX_BATCH_CHARS):
+                chars += len(texts[last])
+                last += 1
+            docs, patterns = self._scan_batch(texts[first:last])
+            keys_parts.append((docs + first) * n_patterns + patterns)
+            first = last
+
+        keys, counts = np.unique(
+            np.concatenate(keys_parts) if keys_parts else np.empty(0, dtype=np.int64),
+            return_counts=True,
+        )
+        return keys // n_patterns, keys % n_patterns, counts
+
+
+class SkillExtractor:
+    """
+    從職缺描述比對技能/專長字典表的名稱, 產生 bridge_extracted_skill 的資料。
+
+    名稱不分大小寫合併, 同一個名稱在字典表有多種大小寫時取最小的 id; 同名的技能與專長
+    各自記一筆。自動機建一次, 可以重複用在多批描述上。
+    """
+
+    COLUMNS = ["job_uid", "kind", "name_id", "match_count"]
+
+    def __init__(self, vocabularies: Mapping[str, Mapping[str, int]]) -> None:
+        """
+        Args:
+            vocabularies: {kind: {name: id}}, kind 為 "skill" (dim_skill) 或
+                "specialty" (dim_specialty)
+        """
+        # 摺疊後的名稱 -> {kind: id}
+        self.targets: dict[str, dict[str, int]] = {}
+        for kind, vocabulary in vocabularies.items():
+            for name, name_id in vocabulary.items():
+                current = self.targets.setdefault(name.strip().lower(), {})
+                current[kind] = min(current.get(kind, name_id), name_id)
+        self.automaton = SkillAutomaton(self.targets)
+
+    def extract(self, job_detail_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Args:
+            job_detail_df: 含 job_uid, job_description 的 DataFrame (e.g. make_job_detail 的輸出)
+
+        Returns:
+            (job_uid, kind, name_id, match_count) 的 DataFrame
+        """
+        if job_detail_df.empty:
+            return pd.DataFrame(columns=self.COLUMNS)
+
+        texts = job_detail_df["job_description"].fillna("").astype(str).tolist()
+        docs, patterns, counts = self.automaton.scan(texts)
+        job_uids = job_detail_df["job_uid"].to_numpy()
+        rows = [
+            (job_uids[doc], kind, name_id, count)
+            for doc, pattern, count in zip(
+                docs.tolist(), patterns.tolist(), counts.tolist(), strict=True
+            )
+            for kind, name_id in self.targets[self.automaton.patterns[pattern]].items()
+        ]
+        result_df = pd.DataFrame(rows, columns=self.COLUMNS)
+        logger.info(
+            f"Extracted {len(result_df)} skill mentions from {len(texts)} descriptions "
+            f"({len(self.automaton)} names, {self.automaton.states} automaton states)."
+        )
+        validate_df = ExtractedSkillBridge.validate(result_df)
+        return cast(pd.DataFrame, validate_df)
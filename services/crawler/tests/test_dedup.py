@@ -0,0 +1,128 @@
+"""NearDuplicateDetector 的簽章與分群, 以精確的 Jaccard 相似度驗證。"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.transformers.dedup import NearDuplicateDetector, normalize_description
+
+DETECTOR = NearDuplicateDetector()
+# 隨機描述的字元: 正規化後會保留的 CJK 字
+CJK = [chr(code) for code in range(0x4E00, 0x4E00 + 300)]
+
+
+def shingles(text: str) -> set[str]:
+    normalized = normalize_description(text)
+    size = NearDuplicateDetector.SHINGLE_SIZE
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+def jaccard(a: str, b: str) -> float:
+    left, right = shingles(a), shingles(b)
+    return len(left & right) / len(left | right)
+
+
+def random_text(rng: random.Random, length: int = 300) -> str:
+    return "".join(rng.choices(CJK, k=length))
+
+
+def edit(rng: random.Random, text: str, changes: int) -> str:
+    chars = list(text)
+    for position in rng.sample(range(len(chars)), changes):
+        chars[position] = rng.choice(CJK)
+    return "".join(chars)
+
+
+def reference_groups(texts: list[str], cust_nos: list[str], n_existing: int) -> np.ndarray:
+    """
+    暴力分群: 同公司且精確 Jaccard 達 THRESHOLD 的兩列相連 (兩端都已入庫的除外),
+    每個連通元件以最小列號為代表。
+    """
+    labels = list(range(len(texts)))
+
+    def find(row: int) -> int:
+        while labels[row] != row:
+            row = labels[row]
+        return row
+
+    for j in range(len(texts)):
+        for i in range(j):
+            if j < n_existing or cust_nos[i] != cust_nos[j]:
+                continue
+            if jaccard(texts[i], texts[j]) >= NearDuplicateDetector.THRESHOLD:
+                a, b = find(i), find(j)
+                labels[max(a, b)] = min(a, b)
+    return np.array([find(row) for row in range(len(texts))])
+
+
+def test_signature_agreement_estimates_jaccard():
+    rng = random.Random(0)
+    base = random_text(rng, 2000)
+    # 同一段文字的不同視窗, 重疊程度 (即 Jaccard) 從 0 到 1
+    texts = [base[:1000]] + [base[shift : shift + 1000] for shift in range(0, 1001, 50)]
+    signatures, has_signature = DETECTOR.signatures(texts)
+
+    assert has_signature.all()
+    errors = [
+        abs((signatures[0] == signatures[i]).mean() - jaccard(texts[0], texts[i]))
+        for i in range(1, len(texts))
+    ]
+    assert max(errors) < 0.2
+    assert np.mean(errors) < 0.07
+
+
+def test_signatures_ignore_case_punctuation_and_short_texts():
+    signatures, has_signature = DETECTOR.signatures(
+        ["Python 工程師, 負責後端開發", "python工程師 負責後端開發!!", "短", ""]
+    )
+
+    assert has_signature.tolist() == [True, True, False, False]
+    assert np.array_equal(signatures[0], signatures[1])
+
+
+def test_band_keys_separate_companies():
+    signatures, _ = DETECTOR.signatures(["同一份描述的內容完全相同"] * 2)
+
+    keys = DETECTOR.band_keys(signatures, ["A", "B"])
+
+    assert keys.shape == (2, NearDuplicateDetector.BANDS)
+    assert not np.intersect1d(keys[0], keys[1]).size
+    assert np.array_equal(DETECTOR.band_keys(signatures[:1], ["A"]), keys[:1])
+
+
+@pytest.mark.parametrize("n_existing", [0, 6])
+@pytest.mark.parametrize("seed", range(3))
+def test_assign_matches_exact_jaccard_groups(seed, n_existing):
+    rng = random.Random(seed)
+    texts, cust_nos = [], []
+    for cluster in range(8):
+        base = random_text(rng)
+        cust = rng.choice("AB")
+        for _ in range(rng.randint(1, 4)):
+            # 每份各改 1 個字, 兩兩之間約差 10 個 shingle, Jaccard 約 0.93, 與 THRESHOLD
+            # 保持數個標準差的距離 (簽章估計有誤差); 改 60 個字的不算重複
+            texts.append(edit(rng, base, rng.choice([0, 1, 1, 60])))
+            cust_nos.append(cust)
+        if cluster % 3 == 0:
+            # 同樣的描述由另一家公司刊登, 不可併入
+            texts.append(base)
+            cust_nos.append("C")
+    order = list(range(len(texts)))
+    rng.shuffle(order)
+    texts = [texts[i] for i in order]
+    cust_nos = [cust_nos[i] for i in order]
+
+    signatures, _ = DETECTOR.signatures(texts)
+    labels = DETECTOR.assign(signatures, DETECTOR.band_keys(signatures, cust_nos), n_existing)
+
+    assert labels.tolist() == reference_groups(texts, cust_nos, n_existing).tolist()
+
+
+def test_assign_keeps_existing_rows_apart():
+    texts = ["已入庫的兩筆職缺描述內容相同"] * 2 + ["另一家公司的職缺描述完全不同"]
+    signatures, _ = DETECTOR.signatures(texts)
+    keys = DETECTOR.band_keys(signatures, ["A", "A", "A"])
+
+    assert DETECTOR.assign(signatures, keys, n_existing=2).tolist() == [0, 1, 2]
+    assert DETECTOR.assign(signatures, keys, n_existing=0).tolist() == [0, 0, 2]
@@ -0,0 +1,108 @@
+"""SkillAutomaton / SkillExtractor 與逐一 str.find 的暴力比對結果一致。"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.transformers.skill_extractor import SkillAutomaton, SkillExtractor
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def brute_force(patterns: list[str], texts: list[str]) -> dict[tuple[int, int], int]:
+    """{(描述序號, pattern 序號): 次數}, 以 str.find 找出所有 (可重疊的) 位置再檢查英數字邊界。"""
+    counts: dict[tuple[int, int], int] = {}
+    for doc, text in enumerate(texts):
+        text = text.lower()
+        for index, pattern in enumerate(patterns):
+            start = text.find(pattern)
+            while start >= 0:
+                end = start + len(pattern)
+                bad_start = _is_word(pattern[0]) and start > 0 and _is_word(text[start - 1])
+                bad_end = _is_word(pattern[-1]) and end < len(text) and _is_word(text[end])
+                if not (bad_start or bad_end):
+                    counts[doc, index] = counts.get((doc, index), 0) + 1
+                start = text.find(pattern, start + 1)
+    return counts
+
+
+def scanned(automaton: SkillAutomaton, texts: list[str]) -> dict[tuple[int, int], int]:
+    docs, patterns, counts = automaton.scan(texts)
+    return {
+        (doc, pattern): count
+        for doc, pattern, count in zip(
+            docs.tolist(), patterns.tolist(), counts.tolist(), strict=True
+        )
+    }
+
+
+@pytest.fixture(params=[None, 1, 64], ids=["dense", "sparse", "mixed"])
+def dense_cells(request, monkeypatch):
+    """稠密 DFA 表的大小: 全部 state、只有根 (其餘走 failure link)、以及介於兩者之間。"""
+    if request.param is not None:
+        monkeypatch.setattr(SkillAutomaton, "MAX_DENSE_CELLS", request.param)
+    return request.param
+
+
+def test_word_boundaries():
+    automaton = SkillAutomaton(["Go", "Google", "C++", "Node.js", "中文"])
+    text = "Go, Google, golang, go-kit, GoGo, C++/c++11, node.js, 說中文的工程師"
+
+    expected = brute_force(automaton.patterns, [text])
+
+    assert scanned(automaton, [text]) == expected
+    found = {automaton.patterns[pattern]: count for (_, pattern), count in expected.items()}
+    # "golang", "GoGo" 的 go 不在邊界上; "c++11" 的 c++ 以符號結尾, 後面接數字仍算
+    assert found == {"go": 2, "google": 1, "c++": 2, "node.js": 1, "中文": 1}
+
+
+def test_overlapping_patterns(dense_cells):
+    automaton = SkillAutomaton(["中文", "文中", "中文中", "文中文中", "++", "+++"])
+    texts = ["中文中文中文", "a+++++b", "文中文中"]
+
+    assert scanned(automaton, texts) == brute_force(automaton.patterns, texts)
+
+
+def test_patterns_are_folded_and_short_names_dropped():
+    automaton = SkillAutomaton([" Python ", "python", "C", "R ", "SQL"])
+
+    assert automaton.patterns == ["python", "sql"]
+    assert scanned(automaton, ["PYTHON and c and r"]) == {(0, 0): 1}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_texts_match_brute_force(seed, dense_cells):
+    rng = random.Random(seed)
+    alphabet = "ab+ 中文"
+    names = ["".join(rng.choices(alphabet, k=rng.randint(1, 5))) for _ in range(40)]
+    texts = ["".join(rng.choices(alphabet + "AB", k=rng.randint(0, 60))) for _ in range(30)]
+    automaton = SkillAutomaton(names)
+
+    assert scanned(automaton, texts) == brute_force(automaton.patterns, texts)
+
+
+def test_batches_are_split_by_characters(monkeypatch):
+    monkeypatch.setattr(SkillAutomaton, "MAX_BATCH_CHARS", 10)
+    automaton = SkillAutomaton(["python", "sql"])
+    texts = ["python sql " * 3, "", "sql", "PYTHON"] * 3
+
+    assert scanned(automaton, texts) == brute_force(automaton.patterns, texts)
+
+
+def test_extractor_uses_smallest_id_per_folded_name_and_kind():
+    extractor = SkillExtractor(
+        {"skill": {"Python": 3, "python": 1, "Docker": 2}, "specialty": {"PYTHON": 7}}
+    )
+    job_detail_df = pd.DataFrame(
+        {"job_uid": [10, 11, 12], "job_description": ["python, Python", None, "docker"]}
+    )
+
+    result = extractor.extract(job_detail_df)
+
+    rows = set(result.itertuples(index=False, name=None))
+    assert rows == {(10, "skill", 1, 2), (10, "specialty", 7, 2), (12, "skill", 2, 1)}
+    assert np.issubdtype(result["match_count"].dtype, np.integer)
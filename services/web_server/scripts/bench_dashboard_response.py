@@ -0,0 +1,142 @@
+"""Microbenchmark of the per-request CPU time spent building a dashboard response.
+
+Compares the previous path (rows -> DataFrames -> ``iterrows`` -> Pydantic models ->
+FastAPI re-validation -> ``json``) with the current one (row tuples -> dicts ->
+orjson) on synthetic panel data. No database needed; pandas comes from the dev group:
+
+    uv run python -m scripts.bench_dashboard_response --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import orjson
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from src.db import DashboardPanels
+from src.models import CategoryPoint, DashboardData, DashboardMeta, TimeSeriesPoint
+from src.routers.dashboard import build_dashboard, calculate_percentage
+
+
+def make_panels(rng: random.Random) -> DashboardPanels:
+    """Panels sized like a real response: 30 days, top 10 skills, ~20 areas, ~60 industries."""
+    today = date(2026, 1, 31)
+    trend = [
+        (
+            today - timedelta(days=i),
+            count := rng.randint(50, 500),
+            Decimal(rng.randint(35000, 90000)),
+            count - rng.randint(0, 50),
+        )
+        for i in range(30)
+    ]
+
+    def categories(prefix: str, n: int) -> list[tuple[str, int]]:
+        return sorted(
+            ((f"{prefix}{i}", rng.randint(1, 5000)) for i in range(n)), key=lambda row: -row[1]
+        )
+
+    return DashboardPanels(
+        trend=trend,
+        skills=categories("skill", 10),
+        regions=categories("area", 22),
+        industries=categories("industry", 60),
+        salary=categories("bucket", 7),
+        total_jobs=rng.randint(10_000, 100_000),
+    )
+
+
+def legacy_response(panels: DashboardPanels) -> bytes:
+    """The pre-orjson response path, reproduced for comparison."""
+    trend_df = pd.DataFrame(panels.trend, columns=["date", "jobCount", "avgSalary", "uniqueCount"])
+    frames = {
+        name: pd.DataFrame(rows, columns=["label", "value"])
+        for name, rows in (
+            ("skills", panels.skills),
+            ("regions", panels.regions),
+            ("industries", panels.industries),
+            ("salary", panels.salary),
+        )
+    }
+
+    trend = [
+        TimeSeriesPoint(
+            date=row["date"].strftime("%Y-%m-%d"),
+            jobCount=int(row["jobCount"]),
+            avgSalary=float(row["avgSalary"] or 0),
+            uniqueCount=int(row["uniqueCount"]),
+        )
+        for _, row in trend_df.iterrows()
+    ]
+    trend.reverse()
+
+    def points(df: pd.DataFrame, with_percentage: bool) -> list[CategoryPoint]:
+        total = int(df["value"].sum()) if with_percentage and not df.empty else 0
+        return [
+            CategoryPoint(
+                label=row["label"],
+                value=int(row["value"]),
+                percentage=calculate_percentage(int(row["value"]), total)
+                if with_percentage
+                else None,
+            )
+            for _, row in df.iterrows()
+        ]
+
+    dashboard = DashboardData(
+        meta=DashboardMeta(lastUpdated=datetime.now().isoformat(), totalJobs=panels.total_jobs),
+        trend=trend,
+        skills=points(frames["skills"], False),
+        regions=points(frames["regions"], True),
+        industries=points(frames["industries"], True),
+        salaryDist=points(frames["salary"], True),
+    )
+    # FastAPI validated the returned model against response_model, then JSON-encoded it
+    validated = DashboardData.model_validate(dashboard.model_dump())
+    return json.dumps(jsonable_encoder(validated), separators=(",", ":")).encode()
+
+
+def current_response(panels: DashboardPanels) -> bytes:
+    return orjson.dumps(build_dashboard(panels))
+
+
+def cpu_time_per_call(
+    func: Callable[[DashboardPanels], bytes], panels: DashboardPanels, iterations: int
+) -> float:
+    """Mean process CPU time per call in microseconds."""
+    func(panels)  # warm-up
+    start = time.process_time()
+    for _ in range(iterations):
+        func(panels)
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    panels = make_panels(random.Random(args.seed))
+    assert (
+        orjson.loads(legacy_response(panels))["regions"]
+        == orjson.loads(current_response(panels))["regions"]
+    )
+
+    legacy_us = cpu_time_per_call(legacy_response, panels, args.iterations)
+    current_us = cpu_time_per_call(current_response, panels, args.iterations)
+    print(f"legacy  (pandas + pydantic + json): {legacy_us:9.1f} us/request")
+    print(f"current (tuples + dicts + orjson):  {current_us:9.1f} us/request")
+    print(f"speedup: {legacy_us / current_us:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Bounded in-memory response cache tagged with the silver data version."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class VersionedLRUCache(Generic[K, V]):
+    """LRU cache whose entries expire after ``ttl`` seconds or when the data version moves.
+
+    Every entry belongs to the data version it was computed from. Seeing a newer
+    version drops all entries at once, so a finished ETL run invalidates the whole
+    cache on the next lookup. Only used from the event loop, so no locking.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 600.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._version: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def _sync_version(self, version: int) -> bool:
+        """Drop all entries when ``version`` is newer; False if ``version`` is already stale."""
+        if self._version is None or version > self._version:
+            self._entries.clear()
+            self._version = version
+        return version == self._version
+
+    def get(self, key: K, version: int) -> V | None:
+        """Return the cached value for ``key`` at ``version``, or None on a miss."""
+        if not self._sync_version(version):
+            self.misses += 1
+            return None
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: K, version: int, value: V) -> None:
+        """Store ``value`` computed from ``version``, evicting the least recently used entry."""
+        if not self._sync_version(version):
+            # computed from data that was replaced while the queries ran
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int | None]:
+        """Cache statistics for monitoring."""
+        return {
+            "version": self._version,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
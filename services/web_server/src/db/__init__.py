@@ -1,5 +1,47 @@
 """Database package."""
 
-from .repository import DatabaseRepository
+from .async_repository import (
+    DASHBOARD_PANELS,
+    AsyncDatabaseRepository,
+    DashboardPanels,
+    ExportLimitError,
+)
+from .description_index import DescriptionIndex, DescriptionIndexStore
+from .engine import create_engine_from_env, pool_capacity
+from .repository import DatabaseRepository, JobCursor, JobFilters, JobRow
+from .similar import SimilarityIndex, SimilarityIndexStore, SimilarJob
+from .singleflight import SingleFlight
+from .skills import RelatedSkill, RisingSkill, SkillGraph, SkillGraphStore
+from .snapshot import JobSnapshot, SnapshotStore
+from .suggest import JobNameIndex, JobNameIndexStore, Suggestion
+from .version import DataVersion, DataVersionTracker
 
-__all__ = ["DatabaseRepository"]
+__all__ = [
+    "DASHBOARD_PANELS",
+    "AsyncDatabaseRepository",
+    "DashboardPanels",
+    "DatabaseRepository",
+    "DataVersion",
+    "DataVersionTracker",
+    "DescriptionIndex",
+    "DescriptionIndexStore",
+    "ExportLimitError",
+    "JobCursor",
+    "JobFilters",
+    "JobNameIndex",
+    "JobNameIndexStore",
+    "JobRow",
+    "JobSnapshot",
+    "RelatedSkill",
+    "RisingSkill",
+    "SimilarJob",
+    "SimilarityIndex",
+    "SimilarityIndexStore",
+    "SingleFlight",
+    "SkillGraph",
+    "SkillGraphStore",
+    "SnapshotStore",
+    "Suggestion",
+    "create_engine_from_env",
+    "pool_capacity",
+]
@@ -0,0 +1,288 @@
+"""Async facade over the blocking MySQL repository."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable, Hashable, Iterator, Sequence
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Any, TypeVar
+
+from anyio import CapacityLimiter
+from anyio.to_thread import run_sync
+
+from .repository import (
+    CategoryRow,
+    CubeRow,
+    DatabaseRepository,
+    JobCursor,
+    JobFilters,
+    JobRow,
+    TrendRow,
+)
+from .singleflight import SingleFlight
+from .snapshot import JobSnapshot, SnapshotStore
+
+T = TypeVar("T")
+
+
+# Dashboard panel -> (DashboardPanels field, repository/snapshot query method)
+PANEL_QUERIES: dict[str, tuple[str, str]] = {
+    "meta": ("total_jobs", "get_total_jobs"),
+    "trend": ("trend", "get_job_count_by_date"),
+    "skills": ("skills", "get_top_skills"),
+    "regions": ("regions", "get_jobs_by_region"),
+    "industries": ("industries", "get_jobs_by_industry"),
+    "salary": ("salary", "get_salary_distribution"),
+}
+DASHBOARD_PANELS = tuple(PANEL_QUERIES)
+# Dashboard panel -> repository method answering it for several job_name terms at once
+COMPARE_QUERIES: dict[str, str] = {
+    "meta": "compare_total_jobs",
+    "trend": "compare_job_count_by_date",
+    "skills": "compare_top_skills",
+    "regions": "compare_jobs_by_region",
+    "industries": "compare_jobs_by_industry",
+    "salary": "compare_salary_distribution",
+}
+
+
+@dataclass(frozen=True)
+class DashboardPanels:
+    """Raw query results backing one dashboard response; panels not fetched are None."""
+
+    trend: list[TrendRow] | None = None
+    skills: list[CategoryRow] | None = None
+    regions: list[CategoryRow] | None = None
+    industries: list[CategoryRow] | None = None
+    salary: list[CategoryRow] | None = None
+    total_jobs: int | None = None
+
+
+class ExportLimitError(RuntimeError):
+    """All export slots are taken."""
+
+
+class AsyncDatabaseRepository:
+    """Runs repository queries in worker threads so the event loop never blocks.
+
+    The blocking SQLAlchemy calls are offloaded with ``anyio.to_thread``; a
+    capacity limiter sized to the connection pool keeps threads from queueing on
+    pool checkout. With a ``SnapshotStore`` the dashboard queries are answered from the
+    in-process snapshot instead, and MySQL is only read when the data version moves.
+    Identical queries (same method, filters and data version) already in flight are
+    not started again; the later callers share the running query's result.
+    """
+
+    def __init__(
+        self,
+        repository: DatabaseRepository,
+        max_concurrency: int,
+        snapshot_store: SnapshotStore | None = None,
+        max_exports: int = 1,
+    ) -> None:
+        """
+        Args:
+            repository: Blocking repository sharing the application's engine.
+            max_concurrency: Max queries in flight; together with ``max_exports`` at most
+                pool size + max overflow.
+            snapshot_store: Optional in-process snapshot serving the dashboard queries.
+            max_exports: Max streamed exports in flight, each holding a connection.
+        """
+        self.repository = repository
+        self.snapshot_store = snapshot_store
+        self._limiter = CapacityLimiter(max_concurrency)
+        self._flights = SingleFlight()
+        # Released from whichever worker thread closes the export, hence not an anyio primitive
+        self._export_slots = threading.BoundedSemaphore(max_exports)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return await run_sync(func, *args, limiter=self._limiter)
+
+    async def _coalesced(self, key: Hashable, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func(*args)`` in a worker thread, joining an identical call in flight."""
+        return await self._flights.do(key, partial(self._run, func, *args))
+
+    def flight_stats(self) -> dict[str, int]:
+        """Query coalescing statistics for monitoring."""
+        return {"inFlight": self._flights.in_flight, "coalesced": self._flights.coalesced}
+
+    async def _source(self, version: int | None) -> DatabaseRepository | JobSnapshot:
+        """The snapshot at ``version`` when enabled, otherwise the MySQL repository."""
+        if self.snapshot_store is None or version is None:
+            return self.repository
+        return await self.snapshot_store.get(version)
+
+    async def fetch_dashboard(
+        self,
+        filters: JobFilters = JobFilters(),
+        version: int | None = None,
+        panels: Sequence[str] = DASHBOARD_PANELS,
+    ) -> DashboardPanels:
+        """Run the queries of the requested dashboard panels concurrently.
+
+        Only the selected ``panels`` are queried; latency approaches the slowest single
+        query instead of the sum. ``version`` selects the snapshot to read when the
+        snapshot engine is enabled.
+        """
+        unknown = set(panels) - PANEL_QUERIES.keys()
+        if unknown:
+            raise ValueError(f"Unknown dashboard panels: {sorted(unknown)}")
+
+        repo = await self._source(version)
+        if isinstance(repo, JobSnapshot):
+            # Vectorized in-memory group-bys; one thread call, no connection needed
+            return await self._flights.do(
+                ("snapshot", tuple(panels), filters, repo.version),
+                partial(run_sync, self._snapshot_panels, repo, filters, panels),
+            )
+        # Coalesced per panel, so overlapping panel selections share queries too
+        results = await asyncio.gather(
+            *(
+                self._coalesced(
+                    (panel, filters, version),
+                    getattr(repo, PANEL_QUERIES[panel][1]),
+                    filters,
+                )
+                for panel in panels
+            )
+        )
+        return DashboardPanels(
+            **{PANEL_QUERIES[panel][0]: result for panel, result in zip(panels, results)}
+        )
+
+    @staticmethod
+    def _snapshot_panels(
+        snapshot: JobSnapshot,
+        filters: JobFilters,
+        panels: Sequence[str],
+    ) -> DashboardPanels:
+        return DashboardPanels(
+            **{
+                field: getattr(snapshot, method)(filters)
+                for field, method in (PANEL_QUERIES[panel] for panel in panels)
+            }
+        )
+
+    async def fetch_comparison(
+        self,
+        job_names: Sequence[str],
+        filters: JobFilters = JobFilters(),
+        version: int | None = None,
+        panels: Sequence[str] = DASHBOARD_PANELS,
+    ) -> dict[str, DashboardPanels]:
+        """Dashboard panels of several job_name terms, keyed by term.
+
+        ``filters`` (other than job_name) apply to every term.
+
+        In MySQL every panel is one grouped query over all terms (run concurrently), so
+        comparing N terms costs as many queries as a single dashboard. The snapshot
+        engine evaluates the terms one after another in a single thread call.
+        """
+        unknown = set(panels) - PANEL_QUERIES.keys()
+        if unknown:
+            raise ValueError(f"Unknown dashboard panels: {sorted(unknown)}")
+        job_names = tuple(job_names)
+        filters = replace(filters, job_name=None)
+
+        repo = await self._source(version)
+        if isinstance(repo, JobSnapshot):
+            return await self._flights.do(
+                ("snapshot_compare", tuple(panels), job_names, filters, repo.version),
+                partial(run_sync, self._snapshot_comparison, repo, job_names, filters, panels),
+            )
+        results = await asyncio.gather(
+            *(
+                self._coalesced(
+                    ("compare", panel, job_names, filters, version),
+                    getattr(repo, COMPARE_QUERIES[panel]),
+                    job_names,
+                    filters,
+                )
+                for panel in panels
+            )
+        )
+        return {
+            job_name: DashboardPanels(
+                **{
+                    PANEL_QUERIES[panel][0]: by_term[job_name]
+                    for panel, by_term in zip(panels, results)
+                }
+            )
+            for job_name in job_names
+        }
+
+    @classmethod
+    def _snapshot_comparison(
+        cls,
+        snapshot: JobSnapshot,
+        job_names: Sequence[str],
+        filters: JobFilters,
+        panels: Sequence[str],
+    ) -> dict[str, DashboardPanels]:
+        return {
+            job_name: cls._snapshot_panels(snapshot, replace(filters, job_name=job_name), panels)
+            for job_name in job_names
+        }
+
+    async def fetch_jobs(
+        self, filters: JobFilters, cursor: JobCursor | None = None, limit: int = 20
+    ) -> list[JobRow]:
+        """One page of the job listing; always read from MySQL (the snapshot has no details)."""
+        return await self._coalesced(
+            ("jobs", filters, cursor, limit), self.repository.get_jobs, filters, cursor, limit
+        )
+
+    async def fetch_jobs_by_ids(self, job_uids: Sequence[int]) -> list[JobRow]:
+        """Listing rows of the given jobs, in no particular order."""
+        job_uids = tuple(job_uids)
+        return await self._coalesced(
+            ("jobs_by_ids", job_uids), self.repository.get_jobs_by_ids, job_uids
+        )
+
+    async def fetch_region_cube(
+        self, by: str, filters: JobFilters = JobFilters(), version: int | None = None
+    ) -> list[CubeRow]:
+        """Drill-down roll-up; always read from the ``agg_region_cube`` table in MySQL."""
+        return await self._coalesced(
+            ("region_cube", by, filters, version), self.repository.get_region_cube, by, filters
+        )
+
+    def open_export(self, filters: JobFilters) -> Iterator[list[tuple]]:
+        """Take an export slot and return the export's batches (``stream_jobs_export``).
+
+        An export holds its connection for as long as the client keeps reading, so it runs
+        outside the query limiter, in one of ``max_exports`` slots of its own. The slot is
+        released when the returned generator is exhausted or closed (Starlette pulls it in
+        worker threads; an abandoned response closes it on garbage collection).
+
+        Raises:
+            ExportLimitError: All slots are taken.
+        """
+        if not self._export_slots.acquire(blocking=False):
+            raise ExportLimitError("Too many exports in progress")
+        batches = self._export_batches(filters)
+        # Started up to its first yield, so closing it reaches the finally that frees the slot
+        next(batches)
+        return batches
+
+    def _export_batches(self, filters: JobFilters) -> Iterator[list[tuple]]:
+        try:
+            yield []
+            yield from self.repository.stream_jobs_export(filters)
+        finally:
+            self._export_slots.release()
+
+    async def fetch_salary_percentiles(
+        self,
+        filters: JobFilters = JobFilters(),
+        version: int | None = None,
+    ) -> dict[float, float | None]:
+        """Monthly salary quartiles from the snapshot or MySQL."""
+        repo = await self._source(version)
+        if isinstance(repo, JobSnapshot):
+            return await run_sync(repo.get_salary_percentiles, filters)
+        return await self._coalesced(
+            ("salary_percentiles", filters, version), repo.get_salary_percentiles, filters
+        )
@@ -0,0 +1,155 @@
+"""Job description full-text search over the ETL's memory-mapped inverted index.
+
+The crawler rebuilds the index after every load and publishes it as ``.npy`` files under
+``DESCRIPTION_INDEX_DIR`` (see ``src/loaders/description_index.py`` there): sorted terms,
+their posting offsets, the postings (document rows, ascending per term) and the
+``dim_job.id`` of each row, rows numbered newest job first. ``DescriptionIndex`` opens
+the arrays with ``mmap_mode="r"``, so only the pages a query touches are read, and a
+query is an intersection of sorted postings; MySQL never scans ``job_description``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+from anyio.to_thread import run_sync
+
+from .similar import tokenize_description
+
+logger = logging.getLogger(__name__)
+
+# Must match the crawler's MAX_TERM_BYTES: longer Latin words are indexed truncated
+MAX_TERM_BYTES = 32
+POINTER_FILE = "CURRENT"
+
+
+def description_terms(text: str) -> list[str]:
+    """Distinct index terms of ``text``, tokenized like the ETL tokenizes descriptions."""
+    return list(dict.fromkeys(token[:MAX_TERM_BYTES] for token in tokenize_description(text)))
+
+
+def _intersect(small: np.ndarray, large: np.ndarray) -> np.ndarray:
+    """Sorted values of ``small`` also in ``large`` (both sorted and unique).
+
+    One binary search per element of the smaller list, so only ``O(len(small) * log
+    len(large))`` entries of a memory-mapped ``large`` are paged in.
+    """
+    if small.size == 0 or large.size == 0:
+        return small[:0]
+    positions = np.minimum(np.searchsorted(large, small), large.size - 1)
+    return small[large[positions] == small]
+
+
+class DescriptionIndex:
+    """One published build of the inverted index, memory-mapped read-only.
+
+    A query matches the jobs whose description contains all of its terms: every Latin
+    word as a whole word and every CJK bigram somewhere in the text (so a CJK phrase may
+    match with its bigrams apart). A single CJK character only matches where it stands
+    alone, since longer runs are indexed as bigrams.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.build_id = path.name
+        self.meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        self.terms = np.load(path / "terms.npy", mmap_mode="r")
+        self.offsets = np.load(path / "offsets.npy", mmap_mode="r")
+        self.postings = np.load(path / "postings.npy", mmap_mode="r")
+        self.job_uids = np.load(path / "jobs.npy", mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.job_uids)
+
+    def term_postings(self, term: str) -> np.ndarray:
+        """Rows of the jobs containing ``term`` (a view into the mapped postings)."""
+        key = term.encode()
+        if len(key) > self.terms.dtype.itemsize:
+            return self.postings[:0]
+        position = int(np.searchsorted(self.terms, key))
+        if position >= len(self.terms) or self.terms[position] != key:
+            return self.postings[:0]
+        return self.postings[self.offsets[position] : self.offsets[position + 1]]
+
+    def search(self, query: str, offset: int = 0, limit: int = 20) -> tuple[int, list[int]]:
+        """Number of jobs matching every term of ``query`` and one page of their ids.
+
+        Postings are intersected shortest first, so the work is bounded by the rarest
+        term. Rows ascend from the newest job, so pages come out newest first.
+        """
+        terms = description_terms(query)
+        if not terms:
+            return 0, []
+        lists = sorted((self.term_postings(term) for term in terms), key=len)
+        rows = np.asarray(lists[0])
+        for postings in lists[1:]:
+            if rows.size == 0:
+                break
+            rows = _intersect(rows, postings)
+        return int(rows.size), self.job_uids[rows[offset : offset + limit]].tolist()
+
+
+class DescriptionIndexStore:
+    """Opens the build the ETL published last and switches when the data version moves.
+
+    The crawler publishes the index before it records the ETL run, so by the time a new
+    data version is visible its build is in place. Opening only maps files, so unlike
+    the other stores nothing is rebuilt here. ``get`` returns None until a first build
+    exists (a manual ``--mode search-index`` build is picked up at the next version).
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._index: DescriptionIndex | None = None
+        self._checked_version = -1
+        self._lock = asyncio.Lock()
+        self.opened_at: float | None = None
+
+    async def get(self, version: int) -> DescriptionIndex | None:
+        """Return the published index as of ``version``, re-reading the pointer when stale."""
+        if self._checked_version >= version:
+            return self._index
+        async with self._lock:
+            if self._checked_version < version:
+                index = await run_sync(self._open, self._index)
+                if index is not self._index:
+                    self._index = index
+                    self.opened_at = time.time()
+                # Without any build yet, keep looking for the first one on every request
+                if index is not None:
+                    self._checked_version = version
+        return self._index
+
+    def _open(self, current: DescriptionIndex | None) -> DescriptionIndex | None:
+        try:
+            build_id = (self.directory / POINTER_FILE).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            logger.warning("No description index published in %s yet", self.directory)
+            return current
+        if current is not None and current.build_id == build_id:
+            return current
+        index = DescriptionIndex(self.directory / build_id)
+        logger.info(
+            "Opened description index %s: %d jobs, %d terms",
+            build_id,
+            len(index),
+            len(index.terms),
+        )
+        return index
+
+    def stats(self) -> dict[str, int | float | str | None]:
+        """Index build and size for monitoring."""
+        index = self._index
+        return {
+            "build": index.build_id if index else None,
+            "builtAt": index.meta.get("builtAt") if index else None,
+            "jobs": len(index) if index else 0,
+            "terms": len(index.terms) if index else 0,
+            "postings": len(index.postings) if index else 0,
+            "openedAt": self.opened_at,
+        }
@@ -0,0 +1,74 @@
+"""SQLAlchemy engine factory shared by the whole application."""
+
+from __future__ import annotations
+
+import os
+import urllib.parse
+
+import sqlalchemy as sa
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    return value.lower() in ("1", "true", "yes") if value else default
+
+
+def pool_settings() -> dict[str, int | bool]:
+    """Connection pool settings (``create_engine`` keyword arguments) from the environment."""
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 5),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+    }
+
+
+def pool_capacity() -> int:
+    """Max connections the pool hands out at once (pool size + overflow)."""
+    settings = pool_settings()
+    return int(settings["pool_size"]) + int(settings["max_overflow"])
+
+
+def create_engine_from_env() -> sa.Engine:
+    """Create the pooled MySQL engine from environment variables.
+
+    Called once per process (in the FastAPI lifespan); every request borrows a
+    connection from this pool instead of opening its own engine.
+    """
+    driver = os.getenv("SQL_DRIVER", "mysql+mysqlconnector")
+    username = os.getenv("SQL_WEB_USER")
+    password = os.getenv("SQL_WEB_PASSWORD")
+    host = os.getenv("DB_HOST", "localhost")
+    database = os.getenv("SQL_DATABASE")
+
+    if not all([username, password, database]):
+        raise ValueError("Missing required database environment variables")
+
+    username = urllib.parse.quote_plus(str(username))
+    password = urllib.parse.quote_plus(str(password))
+
+    conn_str = f"{driver}://{username}:{password}@{host}/{database}"
+    return sa.create_engine(conn_str, **pool_settings())
+
+
+def pool_stats(engine: sa.Engine) -> dict[str, int | str]:
+    """Snapshot of the connection pool for monitoring."""
+    pool = engine.pool
+    stats: dict[str, int | str] = {"status": pool.status()}
+    if isinstance(pool, sa.QueuePool):
+        stats.update(
+            size=pool.size(),
+            checkedIn=pool.checkedin(),
+            checkedOut=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return stats
@@ -2,148 +2,955 @@
 
 from __future__ import annotations
 
-import os
-import urllib.parse
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, fields, replace
+from datetime import date, datetime
+from decimal import Decimal
 
-import pandas as pd
+import numpy as np
 import sqlalchemy as sa
-from dotenv import load_dotenv
 
-load_dotenv()
+from .engine import create_engine_from_env, pool_stats
+
+# Plain row tuples straight from the driver; no DataFrame round trip on the request path
+# (date, job count, average salary, job count without near-duplicate reposts)
+TrendRow = tuple[date, int, Decimal | float | None, int]
+CategoryRow = tuple[str, int]  # (label, job count)
+# (id, job_id, job_name, job_family, company, area, region, salary min, max, monthly, date)
+JobRow = tuple[int, str, str, str | None, str | None, str, str, int, int, int | None, date]
+JobCursor = tuple[date, int]  # (appear_date, id) of the last job of the previous page
+CubeRow = tuple[str | date, int, Decimal | float | None]  # (label or month, count, avg salary)
+WeeklyRow = tuple[date, str, int, int]  # (week, job family, skill/specialty id, job count)
+
+
+FilterValue = str | int | date
+
+
+@dataclass(frozen=True)
+class JobFilters:
+    """Filters of the dashboard panels and the job listing; None means unfiltered.
+
+    Hashable, so a filter combination can key caches and coalesced queries directly.
+    """
+
+    job_name: str | None = None
+    job_family: str | None = None
+    area: str | None = None  # address_area
+    region: str | None = None  # address_region
+    skill: str | None = None
+    salary_type: int | None = None
+    edu: str | None = None
+    work_exp: str | None = None
+    salary_min: int | None = None  # monthly, inclusive
+    salary_max: int | None = None  # monthly, exclusive
+    date_from: date | None = None  # inclusive
+    date_to: date | None = None  # inclusive
 
 
 class DatabaseRepository:
     """Repository for dashboard data queries."""
 
-    def __init__(self) -> None:
-        """Initialize database connection."""
-        driver = os.getenv("SQL_DRIVER", "mysql+mysqlconnector")
-        username = os.getenv("SQL_WEB_USER")
-        password = os.getenv("SQL_WEB_PASSWORD")
-        host = os.getenv("DB_HOST", "localhost")
-        database = os.getenv("SQL_DATABASE")
-
-        if not all([username, password, database]):
-            raise ValueError("Missing required database environment variables")
-
-        username = urllib.parse.quote_plus(str(username))
-        password = urllib.parse.quote_plus(str(password))
-
-        conn_str = f"{driver}://{username}:{password}@{host}/{database}"
-        self.engine = sa.create_engine(conn_str)
-
-    def _build_job_filter(self, job_name: str | None) -> str:
-        """Build WHERE clause for job_name filter."""
-        if not job_name:
-            return ""
-        # Use parameterized query in the actual methods to prevent SQL injection
-        return "WHERE job_name LIKE :job_name"
-
-    def get_job_count_by_date(self, job_name: str | None = None) -> pd.DataFrame:
-        """Get job count and average salary grouped by date."""
-        filter_clause = "WHERE job_name LIKE :job_name" if job_name else ""
+    TREND_DAYS = 30
+    # (label, lower bound inclusive, upper bound exclusive) on salary_monthly_mid
+    SALARY_BUCKETS = [
+        ("< 30K", 0, 30000),
+        ("30K-40K", 30000, 40000),
+        ("40K-50K", 40000, 50000),
+        ("50K-60K", 50000, 60000),
+        ("60K-80K", 60000, 80000),
+        ("80K-100K", 80000, 100000),
+        ("> 100K", 100000, 2**31 - 1),
+    ]
+    # SELECT list of a JobRow over ``dim_job dj LEFT JOIN cust_info ci``
+    JOB_ROW_COLUMNS = """
+            dj.id,
+            dj.job_id,
+            dj.job_name,
+            dj.job_family,
+            ci.cust_name,
+            dj.address_area,
+            dj.address_region,
+            dj.salary_min,
+            dj.salary_max,
+            dj.salary_monthly_mid,
+            dj.appear_date
+    """
+    # (column, aggregated name, source) of the '|'-joined bridge lists in exports
+    EXPORT_BRIDGES = [
+        ("skills", "d.skill_name", "bridge_skills b JOIN dim_skill d ON d.id = b.skill_id"),
+        (
+            "specialties",
+            "d.specialty_name",
+            "bridge_specialties b JOIN dim_specialty d ON d.id = b.specialty_id",
+        ),
+        (
+            "categories",
+            "d.category_name",
+            "bridge_category b JOIN dim_category d ON d.id = b.category_id",
+        ),
+        ("majors", "b.major_name", "bridge_major b"),
+        ("languages", "b.language", "bridge_language b"),
+    ]
+    # (name, Python type) of the exported columns, in SELECT order
+    EXPORT_COLUMNS: list[tuple[str, type]] = [
+        ("id", int),
+        ("job_id", str),
+        ("job_name", str),
+        ("job_family", str),
+        ("work_type", str),
+        ("salary_type", str),
+        ("salary_min", int),
+        ("salary_max", int),
+        ("salary_monthly_mid", int),
+        ("address_area", str),
+        ("address_region", str),
+        ("work_exp", str),
+        ("edu", str),
+        ("work_period", str),
+        ("vacation_policy", str),
+        ("appear_date", date),
+        ("updated_date", date),
+        ("cust_no", str),
+        ("cust_name", str),
+        ("industry", str),
+        ("employees", int),
+        ("need_emp", str),
+        ("manage_resp", str),
+        ("business_trip", str),
+        ("remote_work", str),
+        ("job_description", str),
+        *((alias, str) for alias, _, _ in EXPORT_BRIDGES),
+    ]
+    # JobFilters field -> (dim_job column, operator). Only these fixed fragments reach the
+    # SQL text; every filter value is passed as a bound parameter.
+    FILTER_COLUMNS: dict[str, tuple[str, str]] = {
+        "job_family": ("job_family", "="),
+        "area": ("address_area", "="),
+        "region": ("address_region", "="),
+        "salary_type": ("salary_type", "="),
+        "edu": ("edu", "="),
+        "work_exp": ("work_exp", "="),
+        "salary_min": ("salary_monthly_mid", ">="),
+        "salary_max": ("salary_monthly_mid", "<"),
+        # Constant date bounds let MySQL prune the monthly partitions outside them
+        "date_from": ("appear_date", ">="),
+        "date_to": ("appear_date", "<="),
+    }
+    # A job counted once among its near-duplicate reposts: the canonical posting, or one
+    # whose description was too short to compare (same rule as agg_daily_jobs.unique_count)
+    UNIQUE_JOB = "({alias}canonical_job_uid IS NULL OR {alias}canonical_job_uid = {alias}id)"
+    # Drill-down dimension -> agg_region_cube column
+    CUBE_DIMENSIONS: dict[str, str] = {
+        "area": "address_area",
+        "region": "address_region",
+        "job_family": "job_family",
+        "month": "month",
+    }
+    # JobFilters fields a cube slice can set
+    CUBE_FILTERS = ("area", "region", "job_family", "date_from", "date_to")
+    # Skill kind -> (bridge table, id column, dictionary table, name column, weekly aggregate)
+    SKILL_KINDS: dict[str, tuple[str, str, str, str, str]] = {
+        "skill": ("bridge_skills", "skill_id", "dim_skill", "skill_name", "agg_skill_weekly"),
+        "specialty": (
+            "bridge_specialties",
+            "specialty_id",
+            "dim_specialty",
+            "specialty_name",
+            "agg_specialty_weekly",
+        ),
+    }
+    # Similar-jobs index sources: (term prefix, bridge table, id column)
+    SIMILARITY_BRIDGES = (
+        ("s", "bridge_skills", "skill_id"),
+        ("p", "bridge_specialties", "specialty_id"),
+        ("c", "bridge_category", "category_id"),
+    )
+    # Leading characters of job_description fed to the similar-jobs index
+    DESCRIPTION_CHARS = 2000
+    # Job ids per IN (...) list when loading documents for the similar-jobs index
+    ID_CHUNK_SIZE = 5000
+    SEARCH_MODES = ("fulltext", "like")
+    # Must match the server's ngram_token_size; shorter words have no ngram tokens to match
+    NGRAM_TOKEN_SIZE = 2
+
+    def __init__(self, engine: sa.Engine | None = None, search_mode: str = "fulltext") -> None:
+        """Initialize the repository on a shared, pooled engine.
+
+        Args:
+            engine: Engine created once at application startup. A new one is created
+                from environment variables when omitted (scripts, REPL).
+            search_mode: How job_name filters are matched: ``"fulltext"`` uses the ngram
+                FULLTEXT index on ``job_search``, ``"like"`` scans ``dim_job.job_name``.
+        """
+        if search_mode not in self.SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {search_mode}")
+        self.engine = engine if engine is not None else create_engine_from_env()
+        self.search_mode = search_mode
+
+    def pool_stats(self) -> dict[str, int | str]:
+        """Connection pool statistics for monitoring."""
+        return pool_stats(self.engine)
+
+    def _job_filter(
+        self, filters: JobFilters, alias: str = ""
+    ) -> tuple[list[str], dict[str, FilterValue]]:
+        """Build parameterized WHERE conditions on ``dim_job`` for any filter combination.
+
+        Conditions are ANDed; column names and operators come from ``FILTER_COLUMNS``.
+        """
+        prefix = f"{alias}." if alias else ""
+        conditions: list[str] = []
+        params: dict[str, FilterValue] = {}
+        job_name = filters.job_name
+        if job_name and self._use_fulltext(job_name):
+            # job_search holds a copy of job_name outside the partitioned dim_job, which
+            # cannot carry a FULLTEXT index
+            conditions.append(
+                f"{prefix}id IN (SELECT job_uid FROM job_search"
+                " WHERE MATCH(job_name) AGAINST(:job_name IN BOOLEAN MODE))"
+            )
+            # Quoted phrase: ngram tokens must appear in order, i.e. a substring match
+            params["job_name"] = '"{}"'.format(job_name.replace('"', " "))
+        elif job_name:
+            conditions.append(f"{prefix}job_name LIKE :job_name")
+            params["job_name"] = f"%{job_name}%"
+        for field, (column, operator) in self.FILTER_COLUMNS.items():
+            value = getattr(filters, field)
+            if value is not None and value != "":
+                conditions.append(f"{prefix}{column} {operator} :{field}")
+                params[field] = value
+        if filters.skill:
+            conditions.append(
+                f"{prefix}id IN (SELECT bs_f.job_uid FROM bridge_skills bs_f"
+                " JOIN dim_skill ds_f ON ds_f.id = bs_f.skill_id WHERE ds_f.skill_name = :skill)"
+            )
+            params["skill"] = filters.skill
+        return conditions, params
+
+    def _use_fulltext(self, job_name: str) -> bool:
+        """Whether a job_name term can be served by the ngram FULLTEXT index.
+
+        Words shorter than the ngram token size (e.g. "C", "R") produce no tokens, so
+        such terms fall back to ``LIKE``.
+        """
+        if self.search_mode != "fulltext":
+            return False
+        words = job_name.replace('"', " ").split()
+        return bool(words) and min(len(word) for word in words) >= self.NGRAM_TOKEN_SIZE
+
+    @staticmethod
+    def _where(conditions: list[str]) -> str:
+        return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    @staticmethod
+    def _uses_aggregates(filters: JobFilters) -> bool:
+        """Whether the pre-aggregated tables (keyed by job_family only) can answer."""
+        return filters == JobFilters(job_family=filters.job_family)
+
+    def _family_filter(self, job_family: str | None) -> tuple[str, dict[str, str]]:
+        """WHERE clause for the pre-aggregated tables, which are keyed by job_family."""
+        if not job_family:
+            return "", {}
+        return "WHERE job_family = :job_family", {"job_family": job_family}
+
+    def get_job_count_by_date(self, filters: JobFilters = JobFilters()) -> list[TrendRow]:
+        """Get job count, average salary and unique job count grouped by date.
+
+        With at most a job_family filter the trend is read from ``agg_daily_jobs``.
+        Otherwise the oldest of the latest ``TREND_DAYS`` dates is looked up first and
+        passed back as a constant, so MySQL prunes the ``dim_job`` partitions outside the
+        window.
+        """
+        if self._uses_aggregates(filters):
+            family_clause, params = self._family_filter(filters.job_family)
+            query = f"""
+            SELECT
+                appear_date as date,
+                SUM(job_count) as jobCount,
+                SUM(salary_sum) / NULLIF(SUM(salary_count), 0) as avgSalary,
+                SUM(unique_count) as uniqueCount
+            FROM agg_daily_jobs
+            {family_clause}
+            GROUP BY appear_date
+            ORDER BY date DESC
+            LIMIT {self.TREND_DAYS}
+            """
+            with self.engine.connect() as conn:
+                return list(conn.execute(sa.text(query), params).tuples())
+
+        conditions, params = self._job_filter(filters)
+        since_query = f"""
+        SELECT MIN(appear_date) FROM (
+            SELECT DISTINCT appear_date
+            FROM dim_job
+            {self._where(conditions)}
+            ORDER BY appear_date DESC
+            LIMIT {self.TREND_DAYS}
+        ) recent
+        """
         query = f"""
         SELECT
             DATE(appear_date) as date,
             COUNT(*) as jobCount,
-            AVG((salary_min + salary_max) / 2) as avgSalary
+            AVG(salary_monthly_mid) as avgSalary,
+            SUM({self.UNIQUE_JOB.format(alias="")}) as uniqueCount
         FROM dim_job
-        {filter_clause}
+        {self._where(["appear_date >= :since", *conditions])}
         GROUP BY DATE(appear_date)
         ORDER BY date DESC
-        LIMIT 30
         """
         with self.engine.connect() as conn:
-            params = {"job_name": f"%{job_name}%"} if job_name else {}
-            return pd.read_sql(sa.text(query), conn, params=params)
+            since = conn.execute(sa.text(since_query), params).scalar()
+            if since is None:
+                return []
+            return list(conn.execute(sa.text(query), {**params, "since": since}).tuples())
 
-    def get_top_skills(self, job_name: str | None = None, limit: int = 10) -> pd.DataFrame:
-        """Get top skills by job count."""
-        join_clause = ""
-        filter_clause = ""
+    def get_top_skills(
+        self, filters: JobFilters = JobFilters(), limit: int = 10
+    ) -> list[CategoryRow]:
+        """Get top skills by job count.
 
-        if job_name:
-            join_clause = "JOIN dim_job dj ON bs.job_uid = dj.id"
-            filter_clause = "WHERE dj.job_name LIKE :job_name"
+        Counts are grouped by the integer ``skill_id`` first (from ``agg_skill_counts``
+        with at most a job_family filter); only the top ``limit`` ids are joined back to
+        ``dim_skill`` for their names.
+        """
+        if self._uses_aggregates(filters):
+            family_clause, params = self._family_filter(filters.job_family)
+            counts = f"""
+                SELECT
+                    skill_id,
+                    SUM(job_count) as value
+                FROM agg_skill_counts
+                {family_clause}
+                GROUP BY skill_id
+            """
+        else:
+            # Always join dim_job: bridge rows of archived dim_job partitions stay in place
+            # and must not be counted.
+            conditions, params = self._job_filter(filters, alias="dj")
+            counts = f"""
+                SELECT
+                    bs.skill_id,
+                    COUNT(*) as value
+                FROM bridge_skills bs
+                JOIN dim_job dj ON bs.job_uid = dj.id
+                {self._where(conditions)}
+                GROUP BY bs.skill_id
+            """
 
         query = f"""
         SELECT
-            bs.skill_name as label,
-            COUNT(*) as value
-        FROM bridge_skills bs
-        {join_clause}
-        {filter_clause}
-        GROUP BY bs.skill_name
+            ds.skill_name as label,
+            top.value as value
+        FROM (
+            {counts}
+            ORDER BY value DESC
+            LIMIT {limit}
+        ) top
+        JOIN dim_skill ds ON ds.id = top.skill_id
         ORDER BY value DESC
-        LIMIT {limit}
         """
         with self.engine.connect() as conn:
-            params = {"job_name": f"%{job_name}%"} if job_name else {}
-            return pd.read_sql(sa.text(query), conn, params=params)
+            return list(conn.execute(sa.text(query), params).tuples())
+
+    def get_jobs_by_region(self, filters: JobFilters = JobFilters()) -> list[CategoryRow]:
+        """Get job count by region; jobs without an area are reported as '' on both paths."""
+        if self._uses_aggregates(filters):
+            family_clause, params = self._family_filter(filters.job_family)
+            query = f"""
+            SELECT
+                address_area as label,
+                SUM(job_count) as value
+            FROM agg_region_counts
+            {family_clause}
+            GROUP BY address_area
+            ORDER BY value DESC
+            """
+        else:
+            conditions, params = self._job_filter(filters)
+            query = f"""
+            SELECT
+                COALESCE(address_area, '') as label,
+                COUNT(*) as value
+            FROM dim_job
+            {self._where(conditions)}
+            GROUP BY COALESCE(address_area, '')
+            ORDER BY value DESC
+            """
+        with self.engine.connect() as conn:
+            return list(conn.execute(sa.text(query), params).tuples())
+
+    def get_jobs_by_industry(self, filters: JobFilters = JobFilters()) -> list[CategoryRow]:
+        """Get job count by industry; companies without one are reported as '' on both paths."""
+        if self._uses_aggregates(filters):
+            family_clause, params = self._family_filter(filters.job_family)
+            query = f"""
+            SELECT
+                industry as label,
+                SUM(job_count) as value
+            FROM agg_industry_counts
+            {family_clause}
+            GROUP BY industry
+            ORDER BY value DESC
+            """
+        else:
+            conditions, params = self._job_filter(filters, alias="dj")
+            query = f"""
+            SELECT
+                COALESCE(ci.industry, '') as label,
+                COUNT(*) as value
+            FROM dim_job dj
+            JOIN cust_info ci ON dj.cust_no = ci.cust_no
+            {self._where(conditions)}
+            GROUP BY COALESCE(ci.industry, '')
+            ORDER BY value DESC
+            """
+        with self.engine.connect() as conn:
+            return list(conn.execute(sa.text(query), params).tuples())
+
+    def get_salary_distribution(self, filters: JobFilters = JobFilters()) -> list[CategoryRow]:
+        """Get salary distribution in ranges.
+
+        With at most a job_family filter the counts come from ``agg_salary_buckets``, keyed
+        by bucket lower bound. Otherwise buckets are joined as a derived table on
+        ``salary_monthly_mid`` ranges, so MySQL can count each bucket with a range scan on
+        ``idx_salary_monthly``.
+        """
+        if self._uses_aggregates(filters):
+            family_clause, params = self._family_filter(filters.job_family)
+            query = f"""
+            SELECT
+                salary_bucket,
+                SUM(job_count) as value
+            FROM agg_salary_buckets
+            {family_clause}
+            GROUP BY salary_bucket
+            ORDER BY salary_bucket
+            """
+            with self.engine.connect() as conn:
+                counts = conn.execute(sa.text(query), params).tuples().all()
+            labels = {lower: label for label, lower, _ in self.SALARY_BUCKETS}
+            return [(labels[bucket], value) for bucket, value in counts]
 
-    def get_jobs_by_region(self, job_name: str | None = None) -> pd.DataFrame:
-        """Get job count by region."""
-        filter_clause = "WHERE job_name LIKE :job_name" if job_name else ""
+        bucket_rows = ", ".join(
+            f"ROW(:label_{i}, :lower_{i}, :upper_{i})" for i in range(len(self.SALARY_BUCKETS))
+        )
+        conditions, filter_params = self._job_filter(filters, alias="dj")
         query = f"""
         SELECT
-            address_area as label,
+            b.label as label,
             COUNT(*) as value
-        FROM dim_job
-        {filter_clause}
-        GROUP BY address_area
-        ORDER BY value DESC
+        FROM (VALUES {bucket_rows}) AS b (label, lower_bound, upper_bound)
+        JOIN dim_job dj
+            ON dj.salary_monthly_mid >= b.lower_bound
+            AND dj.salary_monthly_mid < b.upper_bound
+        {self._where(conditions)}
+        GROUP BY b.label, b.lower_bound
+        ORDER BY b.lower_bound
         """
+        bucket_params: dict[str, FilterValue] = dict(filter_params)
+        for i, (label, lower, upper) in enumerate(self.SALARY_BUCKETS):
+            bucket_params.update({f"label_{i}": label, f"lower_{i}": lower, f"upper_{i}": upper})
         with self.engine.connect() as conn:
-            params = {"job_name": f"%{job_name}%"} if job_name else {}
-            return pd.read_sql(sa.text(query), conn, params=params)
+            return list(conn.execute(sa.text(query), bucket_params).tuples())
 
-    def get_jobs_by_industry(self, job_name: str | None = None) -> pd.DataFrame:
-        """Get job count by industry."""
-        filter_clause = "WHERE dj.job_name LIKE :job_name" if job_name else ""
+    def get_total_jobs(self, filters: JobFilters = JobFilters()) -> int:
+        """Get total job count."""
+        if self._uses_aggregates(filters):
+            family_clause, params = self._family_filter(filters.job_family)
+            query = (
+                f"SELECT COALESCE(SUM(job_count), 0) as total FROM agg_daily_jobs {family_clause}"
+            )
+        else:
+            conditions, params = self._job_filter(filters)
+            query = f"SELECT COUNT(*) as total FROM dim_job {self._where(conditions)}"
+        with self.engine.connect() as conn:
+            result = conn.execute(sa.text(query), params)
+            row = result.fetchone()
+            return int(row[0]) if row else 0
+
+    def get_region_cube(self, by: str, filters: JobFilters = JobFilters()) -> list[CubeRow]:
+        """Roll up ``agg_region_cube`` along one dimension within a slice.
+
+        ``by`` is a key of ``CUBE_DIMENSIONS``. Only the ``CUBE_FILTERS`` fields of
+        ``filters`` may be set; date bounds select the whole months containing them. Rows
+        come largest first, or chronologically when rolling up by month. Never reads
+        ``dim_job``, so any slice costs the same.
+        """
+        column = self.CUBE_DIMENSIONS.get(by)
+        if column is None:
+            raise ValueError(f"Unknown drill-down dimension: {by}")
+        unsupported = [
+            field.name
+            for field in fields(filters)
+            if field.name not in self.CUBE_FILTERS and getattr(filters, field.name) is not None
+        ]
+        if unsupported:
+            raise ValueError(f"The drill-down cube cannot filter by {unsupported}")
+
+        conditions: list[str] = []
+        params: dict[str, FilterValue] = {}
+        for field in ("area", "region", "job_family"):
+            value = getattr(filters, field)
+            if value is not None:
+                conditions.append(f"{self.CUBE_DIMENSIONS[field]} = :{field}")
+                params[field] = value
+        if filters.date_from is not None:
+            conditions.append("month >= :month_from")
+            params["month_from"] = filters.date_from.replace(day=1)
+        if filters.date_to is not None:
+            conditions.append("month <= :month_to")
+            params["month_to"] = filters.date_to.replace(day=1)
         query = f"""
         SELECT
-            ci.industry as label,
+            {column} as label,
+            SUM(job_count) as job_count,
+            SUM(salary_sum) / NULLIF(SUM(salary_count), 0) as avg_salary
+        FROM agg_region_cube
+        {self._where(conditions)}
+        GROUP BY {column}
+        ORDER BY {"month" if by == "month" else "job_count DESC"}
+        """
+        with self.engine.connect() as conn:
+            return list(conn.execute(sa.text(query), params).tuples())
+
+    def _term_matches(self, job_names: Sequence[str]) -> tuple[str, dict[str, str]]:
+        """Derived table ``(term, job_uid)`` of the jobs matching each job_name term.
+
+        ``term`` is the term's position in ``job_names``. Each term is matched the same way
+        as a single ``job_name`` filter (ngram FULLTEXT index or ``LIKE``), so the grouped
+        results equal those of one query per term.
+        """
+        selects: list[str] = []
+        params: dict[str, str] = {}
+        for i, job_name in enumerate(job_names):
+            if self._use_fulltext(job_name):
+                selects.append(
+                    f"SELECT {i} AS term, job_uid FROM job_search"
+                    f" WHERE MATCH(job_name) AGAINST(:job_name_{i} IN BOOLEAN MODE)"
+                )
+                params[f"job_name_{i}"] = '"{}"'.format(job_name.replace('"', " "))
+            else:
+                selects.append(
+                    f"SELECT {i} AS term, id AS job_uid FROM dim_job"
+                    f" WHERE job_name LIKE :job_name_{i}"
+                )
+                params[f"job_name_{i}"] = f"%{job_name}%"
+        return " UNION ALL ".join(selects), params
+
+    def _compare_filter(
+        self, job_names: Sequence[str], filters: JobFilters
+    ) -> tuple[str, str, dict[str, FilterValue]]:
+        """FROM and WHERE clauses joining the term matches to ``dim_job dj``.
+
+        ``filters`` apply to every term; its own job_name is ignored.
+        """
+        matches, params = self._term_matches(job_names)
+        conditions, filter_params = self._job_filter(replace(filters, job_name=None), alias="dj")
+        from_clause = f"({matches}) m JOIN dim_job dj ON dj.id = m.job_uid"
+        return from_clause, self._where(conditions), {**params, **filter_params}
+
+    @staticmethod
+    def _by_term(rows: Iterable[tuple], job_names: Sequence[str]) -> dict[str, list]:
+        """Split ``(term, *values)`` rows into one list per job_name, in row order."""
+        grouped: dict[str, list] = {job_name: [] for job_name in job_names}
+        for term, *values in rows:
+            grouped[job_names[term]].append(tuple(values))
+        return grouped
+
+    def compare_job_count_by_date(
+        self, job_names: Sequence[str], filters: JobFilters = JobFilters()
+    ) -> dict[str, list[TrendRow]]:
+        """``get_job_count_by_date`` for each term: its latest ``TREND_DAYS`` dates."""
+        from_clause, where, params = self._compare_filter(job_names, filters)
+        query = f"""
+        SELECT term, date, jobCount, avgSalary, uniqueCount
+        FROM (
+            SELECT
+                daily.*,
+                ROW_NUMBER() OVER (PARTITION BY term ORDER BY date DESC) as day_rank
+            FROM (
+                SELECT
+                    m.term,
+                    DATE(dj.appear_date) as date,
+                    COUNT(*) as jobCount,
+                    AVG(dj.salary_monthly_mid) as avgSalary,
+                    SUM({self.UNIQUE_JOB.format(alias="dj.")}) as uniqueCount
+                FROM {from_clause}
+                {where}
+                GROUP BY m.term, DATE(dj.appear_date)
+            ) daily
+        ) ranked
+        WHERE day_rank <= {self.TREND_DAYS}
+        ORDER BY term, date DESC
+        """
+        with self.engine.connect() as conn:
+            return self._by_term(conn.execute(sa.text(query), params).tuples(), job_names)
+
+    def compare_top_skills(
+        self, job_names: Sequence[str], filters: JobFilters = JobFilters(), limit: int = 10
+    ) -> dict[str, list[CategoryRow]]:
+        """``get_top_skills`` for each term; only each term's top ``limit`` ids get names."""
+        from_clause, where, params = self._compare_filter(job_names, filters)
+        query = f"""
+        SELECT
+            top.term,
+            ds.skill_name as label,
+            top.value as value
+        FROM (
+            SELECT
+                counts.*,
+                ROW_NUMBER() OVER (PARTITION BY term ORDER BY value DESC) as skill_rank
+            FROM (
+                SELECT
+                    m.term,
+                    bs.skill_id,
+                    COUNT(*) as value
+                FROM {from_clause}
+                JOIN bridge_skills bs ON bs.job_uid = dj.id
+                {where}
+                GROUP BY m.term, bs.skill_id
+            ) counts
+        ) top
+        JOIN dim_skill ds ON ds.id = top.skill_id
+        WHERE top.skill_rank <= {limit}
+        ORDER BY top.term, value DESC
+        """
+        with self.engine.connect() as conn:
+            return self._by_term(conn.execute(sa.text(query), params).tuples(), job_names)
+
+    def compare_jobs_by_region(
+        self, job_names: Sequence[str], filters: JobFilters = JobFilters()
+    ) -> dict[str, list[CategoryRow]]:
+        """``get_jobs_by_region`` for each term."""
+        from_clause, where, params = self._compare_filter(job_names, filters)
+        query = f"""
+        SELECT
+            m.term,
+            COALESCE(dj.address_area, '') as label,
             COUNT(*) as value
-        FROM dim_job dj
+        FROM {from_clause}
+        {where}
+        GROUP BY m.term, COALESCE(dj.address_area, '')
+        ORDER BY m.term, value DESC
+        """
+        with self.engine.connect() as conn:
+            return self._by_term(conn.execute(sa.text(query), params).tuples(), job_names)
+
+    def compare_jobs_by_industry(
+        self, job_names: Sequence[str], filters: JobFilters = JobFilters()
+    ) -> dict[str, list[CategoryRow]]:
+        """``get_jobs_by_industry`` for each term."""
+        from_clause, where, params = self._compare_filter(job_names, filters)
+        query = f"""
+        SELECT
+            m.term,
+            COALESCE(ci.industry, '') as label,
+            COUNT(*) as value
+        FROM {from_clause}
         JOIN cust_info ci ON dj.cust_no = ci.cust_no
-        {filter_clause}
-        GROUP BY ci.industry
-        ORDER BY value DESC
+        {where}
+        GROUP BY m.term, COALESCE(ci.industry, '')
+        ORDER BY m.term, value DESC
+        """
+        with self.engine.connect() as conn:
+            return self._by_term(conn.execute(sa.text(query), params).tuples(), job_names)
+
+    def compare_salary_distribution(
+        self, job_names: Sequence[str], filters: JobFilters = JobFilters()
+    ) -> dict[str, list[CategoryRow]]:
+        """``get_salary_distribution`` for each term, with the same bucket derived table."""
+        bucket_rows = ", ".join(
+            f"ROW(:label_{i}, :lower_{i}, :upper_{i})" for i in range(len(self.SALARY_BUCKETS))
+        )
+        from_clause, where, filter_params = self._compare_filter(job_names, filters)
+        query = f"""
+        SELECT
+            m.term,
+            b.label as label,
+            COUNT(*) as value
+        FROM {from_clause}
+        JOIN (VALUES {bucket_rows}) AS b (label, lower_bound, upper_bound)
+            ON dj.salary_monthly_mid >= b.lower_bound
+            AND dj.salary_monthly_mid < b.upper_bound
+        {where}
+        GROUP BY m.term, b.label, b.lower_bound
+        ORDER BY m.term, b.lower_bound
+        """
+        params: dict[str, FilterValue] = dict(filter_params)
+        for i, (label, lower, upper) in enumerate(self.SALARY_BUCKETS):
+            params.update({f"label_{i}": label, f"lower_{i}": lower, f"upper_{i}": upper})
+        with self.engine.connect() as conn:
+            return self._by_term(conn.execute(sa.text(query), params).tuples(), job_names)
+
+    def compare_total_jobs(
+        self, job_names: Sequence[str], filters: JobFilters = JobFilters()
+    ) -> dict[str, int]:
+        """``get_total_jobs`` for each term; terms without matches count 0."""
+        from_clause, where, params = self._compare_filter(job_names, filters)
+        query = f"SELECT m.term, COUNT(*) FROM {from_clause} {where} GROUP BY m.term"
+        totals = dict.fromkeys(job_names, 0)
+        with self.engine.connect() as conn:
+            for term, total in conn.execute(sa.text(query), params).tuples():
+                totals[job_names[term]] = int(total)
+        return totals
+
+    def get_jobs(
+        self, filters: JobFilters, cursor: JobCursor | None = None, limit: int = 20
+    ) -> list[JobRow]:
+        """Get matching jobs, newest first, with keyset pagination on ``(appear_date, id)``.
+
+        ``cursor`` is the ``(appear_date, id)`` of the previous page's last row; the next
+        page continues strictly after it, so every page is an index range scan of
+        ``limit`` rows (``idx_appear_id``, or ``idx_area_appear``/``idx_family_appear``
+        with those filters) instead of skipping an ever-growing OFFSET.
+        """
+        conditions, query_params = self._job_filter(filters, alias="dj")
+        if cursor is not None:
+            # Expanded form of (appear_date, id) < cursor, which MySQL turns into a range
+            conditions.append(
+                "(dj.appear_date < :cursor_date"
+                " OR (dj.appear_date = :cursor_date AND dj.id < :cursor_id))"
+            )
+            query_params.update(cursor_date=cursor[0], cursor_id=cursor[1])
+
+        query = f"""
+        SELECT {self.JOB_ROW_COLUMNS}
+        FROM dim_job dj
+        LEFT JOIN cust_info ci ON dj.cust_no = ci.cust_no
+        {self._where(conditions)}
+        ORDER BY dj.appear_date DESC, dj.id DESC
+        LIMIT {int(limit)}
+        """
+        with self.engine.connect() as conn:
+            return list(conn.execute(sa.text(query), query_params).tuples())
+
+    def get_jobs_by_ids(self, job_uids: Sequence[int]) -> list[JobRow]:
+        """Get the listing rows of the given jobs, in no particular order.
+
+        Jobs no longer in dim_job (archived partitions) are skipped.
+        """
+        if not job_uids:
+            return []
+        query = sa.text(
+            f"""
+            SELECT {self.JOB_ROW_COLUMNS}
+            FROM dim_job dj
+            LEFT JOIN cust_info ci ON dj.cust_no = ci.cust_no
+            WHERE dj.id IN :job_uids
+            """
+        ).bindparams(sa.bindparam("job_uids", expanding=True))
+        with self.engine.connect() as conn:
+            return list(conn.execute(query, {"job_uids": list(job_uids)}).tuples())
+
+    def stream_jobs_export(
+        self, filters: JobFilters, batch_size: int = 5000
+    ) -> Iterator[list[tuple]]:
+        """Stream matching jobs with details and bridge lists in batches of ``batch_size``.
+
+        Columns are ``EXPORT_COLUMNS``. Rows are read through a server-side (unbuffered)
+        cursor, so memory holds one batch no matter how many rows match. The connection
+        stays checked out until the generator is exhausted or closed.
+        """
+        conditions, params = self._job_filter(filters, alias="dj")
+        bridges = ",\n".join(
+            f"(SELECT GROUP_CONCAT({name} ORDER BY {name} SEPARATOR '|') FROM {source}"
+            f" WHERE b.job_uid = dj.id) as {alias}"
+            for alias, name, source in self.EXPORT_BRIDGES
+        )
+        query = f"""
+        SELECT
+            dj.id,
+            dj.job_id,
+            dj.job_name,
+            dj.job_family,
+            dj.work_type,
+            st.name as salary_type,
+            dj.salary_min,
+            dj.salary_max,
+            dj.salary_monthly_mid,
+            dj.address_area,
+            dj.address_region,
+            dj.work_exp,
+            dj.edu,
+            dj.work_period,
+            dj.vacation_policy,
+            dj.appear_date,
+            dj.updated_date,
+            dj.cust_no,
+            ci.cust_name,
+            ci.industry,
+            ci.employees,
+            jd.need_emp,
+            jd.manage_resp,
+            jd.business_trip,
+            jd.remote_work,
+            jd.job_description,
+            {bridges}
+        FROM dim_job dj
+        LEFT JOIN salary_type st ON st.type = dj.salary_type
+        LEFT JOIN cust_info ci ON dj.cust_no = ci.cust_no
+        LEFT JOIN job_detail jd ON jd.job_uid = dj.id
+        {self._where(conditions)}
+        ORDER BY dj.appear_date DESC, dj.id DESC
         """
         with self.engine.connect() as conn:
-            params = {"job_name": f"%{job_name}%"} if job_name else {}
-            return pd.read_sql(sa.text(query), conn, params=params)
+            # GROUP_CONCAT silently truncates at 1024 bytes by default
+            conn.exec_driver_sql("SET SESSION group_concat_max_len = 1048576")
+            if self.engine.dialect.supports_server_side_cursors:
+                result = conn.execution_options(stream_results=True).execute(sa.text(query), params)
+                yield from (list(batch) for batch in result.tuples().partitions(batch_size))
+                return
+            # mysql-connector: SQLAlchemy always asks it for buffered cursors, which read
+            # the whole result; an unbuffered DBAPI cursor fetches rows as they are consumed
+            compiled = sa.text(query).compile(dialect=self.engine.dialect)
+            cursor = conn.connection.dbapi_connection.cursor(buffered=False)
+            finished = False
+            try:
+                cursor.execute(compiled.string, [params[name] for name in compiled.positiontup])
+                while batch := cursor.fetchmany(batch_size):
+                    yield batch
+                finished = True
+            finally:
+                if finished:
+                    cursor.close()
+                else:
+                    # Unread rows would be drained on close; drop the connection instead
+                    conn.invalidate()
+
+    def get_salary_percentiles(
+        self,
+        filters: JobFilters = JobFilters(),
+        percentiles: Sequence[float] = (25, 50, 75),
+    ) -> dict[float, float | None]:
+        """Get monthly salary percentiles (linear interpolation, like ``numpy.percentile``).
 
-    def get_salary_distribution(self, job_name: str | None = None) -> pd.DataFrame:
-        """Get salary distribution in ranges."""
-        filter_clause = "AND job_name LIKE :job_name" if job_name else ""
+        MySQL has no PERCENTILE_CONT, so the matching salaries are read through the
+        ``idx_salary_monthly`` range and interpolated here.
+        """
+        conditions, params = self._job_filter(filters)
         query = f"""
+        SELECT salary_monthly_mid
+        FROM dim_job
+        {self._where(["salary_monthly_mid IS NOT NULL", *conditions])}
+        """
+        with self.engine.connect() as conn:
+            salaries = np.fromiter(conn.execute(sa.text(query), params).scalars(), dtype=np.int64)
+        if salaries.size == 0:
+            return dict.fromkeys(percentiles)
+        values = np.percentile(salaries, percentiles)
+        return {p: float(v) for p, v in zip(percentiles, values, strict=True)}
+
+    def get_job_name_counts(self) -> list[CategoryRow]:
+        """Get every distinct job name with its job count (typeahead index source)."""
+        query = """
         SELECT
-            CASE
-                WHEN (salary_min + salary_max) / 2 < 30000 THEN '< 30K'
-                WHEN (salary_min + salary_max) / 2 < 40000 THEN '30K-40K'
-                WHEN (salary_min + salary_max) / 2 < 50000 THEN '40K-50K'
-                WHEN (salary_min + salary_max) / 2 < 60000 THEN '50K-60K'
-                WHEN (salary_min + salary_max) / 2 < 80000 THEN '60K-80K'
-                WHEN (salary_min + salary_max) / 2 < 100000 THEN '80K-100K'
-                ELSE '> 100K'
-            END as label,
+            job_name as label,
             COUNT(*) as value
         FROM dim_job
-        WHERE salary_min > 0 AND salary_max > 0 {filter_clause}
-        GROUP BY label
-        ORDER BY MIN((salary_min + salary_max) / 2)
+        WHERE job_name IS NOT NULL AND job_name <> ''
+        GROUP BY job_name
         """
         with self.engine.connect() as conn:
-            params = {"job_name": f"%{job_name}%"} if job_name else {}
-            return pd.read_sql(sa.text(query), conn, params=params)
+            return list(conn.execute(sa.text(query)).tuples())
 
-    def get_total_jobs(self, job_name: str | None = None) -> int:
-        """Get total job count."""
-        filter_clause = "WHERE job_name LIKE :job_name" if job_name else ""
-        query = f"SELECT COUNT(*) as total FROM dim_job {filter_clause}"
+    def get_job_family_counts(self) -> list[CategoryRow]:
+        """Get job count per job family from ``agg_daily_jobs``."""
+        query = """
+        SELECT
+            job_family as label,
+            SUM(job_count) as value
+        FROM agg_daily_jobs
+        WHERE job_family IS NOT NULL
+        GROUP BY job_family
+        """
         with self.engine.connect() as conn:
-            params = {"job_name": f"%{job_name}%"} if job_name else {}
-            result = conn.execute(sa.text(query), params)
-            row = result.fetchone()
-            return row[0] if row else 0
+            return list(conn.execute(sa.text(query)).tuples())
+
+    def get_skill_names(self, kind: str = "skill") -> list[tuple[int, str]]:
+        """Get the (id, name) dictionary of a ``SKILL_KINDS`` kind, ordered by id."""
+        _, _, dictionary, name_column, _ = self.SKILL_KINDS[kind]
+        query = f"SELECT id, {name_column} FROM {dictionary} ORDER BY id"
+        with self.engine.connect() as conn:
+            return list(conn.execute(sa.text(query)).tuples())
+
+    def get_skill_incidence(self, kind: str = "skill") -> list[tuple[int, int]]:
+        """Get the (job_uid, id) bridge rows of the jobs still in dim_job, ordered by job.
+
+        Archived jobs keep their bridge rows, so the JOIN drops them like the panels do.
+        """
+        bridge, id_column, _, _, _ = self.SKILL_KINDS[kind]
+        query = f"""
+        SELECT b.job_uid, b.{id_column}
+        FROM {bridge} b
+        JOIN dim_job dj ON dj.id = b.job_uid
+        ORDER BY b.job_uid
+        """
+        with self.engine.connect() as conn:
+            return list(conn.execute(sa.text(query)).tuples())
+
+    def get_skill_weekly_counts(self, kind: str = "skill") -> list[WeeklyRow]:
+        """Get the weekly job counts per job family and id, maintained by the ETL."""
+        _, id_column, _, _, weekly = self.SKILL_KINDS[kind]
+        query = f"SELECT week, job_family, {id_column}, job_count FROM {weekly}"
+        with self.engine.connect() as conn:
+            return list(conn.execute(sa.text(query)).tuples())
+
+    def get_job_uids(self) -> list[int]:
+        """Get the ids of all jobs in dim_job."""
+        with self.engine.connect() as conn:
+            return list(conn.execute(sa.text("SELECT id FROM dim_job")).scalars())
+
+    def get_job_uids_loaded_after(self, version: int) -> list[int] | None:
+        """Get the ids of the jobs the ETL (re)loaded after data version ``version``.
+
+        Re-crawled jobs are upserted in place, so their description and bridge terms may
+        have changed. None when the tracking column does not exist yet.
+        """
+        query = sa.text("SELECT id FROM dim_job WHERE etl_run_id > :version")
+        try:
+            with self.engine.connect() as conn:
+                return list(conn.execute(query, {"version": version}).scalars())
+        except sa.exc.ProgrammingError:
+            # dim_job.etl_run_id is added by the crawler's next transform run
+            return None
+
+    def get_similarity_documents(
+        self, job_uids: Sequence[int]
+    ) -> tuple[list[tuple[int, str, int]], list[tuple[int, str | None]]]:
+        """Get the inputs of the similar-jobs index for the given jobs.
+
+        Returns:
+            (job_uid, term prefix, id) rows of the ``SIMILARITY_BRIDGES`` and
+            (job_uid, leading ``DESCRIPTION_CHARS`` of job_description) rows
+        """
+        bridges = " UNION ALL ".join(
+            f"SELECT job_uid, '{prefix}' as field, {column} as term FROM {table}"
+            " WHERE job_uid IN :job_uids"
+            for prefix, table, column in self.SIMILARITY_BRIDGES
+        )
+        terms_query = sa.text(bridges).bindparams(sa.bindparam("job_uids", expanding=True))
+        descriptions_query = sa.text(
+            f"SELECT job_uid, LEFT(job_description, {int(self.DESCRIPTION_CHARS)})"
+            " FROM job_detail WHERE job_uid IN :job_uids"
+        ).bindparams(sa.bindparam("job_uids", expanding=True))
+
+        terms: list[tuple[int, str, int]] = []
+        descriptions: list[tuple[int, str | None]] = []
+        with self.engine.connect() as conn:
+            for start in range(0, len(job_uids), self.ID_CHUNK_SIZE):
+                chunk = {"job_uids": list(job_uids[start : start + self.ID_CHUNK_SIZE])}
+                terms.extend(conn.execute(terms_query, chunk).tuples())
+                descriptions.extend(conn.execute(descriptions_query, chunk).tuples())
+        return terms, descriptions
+
+    def get_data_version(self) -> tuple[int, datetime | None]:
+        """Get the latest ETL run id (data version) and its finish time."""
+        query = "SELECT id, finished_at FROM etl_runs ORDER BY id DESC LIMIT 1"
+        try:
+            with self.engine.connect() as conn:
+                row = conn.execute(sa.text(query)).fetchone()
+        except sa.exc.ProgrammingError:
+            # etl_runs is created by the crawler's first transform run
+            return 0, None
+        return (int(row[0]), row[1]) if row else (0, None)
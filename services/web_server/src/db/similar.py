@@ -0,0 +1,326 @@
+"""Similar-jobs index: sparse TF-IDF vectors over bridge terms and description bigrams.
+
+Every job is a document whose terms are its skill, specialty and category ids plus the
+CJK bigrams and Latin words of its ``job_detail.job_description``. ``SimilarityIndex``
+keeps the raw term frequencies in CSR form, weights them with TF-IDF and L2-normalizes
+the rows, so the dot product of two rows is their cosine similarity; top-k queries run
+in batches through an inverted (CSC) copy of the weights. ``SimilarityIndexStore``
+updates it incrementally when the data version moves, re-indexing the jobs the ETL
+reloaded since the previous version.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from anyio.to_thread import run_sync
+
+from .repository import DatabaseRepository
+
+logger = logging.getLogger(__name__)
+
+CJK_RUN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+LATIN_WORD = re.compile(r"[a-z0-9][a-z0-9+#]+")
+
+
+def tokenize_description(text: str) -> list[str]:
+    """CJK bigrams (a lone CJK character as itself) and lowercase Latin words."""
+    text = text.lower()
+    tokens = LATIN_WORD.findall(text)
+    for run in CJK_RUN.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenation of ``arange(start, start + length)`` for every pair, vectorized."""
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(int(lengths.sum())) + np.repeat(starts - offsets, lengths)
+
+
+@dataclass(frozen=True)
+class SimilarJob:
+    """A neighbour of a job and its cosine similarity."""
+
+    job_uid: int
+    score: float
+
+
+class SimilarityIndex:
+    """TF-IDF vectors of the jobs in ``dim_job`` with batched cosine top-k search.
+
+    New terms get new ids and removed jobs leave terms with a zero document frequency
+    behind until ``compact`` renumbers the rest. ``add``/``remove``/``compact`` replace
+    the arrays instead of modifying them, so a copy being updated never disturbs
+    searches on the published index. ``reweight`` must run after them to refresh the
+    searchable weights.
+    """
+
+    # Term prefix -> weight of that field in the vectors
+    FIELD_WEIGHTS = {"s": 1.0, "p": 1.0, "c": 1.0, "d": 0.5}
+    # Description terms in more than this share of jobs are stopwords and dropped
+    MAX_DF_RATIO = 0.5
+    # Cells of the (batch x jobs) score matrix of one search batch; bounds its memory
+    MAX_SCORE_CELLS = 2_000_000
+    # Share of terms no job contains any more above which an update compacts the vocabulary
+    MAX_DEAD_TERM_RATIO = 0.2
+
+    def __init__(self) -> None:
+        self.version = -1
+        self.vocabulary: dict[str, int] = {}
+        self.term_field: list[str] = []
+        self.df = np.zeros(0, dtype=np.int64)
+        # Raw term frequencies, one CSR row per job
+        self.job_uids = np.zeros(0, dtype=np.int64)
+        self.rows: dict[int, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.terms = np.zeros(0, dtype=np.int32)
+        self.tf = np.zeros(0, dtype=np.float32)
+        self.reweight()
+
+    def __len__(self) -> int:
+        return len(self.job_uids)
+
+    def copy(self) -> SimilarityIndex:
+        """Shallow copy whose mutable containers are its own."""
+        index = object.__new__(SimilarityIndex)
+        index.__dict__.update(self.__dict__)
+        index.vocabulary = dict(self.vocabulary)
+        index.term_field = list(self.term_field)
+        index.rows = dict(self.rows)
+        return index
+
+    def add(self, documents: Mapping[int, Counter[str]]) -> None:
+        """Append jobs given as term counts; jobs already indexed are replaced."""
+        self.remove([uid for uid in documents if uid in self.rows])
+        lengths, terms, tf = [], [], []
+        for counts in documents.values():
+            lengths.append(len(counts))
+            for term, count in counts.items():
+                term_id = self.vocabulary.get(term)
+                if term_id is None:
+                    term_id = self.vocabulary[term] = len(self.term_field)
+                    self.term_field.append(term[0])
+                terms.append(term_id)
+                tf.append(count)
+        new_terms = np.array(terms, dtype=np.int32)
+        self.df = np.concatenate(
+            (self.df, np.zeros(len(self.term_field) - self.df.size, dtype=np.int64))
+        )
+        self.df += np.bincount(new_terms, minlength=self.df.size)
+
+        first_row = len(self.job_uids)
+        self.job_uids = np.concatenate((self.job_uids, np.fromiter(documents, dtype=np.int64)))
+        self.rows.update((uid, first_row + i) for i, uid in enumerate(documents))
+        self.indptr = np.concatenate(
+            (self.indptr, self.indptr[-1] + np.cumsum(np.array(lengths, dtype=np.int64)))
+        )
+        self.terms = np.concatenate((self.terms, new_terms))
+        self.tf = np.concatenate((self.tf, np.array(tf, dtype=np.float32)))
+
+    def remove(self, job_uids: Iterable[int]) -> None:
+        """Drop jobs (e.g. archived ones) from the index."""
+        drop = [self.rows[uid] for uid in job_uids if uid in self.rows]
+        if not drop:
+            return
+        keep_rows = np.ones(len(self.job_uids), dtype=bool)
+        keep_rows[drop] = False
+        lengths = np.diff(self.indptr)
+        keep_entries = np.repeat(keep_rows, lengths)
+        self.df = self.df - np.bincount(self.terms[~keep_entries], minlength=self.df.size)
+
+        self.job_uids = self.job_uids[keep_rows]
+        self.rows = {int(uid): row for row, uid in enumerate(self.job_uids)}
+        self.indptr = np.concatenate(([0], np.cumsum(lengths[keep_rows])))
+        self.terms = self.terms[keep_entries]
+        self.tf = self.tf[keep_entries]
+
+    @property
+    def dead_term_ratio(self) -> float:
+        """Share of the vocabulary no indexed job contains any more."""
+        return float(np.mean(self.df == 0)) if self.df.size else 0.0
+
+    def compact(self) -> None:
+        """Drop the terms no indexed job contains any more and renumber the rest."""
+        live = self.df > 0
+        if live.all():
+            return
+        new_ids = np.cumsum(live) - 1
+        self.terms = new_ids[self.terms].astype(np.int32)
+        self.df = self.df[live]
+        self.term_field = [field for field, keep in zip(self.term_field, live, strict=True) if keep]
+        self.vocabulary = {
+            term: int(new_ids[term_id])
+            for term, term_id in self.vocabulary.items()
+            if live[term_id]
+        }
+
+    def reweight(self) -> None:
+        """Recompute the normalized TF-IDF weights and their inverted copy.
+
+        Vectorized over all entries; much cheaper than fetching and tokenizing the jobs.
+        Terms of a single job cannot make two jobs similar and are dropped too.
+        """
+        n = len(self.job_uids)
+        field = np.array(self.term_field, dtype="U1")
+        field_weight = np.zeros(field.size)
+        for prefix, weight in self.FIELD_WEIGHTS.items():
+            field_weight[field == prefix] = weight
+        idf = np.log((1 + n) / (1 + self.df)) + 1
+        useful = (self.df >= 2) & ((field != "d") | (self.df <= self.MAX_DF_RATIO * n))
+        term_weight = np.where(useful, idf * field_weight, 0.0)
+
+        rows = np.repeat(np.arange(n), np.diff(self.indptr))
+        values = (1 + np.log(np.maximum(self.tf, 1))) * term_weight[self.terms]
+        norms = np.sqrt(np.bincount(rows, weights=values**2, minlength=n))
+        keep = values > 0
+        rows, terms = rows[keep], self.terms[keep]
+        values = (values[keep] / norms[rows]).astype(np.float32)
+        self.weight_indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n))))
+        self.weight_terms = terms
+        self.weights = values
+
+        # Inverted copy: per term, the jobs containing it and their weights
+        order = np.argsort(terms, kind="stable")
+        self.posting_rows = rows[order].astype(np.int32)
+        self.posting_weights = values[order]
+        self.term_indptr = np.concatenate(
+            ([0], np.cumsum(np.bincount(terms, minlength=field.size)))
+        )
+
+    @property
+    def nnz(self) -> int:
+        """Nonzero entries of the searchable weight matrix."""
+        return int(self.weights.size)
+
+    def search(self, job_uids: Sequence[int], k: int = 10) -> dict[int, list[SimilarJob]]:
+        """Top-``k`` most similar jobs of each indexed job in ``job_uids``.
+
+        Each batch is one sparse (queries x terms) by (terms x jobs) product, accumulated
+        with ``bincount`` into a dense (batch x jobs) score matrix.
+        """
+        queries = [uid for uid in dict.fromkeys(job_uids) if uid in self.rows]
+        results: dict[int, list[SimilarJob]] = {}
+        n = len(self.job_uids)
+        batch_size = max(1, self.MAX_SCORE_CELLS // max(n, 1))
+        for start in range(0, len(queries), batch_size):
+            batch = np.array([self.rows[uid] for uid in queries[start : start + batch_size]])
+            q_starts = self.weight_indptr[batch]
+            q_lengths = self.weight_indptr[batch + 1] - q_starts
+            q_entries = _ranges(q_starts, q_lengths)
+            q_terms = self.weight_terms[q_entries]
+            q_owner = np.repeat(np.arange(batch.size), q_lengths)
+
+            p_starts = self.term_indptr[q_terms]
+            p_lengths = self.term_indptr[q_terms + 1] - p_starts
+            postings = _ranges(p_starts, p_lengths)
+            contributions = self.posting_weights[postings] * np.repeat(
+                self.weights[q_entries], p_lengths
+            )
+            keys = np.repeat(q_owner, p_lengths).astype(np.int64) * n + self.posting_rows[postings]
+            scores = np.bincount(keys, weights=contributions, minlength=batch.size * n)
+            scores = scores.reshape(batch.size, n)
+            scores[np.arange(batch.size), batch] = 0  # a job is not its own neighbour
+
+            for i, row in enumerate(batch):
+                row_scores = scores[i]
+                top = np.argpartition(-row_scores, min(k, n - 1))[:k] if n > k else np.arange(n)
+                top = top[np.argsort(-row_scores[top], kind="stable")]
+                results[int(self.job_uids[row])] = [
+                    SimilarJob(int(self.job_uids[other]), round(float(row_scores[other]), 4))
+                    for other in top
+                    if row_scores[other] > 0
+                ]
+        return results
+
+
+class SimilarityIndexStore:
+    """Holds the current ``SimilarityIndex`` and updates it when the data version moves.
+
+    An update fetches and tokenizes only the jobs added or reloaded by the ETL since the
+    previous version (re-crawled jobs are upserted in place and may have new terms),
+    drops the jobs gone from ``dim_job``, compacts the vocabulary once enough of it is
+    dead and reweights, on a copy swapped in when done. Like ``JobNameIndexStore``,
+    concurrent requests wait for a running update.
+    """
+
+    def __init__(self, repository: DatabaseRepository) -> None:
+        self.repository = repository
+        self._index = SimilarityIndex()
+        self._lock = asyncio.Lock()
+        self.updated_at: float | None = None
+
+    async def get(self, version: int) -> SimilarityIndex:
+        """Return the index of ``version``, updating it first when it is not current."""
+        index = self._index
+        if index.version >= version:
+            return index
+        async with self._lock:
+            if self._index.version < version:
+                self._index = await run_sync(self._update, self._index, version)
+                self.updated_at = time.time()
+        return self._index
+
+    def _documents(self, job_uids: Sequence[int]) -> dict[int, Counter[str]]:
+        """Term counts of the given jobs, terms prefixed by their field."""
+        terms, descriptions = self.repository.get_similarity_documents(job_uids)
+        # Jobs without any term are still indexed (and match nothing)
+        documents: dict[int, Counter[str]] = {uid: Counter() for uid in job_uids}
+        for uid, field, term in terms:
+            documents[uid][f"{field}:{term}"] += 1
+        for uid, description in descriptions:
+            if description:
+                documents[uid].update(f"d:{token}" for token in tokenize_description(description))
+        return documents
+
+    def _update(self, current: SimilarityIndex, version: int) -> SimilarityIndex:
+        start = time.perf_counter()
+        uids = np.array(self.repository.get_job_uids(), dtype=np.int64)
+        added = np.setdiff1d(uids, current.job_uids)
+        removed = np.setdiff1d(current.job_uids, uids)
+        reloaded = np.zeros(0, dtype=np.int64)
+        if len(current):
+            loaded = self.repository.get_job_uids_loaded_after(current.version)
+            # Without the ETL's tracking every indexed job may be stale
+            loaded_uids = current.job_uids if loaded is None else np.array(loaded, dtype=np.int64)
+            reloaded = np.setdiff1d(np.intersect1d(loaded_uids, current.job_uids), removed)
+        index = current.copy()
+        index.remove(removed.tolist())
+        # add() replaces the reloaded jobs already in the index
+        index.add(self._documents(np.union1d(added, reloaded).tolist()))
+        if index.dead_term_ratio > index.MAX_DEAD_TERM_RATIO:
+            index.compact()
+        index.reweight()
+        index.version = version
+        logger.info(
+            "Updated similarity index v%s: +%d ~%d -%d jobs, %d total, %d terms in %.2fs",
+            version,
+            added.size,
+            reloaded.size,
+            removed.size,
+            len(index),
+            len(index.vocabulary),
+            time.perf_counter() - start,
+        )
+        return index
+
+    def stats(self) -> dict[str, int | float | None]:
+        """Index size and version for monitoring."""
+        index = self._index
+        return {
+            "version": index.version if index.version >= 0 else None,
+            "jobs": len(index),
+            "terms": len(index.vocabulary),
+            "weights": index.nnz,
+            "updatedAt": self.updated_at,
+        }
@@ -0,0 +1,39 @@
+"""Coalesces identical concurrent calls into one in-flight computation."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """At most one in-flight call per key; concurrent callers share its result.
+
+    The first caller for a key starts the computation as a task; callers arriving while
+    it runs await the same task instead of starting their own. Once it finishes the key
+    is released, so the next call computes afresh (caching is the caller's concern).
+    Callers are shielded from each other: a cancelled waiter does not cancel the shared
+    computation. Only used from the event loop, so no locking.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func()`` for ``key`` unless an identical call is already in flight."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
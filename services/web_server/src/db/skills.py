@@ -0,0 +1,289 @@
+"""Skill co-occurrence and rising-skill analytics over precomputed sparse structures.
+
+``SkillGraph`` holds the job x skill incidence matrix ``A`` of one data version in CSR
+form (plain NumPy index arrays) and the co-occurrence matrix ``A.T @ A``, computed once
+when the graph is built. Rising skills come from the weekly counts the ETL maintains in
+``agg_skill_weekly`` / ``agg_specialty_weekly``. ``SkillGraphStore`` rebuilds a graph
+when the data version moves, so requests never self-join the bridge tables in MySQL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+from anyio.to_thread import run_sync
+
+from .repository import DatabaseRepository, WeeklyRow
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RelatedSkill:
+    """A skill required together with another; ``share`` is of the other's jobs."""
+
+    label: str
+    job_count: int
+    share: float
+
+
+@dataclass(frozen=True)
+class RisingSkill:
+    """Job counts of a skill in the recent and the previous window of N weeks."""
+
+    label: str
+    recent: int
+    previous: int
+    growth: float
+
+
+class SkillGraph:
+    """Co-occurrence and weekly counts of one skill kind at one data version.
+
+    Skills are renumbered to dense codes ``0..n-1`` (dictionary order). Only the
+    ``TOP_RELATED`` strongest co-occurrences of each skill are kept, as a CSR matrix
+    sorted by count, so a lookup is a slice.
+    """
+
+    # Co-occurring skills kept per skill
+    TOP_RELATED = 50
+    # Max (skill, skill) pairs expanded at once while computing A.T @ A; bounds memory
+    PAIR_CHUNK = 5_000_000
+    # Skills with fewer recent jobs are too noisy to rank by growth
+    MIN_RISING_COUNT = 5
+
+    def __init__(
+        self,
+        version: int,
+        kind: str,
+        names: Sequence[tuple[int, str]],
+        incidence: Sequence[tuple[int, int]],
+        weekly: Sequence[WeeklyRow],
+    ) -> None:
+        self.version = version
+        self.kind = kind
+        ids = np.array([skill_id for skill_id, _ in names], dtype=np.int64)
+        self.labels = [name for _, name in names]
+        self._by_name = {name: code for code, name in enumerate(self.labels)}
+        # Case-insensitive fallback; names differing only in case keep the first
+        self._by_folded: dict[str, int] = {}
+        for code, name in enumerate(self.labels):
+            self._by_folded.setdefault(name.casefold(), code)
+
+        # CSR rows are the distinct jobs (incidence is ordered by job_uid)
+        jobs = np.array([job_uid for job_uid, _ in incidence], dtype=np.int64)
+        codes = self._codes(ids, np.array([sid for _, sid in incidence], dtype=np.int64))
+        known = codes >= 0
+        jobs, codes = jobs[known], codes[known]
+        _, job_rows = np.unique(jobs, return_inverse=True)
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(job_rows)))).astype(np.int64)
+        self.indices = codes.astype(np.int32)
+        # Diagonal of A.T @ A: jobs per skill
+        self.job_counts = np.bincount(self.indices, minlength=len(self.labels))
+        self.related_indptr, self.related_codes, self.related_counts = self._top_cooccurrences()
+
+        # Weekly counts as COO arrays; weeks are datetime64 Mondays
+        self.week = np.array([row[0] for row in weekly], dtype="datetime64[D]")
+        families = [row[1] or "" for row in weekly]
+        self.family_labels = sorted(set(families))
+        family_codes = {family: code for code, family in enumerate(self.family_labels)}
+        self.week_family = np.array([family_codes[f] for f in families], dtype=np.int32)
+        self.week_skill = self._codes(ids, np.array([row[2] for row in weekly], dtype=np.int64))
+        self.week_count = np.array([row[3] for row in weekly], dtype=np.int64)
+
+    @staticmethod
+    def _codes(ids: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Dense codes of dictionary ``ids`` (sorted); -1 for ids not in the dictionary."""
+        if ids.size == 0:
+            return np.full(values.shape, -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(ids, values), ids.size - 1)
+        return np.where(ids[positions] == values, positions, -1)
+
+    def _cooccurrence_pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """Nonzero off-diagonal entries of ``A.T @ A`` as (row * n + col keys, counts).
+
+        Every job contributes all ordered pairs of its skills; jobs are expanded in
+        chunks of at most ``PAIR_CHUNK`` pairs and the partial sums merged.
+        """
+        n = len(self.labels)
+        lengths = np.diff(self.indptr)
+        pair_ends = np.cumsum(lengths * lengths)
+        bounds = np.searchsorted(
+            pair_ends,
+            np.arange(self.PAIR_CHUNK, pair_ends[-1] if pair_ends.size else 0, self.PAIR_CHUNK),
+        )
+        bounds = np.unique(np.concatenate(([0], bounds + 1, [lengths.size])))
+        keys_parts: list[np.ndarray] = []
+        count_parts: list[np.ndarray] = []
+        for first, last in zip(bounds[:-1], bounds[1:], strict=True):
+            sizes = lengths[first:last]
+            entries = self.indices[self.indptr[first] : self.indptr[last]]
+            # Each entry pairs with every entry of its job (itself included)
+            repeats = np.repeat(sizes, sizes)
+            left = np.repeat(entries, repeats)
+            job_starts = np.repeat(self.indptr[first:last] - self.indptr[first], sizes)
+            offsets = np.arange(repeats.sum()) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+            right = entries[np.repeat(job_starts, repeats) + offsets]
+            distinct = left != right
+            keys, counts = np.unique(
+                left[distinct].astype(np.int64) * n + right[distinct], return_counts=True
+            )
+            keys_parts.append(keys)
+            count_parts.append(counts)
+        if not keys_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        keys, inverse = np.unique(np.concatenate(keys_parts), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate(count_parts)).astype(np.int64)
+        return keys, counts
+
+    def _top_cooccurrences(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """CSR of the ``TOP_RELATED`` largest co-occurrences per skill, largest first."""
+        n = len(self.labels)
+        keys, counts = self._cooccurrence_pairs()
+        rows, cols = keys // max(n, 1), keys % max(n, 1)
+        order = np.lexsort((cols, -counts, rows))
+        rows, cols, counts = rows[order], cols[order], counts[order]
+        starts = np.searchsorted(rows, np.arange(n))
+        rank = np.arange(rows.size) - starts[rows]
+        keep = rank < self.TOP_RELATED
+        rows, cols, counts = rows[keep], cols[keep], counts[keep]
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n)))).astype(np.int64)
+        return indptr, cols.astype(np.int32), counts
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def nnz(self) -> int:
+        """Nonzero entries of the job x skill matrix."""
+        return int(self.indices.size)
+
+    def code(self, name: str) -> int | None:
+        """Dense code of a skill name (exact match first, then case-insensitive)."""
+        name = name.strip()
+        code = self._by_name.get(name)
+        return code if code is not None else self._by_folded.get(name.casefold())
+
+    def related(self, code: int, limit: int = 10) -> list[RelatedSkill]:
+        """Skills most often required together with skill ``code``."""
+        total = int(self.job_counts[code])
+        start, end = self.related_indptr[code], self.related_indptr[code + 1]
+        end = min(end, start + limit)
+        return [
+            RelatedSkill(self.labels[other], int(count), round(int(count) / total, 4))
+            for other, count in zip(
+                self.related_codes[start:end], self.related_counts[start:end], strict=True
+            )
+        ]
+
+    def rising(
+        self, weeks: int = 4, job_family: str | None = None, limit: int = 10
+    ) -> tuple[tuple[date, date] | None, list[RisingSkill]]:
+        """Skills growing fastest in the latest ``weeks`` weeks vs. the ``weeks`` before.
+
+        Growth is the smoothed ratio ``(recent + 1) / (previous + 1) - 1``, so skills new
+        in the recent window rank by their count instead of dividing by zero. Windows end
+        at the latest week in the data, not the current date.
+
+        Returns:
+            The first and last day of the recent window (None without data) and the skills
+        """
+        if self.week.size == 0:
+            return None, []
+        latest = self.week.max()
+        recent_start = latest - np.timedelta64(7 * (weeks - 1), "D")
+        previous_start = recent_start - np.timedelta64(7 * weeks, "D")
+        window = (recent_start.item(), (latest + np.timedelta64(6, "D")).item())
+        selected = self.week_skill >= 0
+        if job_family is not None:
+            if job_family not in self.family_labels:
+                return window, []
+            selected &= self.week_family == self.family_labels.index(job_family)
+
+        def window_counts(in_window: np.ndarray) -> np.ndarray:
+            rows = selected & in_window
+            return np.bincount(
+                self.week_skill[rows], weights=self.week_count[rows], minlength=len(self)
+            ).astype(np.int64)
+
+        recent = window_counts(self.week >= recent_start)
+        previous = window_counts((self.week >= previous_start) & (self.week < recent_start))
+        growth = (recent + 1) / (previous + 1) - 1
+        candidates = np.flatnonzero(recent >= self.MIN_RISING_COUNT)
+        order = candidates[np.lexsort((-recent[candidates], -growth[candidates]))][:limit]
+        return window, [
+            RisingSkill(
+                self.labels[code],
+                int(recent[code]),
+                int(previous[code]),
+                round(float(growth[code]), 4),
+            )
+            for code in order
+        ]
+
+
+class SkillGraphStore:
+    """Holds the current ``SkillGraph`` of each kind and rebuilds it when the version moves.
+
+    Like ``JobNameIndexStore``, the first request after an ETL run triggers the rebuild in
+    a worker thread and concurrent requests wait for it. Kinds are built on first use.
+    """
+
+    def __init__(self, repository: DatabaseRepository) -> None:
+        self.repository = repository
+        self._graphs: dict[str, SkillGraph] = {}
+        self._lock = asyncio.Lock()
+        self.built_at: dict[str, float] = {}
+
+    async def get(self, version: int, kind: str = "skill") -> SkillGraph:
+        """Return the graph of ``kind`` at ``version``, building it first when stale."""
+        graph = self._graphs.get(kind)
+        if graph is not None and graph.version >= version:
+            return graph
+        async with self._lock:
+            graph = self._graphs.get(kind)
+            if graph is None or graph.version < version:
+                graph = await run_sync(self._build, version, kind)
+                self._graphs[kind] = graph
+                self.built_at[kind] = time.time()
+        return graph
+
+    def _build(self, version: int, kind: str) -> SkillGraph:
+        start = time.perf_counter()
+        graph = SkillGraph(
+            version,
+            kind,
+            self.repository.get_skill_names(kind),
+            self.repository.get_skill_incidence(kind),
+            self.repository.get_skill_weekly_counts(kind),
+        )
+        logger.info(
+            "Built %s graph v%s: %d names, %d job links, %d co-occurrences in %.2fs",
+            kind,
+            version,
+            len(graph),
+            graph.nnz,
+            graph.related_codes.size,
+            time.perf_counter() - start,
+        )
+        return graph
+
+    def stats(self) -> dict[str, dict[str, int | float | None]]:
+        """Graph sizes and versions per kind for monitoring."""
+        return {
+            kind: {
+                "version": graph.version,
+                "names": len(graph),
+                "jobLinks": graph.nnz,
+                "related": int(graph.related_codes.size),
+                "weeklyRows": int(graph.week.size),
+                "builtAt": self.built_at.get(kind),
+            }
+            for kind, graph in self._graphs.items()
+        }
@@ -0,0 +1,404 @@
+"""In-process columnar snapshot of the silver tables for dashboard aggregations.
+
+The whole ``dim_job`` table (plus the skill bridge) is small enough to hold in RAM as
+a handful of NumPy arrays. ``JobSnapshot`` answers the dashboard queries with
+vectorized group-bys instead of MySQL round trips; ``SnapshotStore`` reloads it when
+the ETL publishes a new data version.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from datetime import date
+
+import numpy as np
+import sqlalchemy as sa
+from anyio.to_thread import run_sync
+
+from .repository import CategoryRow, DatabaseRepository, JobFilters, TrendRow
+
+logger = logging.getLogger(__name__)
+
+NULL_CODE = -1  # dictionary code of NULL values
+NULL_SALARY = -1  # salary_monthly_mid is >= 0 when present
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()  # days are stored as int32 days since epoch
+
+
+def _dictionary_encode(values: Iterable[str | None]) -> tuple[np.ndarray, list[str]]:
+    """Dictionary-encode strings into int32 codes; NULL becomes ``NULL_CODE``."""
+    labels: list[str] = []
+    index: dict[str, int] = {}
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(NULL_CODE)
+            continue
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(labels)
+            labels.append(value)
+        codes.append(code)
+    return np.array(codes, dtype=np.int32), labels
+
+
+def _fold(value: str) -> str:
+    """Comparison key of a label, approximating MySQL's case-insensitive collation."""
+    return value.strip().casefold()
+
+
+def _fold_index(labels: Sequence[str]) -> dict[str, np.ndarray]:
+    """Folded label -> codes of every label that folds to it ('Python' and 'python ')."""
+    codes: defaultdict[str, list[int]] = defaultdict(list)
+    for code, label in enumerate(labels):
+        codes[_fold(label)].append(code)
+    return {key: np.array(value, dtype=np.int32) for key, value in codes.items()}
+
+
+class SubstringIndex:
+    """Bigram inverted index over lowercased job names for ``LIKE '%term%'`` semantics.
+
+    Terms of two or more characters intersect the posting lists of their bigrams to get
+    candidates, which are then verified with a plain substring test. Single-character
+    terms scan all names.
+    """
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names = [name.lower() for name in names]
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        for row, name in enumerate(self.names):
+            for gram in {name[i : i + 2] for i in range(len(name) - 1)}:
+                postings[gram].append(row)
+        self.postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+
+    def candidates(self, term: str) -> np.ndarray:
+        """Rows containing every bigram of a lowercase ``term`` (two or more characters).
+
+        A superset of the rows containing ``term``; exact for two-character terms.
+        """
+        grams = sorted(
+            {term[i : i + 2] for i in range(len(term) - 1)},
+            key=lambda gram: len(self.postings.get(gram, ())),
+        )
+        candidates = self.postings.get(grams[0])
+        if candidates is None:
+            return np.empty(0, dtype=np.int32)
+        for gram in grams[1:]:
+            candidates = np.intersect1d(candidates, self.postings.get(gram, ()), assume_unique=True)
+            if candidates.size == 0:
+                break
+        return candidates
+
+    def search(self, term: str) -> np.ndarray:
+        """Row numbers whose name contains ``term`` (case-insensitive), ascending."""
+        term = term.lower()
+        if len(term) < 2:
+            return np.array([row for row, name in enumerate(self.names) if term in name], np.int32)
+
+        candidates = self.candidates(term)
+        if len(term) == 2 or candidates.size == 0:
+            return candidates
+        return candidates[[term in self.names[row] for row in candidates]]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(rows.nbytes for rows in self.postings.values())
+
+
+class JobSnapshot:
+    """Columnar copy of ``dim_job`` and ``bridge_skills`` at one data version.
+
+    Query methods mirror ``DatabaseRepository`` and return the same row tuples, so the
+    dashboard response is built the same way from either source.
+    """
+
+    JOB_QUERY = """
+    SELECT
+        dj.id,
+        dj.appear_date,
+        dj.salary_monthly_mid,
+        dj.address_area,
+        dj.address_region,
+        dj.salary_type,
+        dj.edu,
+        dj.work_exp,
+        dj.job_family,
+        ci.industry,
+        ci.cust_no IS NOT NULL as has_cust,
+        dj.job_name,
+        {unique_job} as is_unique
+    FROM dim_job dj
+    LEFT JOIN cust_info ci ON dj.cust_no = ci.cust_no
+    ORDER BY dj.id
+    """.format(unique_job=DatabaseRepository.UNIQUE_JOB.format(alias="dj."))
+    SKILL_QUERY = """
+    SELECT bs.job_uid, ds.skill_name
+    FROM bridge_skills bs
+    JOIN dim_skill ds ON ds.id = bs.skill_id
+    """
+
+    def __init__(
+        self,
+        version: int,
+        job_rows: Sequence[tuple],
+        skill_rows: Sequence[tuple[int, str]],
+    ) -> None:
+        self.version = version
+        (
+            ids,
+            days,
+            salaries,
+            areas,
+            regions,
+            salary_types,
+            edus,
+            work_exps,
+            families,
+            industries,
+            has_cust,
+            names,
+            is_unique,
+        ) = zip(*job_rows, strict=True) if job_rows else ((),) * 13
+        self.job_uid = np.array(ids, dtype=np.int64)
+        self.day = np.array(days, dtype="datetime64[D]").astype(np.int32)
+        self.salary = np.array([NULL_SALARY if s is None else s for s in salaries], dtype=np.int32)
+        self.area, self.area_labels = _dictionary_encode(areas)
+        self.region, self.region_labels = _dictionary_encode(regions)
+        self.salary_type = np.array(
+            [NULL_CODE if t is None else t for t in salary_types], dtype=np.int32
+        )
+        self.edu, self.edu_labels = _dictionary_encode(edus)
+        self.work_exp, self.work_exp_labels = _dictionary_encode(work_exps)
+        self.family, self.family_labels = _dictionary_encode(families)
+        self.industry, self.industry_labels = _dictionary_encode(industries)
+        # INNER JOIN semantics of the SQL industry panel: jobs without a company are skipped
+        self.has_cust = np.array(has_cust, dtype=bool)
+        self.names = SubstringIndex([name or "" for name in names])
+        self.is_unique = np.array(is_unique, dtype=bool)
+
+        # Skill bridge rows of jobs no longer in dim_job (archived partitions) are dropped
+        uids = np.array([uid for uid, _ in skill_rows], dtype=np.int64)
+        rows = np.searchsorted(self.job_uid, uids)
+        rows = np.minimum(rows, max(len(self.job_uid) - 1, 0))
+        present = (
+            self.job_uid[rows] == uids if len(self.job_uid) else np.zeros(len(uids), dtype=bool)
+        )
+        skill_codes, self.skill_labels = _dictionary_encode(name for _, name in skill_rows)
+        self.skill_row = rows[present].astype(np.int32)
+        self.skill = skill_codes[present]
+
+        # Equality filters compare folded labels, like the ``_ci`` collation of the columns
+        self.family_keys = _fold_index(self.family_labels)
+        self.area_keys = _fold_index(self.area_labels)
+        self.region_keys = _fold_index(self.region_labels)
+        self.edu_keys = _fold_index(self.edu_labels)
+        self.work_exp_keys = _fold_index(self.work_exp_labels)
+        self.skill_keys = _fold_index(self.skill_labels)
+
+        # The six dashboard panels of one request share the same filter mask
+        self._mask = functools.lru_cache(maxsize=64)(self._compute_mask)
+
+    @classmethod
+    def load(cls, engine: sa.Engine, version: int) -> JobSnapshot:
+        """Read the silver tables into a new snapshot."""
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            job_rows = conn.execute(sa.text(cls.JOB_QUERY)).tuples().all()
+            skill_rows = conn.execute(sa.text(cls.SKILL_QUERY)).tuples().all()
+        snapshot = cls(version, job_rows, skill_rows)
+        logger.info(
+            "Loaded snapshot v%s: %d jobs, %d skill rows, %.1f MB in %.2fs",
+            version,
+            len(snapshot),
+            len(snapshot.skill),
+            snapshot.nbytes / 2**20,
+            time.perf_counter() - start,
+        )
+        return snapshot
+
+    def __len__(self) -> int:
+        return len(self.job_uid)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.job_uid,
+            self.day,
+            self.salary,
+            self.area,
+            self.region,
+            self.salary_type,
+            self.edu,
+            self.work_exp,
+            self.family,
+            self.industry,
+        )
+        return (
+            sum(a.nbytes for a in arrays)
+            + self.has_cust.nbytes
+            + self.is_unique.nbytes
+            + self.skill_row.nbytes
+            + self.skill.nbytes
+            + self.names.nbytes
+        )
+
+    @staticmethod
+    def _label_codes(keys: dict[str, np.ndarray], value: str) -> np.ndarray | None:
+        """Dictionary codes of the labels equal to ``value`` once folded; None when none."""
+        return keys.get(_fold(value))
+
+    def _compute_mask(self, filters: JobFilters) -> np.ndarray:
+        """Rows matching the filters, with the semantics of ``DatabaseRepository._job_filter``.
+
+        Cached, so callers must not modify it in place.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for value, codes, keys in (
+            (filters.job_family, self.family, self.family_keys),
+            (filters.area, self.area, self.area_keys),
+            (filters.region, self.region, self.region_keys),
+            (filters.edu, self.edu, self.edu_keys),
+            (filters.work_exp, self.work_exp, self.work_exp_keys),
+        ):
+            if value:
+                matching = self._label_codes(keys, value)
+                if matching is None:
+                    mask[:] = False
+                    return mask
+                mask &= codes == matching[0] if len(matching) == 1 else np.isin(codes, matching)
+        if filters.salary_type is not None:
+            mask &= self.salary_type == filters.salary_type
+        if filters.salary_min is not None:
+            mask &= (self.salary != NULL_SALARY) & (self.salary >= filters.salary_min)
+        if filters.salary_max is not None:
+            mask &= (self.salary != NULL_SALARY) & (self.salary < filters.salary_max)
+        if filters.date_from is not None:
+            mask &= self.day >= filters.date_from.toordinal() - EPOCH_ORDINAL
+        if filters.date_to is not None:
+            mask &= self.day <= filters.date_to.toordinal() - EPOCH_ORDINAL
+        if filters.skill:
+            matching = self._label_codes(self.skill_keys, filters.skill)
+            matches = np.zeros(len(self), dtype=bool)
+            if matching is not None:
+                matches[self.skill_row[np.isin(self.skill, matching)]] = True
+            mask &= matches
+        if filters.job_name:
+            matches = np.zeros(len(self), dtype=bool)
+            matches[self.names.search(filters.job_name)] = True
+            mask &= matches
+        return mask
+
+    @staticmethod
+    def _counts_by_label(
+        codes: np.ndarray, labels: list[str], limit: int | None = None
+    ) -> list[CategoryRow]:
+        """Counts per dictionary code, largest first; NULL is reported as ''."""
+        # Shifted by one so NULL_CODE lands in bin 0
+        counts = np.bincount(codes + 1, minlength=len(labels) + 1)
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0][:limit]
+        return [(labels[bin_ - 1] if bin_ else "", int(counts[bin_])) for bin_ in order]
+
+    def get_job_count_by_date(self, filters: JobFilters = JobFilters()) -> list[TrendRow]:
+        mask = self._mask(filters)
+        days, inverse, counts = np.unique(self.day[mask], return_inverse=True, return_counts=True)
+        salary = self.salary[mask]
+        has_salary = salary != NULL_SALARY
+        salary_sum = np.bincount(inverse, weights=np.where(has_salary, salary, 0))
+        salary_count = np.bincount(inverse, weights=has_salary, minlength=len(days))
+        unique_count = np.bincount(inverse, weights=self.is_unique[mask], minlength=len(days))
+        latest = range(len(days) - 1, max(len(days) - DatabaseRepository.TREND_DAYS, 0) - 1, -1)
+        return [
+            (
+                date.fromordinal(int(days[i]) + EPOCH_ORDINAL),
+                int(counts[i]),
+                salary_sum[i] / salary_count[i] if salary_count[i] else None,
+                int(unique_count[i]),
+            )
+            for i in latest  # newest first, like the SQL query
+        ]
+
+    def get_top_skills(
+        self, filters: JobFilters = JobFilters(), limit: int = 10
+    ) -> list[CategoryRow]:
+        mask = self._mask(filters)
+        skills = self.skill[mask[self.skill_row]]
+        return self._counts_by_label(skills, self.skill_labels, limit)
+
+    def get_jobs_by_region(self, filters: JobFilters = JobFilters()) -> list[CategoryRow]:
+        return self._counts_by_label(self.area[self._mask(filters)], self.area_labels)
+
+    def get_jobs_by_industry(self, filters: JobFilters = JobFilters()) -> list[CategoryRow]:
+        mask = self._mask(filters) & self.has_cust
+        return self._counts_by_label(self.industry[mask], self.industry_labels)
+
+    def get_salary_distribution(self, filters: JobFilters = JobFilters()) -> list[CategoryRow]:
+        salary = self.salary[self._mask(filters)]
+        salary = salary[salary != NULL_SALARY]
+        buckets = DatabaseRepository.SALARY_BUCKETS
+        lowers = np.array([lower for _, lower, _ in buckets])
+        counts = np.bincount(
+            np.searchsorted(lowers, salary, side="right") - 1, minlength=len(buckets)
+        )
+        return [(label, int(count)) for (label, _, _), count in zip(buckets, counts) if count]
+
+    def get_salary_percentiles(
+        self,
+        filters: JobFilters = JobFilters(),
+        percentiles: Sequence[float] = (25, 50, 75),
+    ) -> dict[float, float | None]:
+        salary = self.salary[self._mask(filters)]
+        salary = salary[salary != NULL_SALARY]
+        if salary.size == 0:
+            return dict.fromkeys(percentiles)
+        values = np.percentile(salary, percentiles)
+        return {p: float(v) for p, v in zip(percentiles, values, strict=True)}
+
+    def get_total_jobs(self, filters: JobFilters = JobFilters()) -> int:
+        return int(self._mask(filters).sum())
+
+
+class SnapshotStore:
+    """Holds the current ``JobSnapshot`` and reloads it when the data version moves.
+
+    The first request after an ETL run triggers the reload (in a worker thread); other
+    requests arriving meanwhile wait for the same reload instead of starting their own.
+    """
+
+    def __init__(self, engine: sa.Engine) -> None:
+        self.engine = engine
+        self._snapshot: JobSnapshot | None = None
+        self._lock = asyncio.Lock()
+        self.loaded_at: float | None = None
+
+    @property
+    def snapshot(self) -> JobSnapshot | None:
+        return self._snapshot
+
+    async def get(self, version: int) -> JobSnapshot:
+        """Return the snapshot of ``version``, loading it first when it is not current."""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version >= version:
+            return snapshot
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version < version:
+                snapshot = await run_sync(JobSnapshot.load, self.engine, version)
+                self._snapshot = snapshot
+                self.loaded_at = time.time()
+        return snapshot
+
+    def stats(self) -> dict[str, int | float | None]:
+        """Snapshot size and version for monitoring."""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "jobs": len(snapshot) if snapshot else 0,
+            "skillRows": len(snapshot.skill) if snapshot else 0,
+            "bytes": snapshot.nbytes if snapshot else 0,
+            "loadedAt": self.loaded_at,
+        }
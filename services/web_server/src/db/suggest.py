@@ -0,0 +1,165 @@
+"""In-memory typeahead index over distinct job names and job family labels.
+
+``JobNameIndex`` answers ``/api/job-names/suggest`` without MySQL: names are ranked by
+posting count once at build time, so a lookup only walks candidates in rank order until
+it has enough matches. ``JobNameIndexStore`` rebuilds it when the data version moves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from anyio.to_thread import run_sync
+
+from .repository import CategoryRow, DatabaseRepository
+from .snapshot import SubstringIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """One typeahead entry; ``kind`` is ``"jobName"`` or ``"jobFamily"``."""
+
+    label: str
+    kind: str
+    count: int
+
+
+class JobNameIndex:
+    """Prefix and bigram index over distinct job names, ranked by posting count.
+
+    Names are merged case-insensitively (the dashboard's job_name filter is
+    case-insensitive) and labelled with their most frequent spelling. Row numbers follow
+    descending count, so the ascending candidate rows of the bigram index are already in
+    rank order. Prefix matches rank before infix matches.
+    """
+
+    # Lookups stop after this many candidates were verified; bounds the worst case
+    MAX_SCANNED = 20_000
+
+    def __init__(
+        self,
+        version: int,
+        name_counts: Sequence[CategoryRow],
+        family_counts: Sequence[CategoryRow],
+    ) -> None:
+        self.version = version
+        totals: defaultdict[str, int] = defaultdict(int)
+        spellings: dict[str, tuple[int, str]] = {}
+        for name, count in name_counts:
+            name = name.strip()
+            if not name:
+                continue
+            key = name.lower()
+            totals[key] += int(count)
+            if count > spellings.get(key, (-1, ""))[0]:
+                spellings[key] = (int(count), name)
+
+        ranked = sorted(totals, key=lambda key: (-totals[key], key))
+        self.labels = [spellings[key][1] for key in ranked]
+        self.counts = [totals[key] for key in ranked]
+        self.names = SubstringIndex(ranked)
+        # Single characters have no bigram; their prefix matches are precomputed instead
+        self._by_first_char: defaultdict[str, list[int]] = defaultdict(list)
+        for row, key in enumerate(ranked):
+            self._by_first_char[key[0]].append(row)
+        self.families = sorted(
+            ((label, int(count)) for label, count in family_counts if label),
+            key=lambda family: -family[1],
+        )
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def suggest(self, query: str, limit: int = 10) -> list[Suggestion]:
+        """Job families, then job names containing ``query``, prefix matches first."""
+        query = query.strip().lower()
+        if not query:
+            return []
+        suggestions = [
+            Suggestion(label, "jobFamily", count)
+            for label, count in self.families
+            if query in label.lower()
+        ][:limit]
+
+        wanted = limit - len(suggestions)
+        if wanted <= 0:
+            return suggestions
+        prefix: list[int] = []
+        infix: list[int] = []
+        if len(query) == 1:
+            prefix = self._by_first_char.get(query, [])[:wanted]
+        else:
+            # Candidates come in rank order; verify lazily until enough prefix matches
+            names = self.names.names
+            for scanned, row in enumerate(self.names.candidates(query).tolist()):
+                if scanned >= self.MAX_SCANNED or len(prefix) >= wanted:
+                    break
+                if names[row].startswith(query):
+                    prefix.append(row)
+                elif len(infix) < wanted and query in names[row]:
+                    infix.append(row)
+
+        rows = (prefix + infix)[:wanted]
+        suggestions.extend(
+            Suggestion(self.labels[row], "jobName", self.counts[row]) for row in rows
+        )
+        return suggestions
+
+
+class JobNameIndexStore:
+    """Holds the current ``JobNameIndex`` and rebuilds it when the data version moves.
+
+    Like ``SnapshotStore``, the first request after an ETL run triggers the rebuild in a
+    worker thread and concurrent requests wait for it.
+    """
+
+    def __init__(self, repository: DatabaseRepository) -> None:
+        self.repository = repository
+        self._index: JobNameIndex | None = None
+        self._lock = asyncio.Lock()
+        self.built_at: float | None = None
+
+    async def get(self, version: int) -> JobNameIndex:
+        """Return the index of ``version``, building it first when it is not current."""
+        index = self._index
+        if index is not None and index.version >= version:
+            return index
+        async with self._lock:
+            index = self._index
+            if index is None or index.version < version:
+                index = await run_sync(self._build, version)
+                self._index = index
+                self.built_at = time.time()
+        return index
+
+    def _build(self, version: int) -> JobNameIndex:
+        start = time.perf_counter()
+        index = JobNameIndex(
+            version,
+            self.repository.get_job_name_counts(),
+            self.repository.get_job_family_counts(),
+        )
+        logger.info(
+            "Built job name index v%s: %d names in %.2fs",
+            version,
+            len(index),
+            time.perf_counter() - start,
+        )
+        return index
+
+    def stats(self) -> dict[str, int | float | None]:
+        """Index size and version for monitoring."""
+        index = self._index
+        return {
+            "version": index.version if index else None,
+            "names": len(index) if index else 0,
+            "families": len(index.families) if index else 0,
+            "builtAt": self.built_at,
+        }
@@ -0,0 +1,50 @@
+"""Tracks the silver data version published by the crawler's ETL runs."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from anyio.to_thread import run_sync
+
+from .repository import DatabaseRepository
+
+
+@dataclass(frozen=True)
+class DataVersion:
+    """Latest successful ETL run; ``id`` is 0 before the first run."""
+
+    id: int
+    finished_at: datetime | None
+
+
+class DataVersionTracker:
+    """Cheap, throttled lookup of the current data version.
+
+    ``etl_runs`` is queried at most once per ``check_interval`` seconds; every other
+    call returns the remembered version without touching MySQL.
+    """
+
+    def __init__(self, repository: DatabaseRepository, check_interval: float = 5.0) -> None:
+        self.repository = repository
+        self.check_interval = check_interval
+        self._version: DataVersion | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def current(self) -> DataVersion:
+        """Return the current data version, refreshing it when the check interval elapsed."""
+        version = self._version
+        if version is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return version
+
+        async with self._lock:
+            version = self._version
+            if version is None or time.monotonic() - self._checked_at >= self.check_interval:
+                version_id, finished_at = await run_sync(self.repository.get_data_version)
+                version = DataVersion(id=version_id, finished_at=finished_at)
+                self._version = version
+                self._checked_at = time.monotonic()
+        return version
@@ -0,0 +1,98 @@
+"""Incremental CSV and Parquet encoders for streamed job exports."""
+
+from __future__ import annotations
+
+import csv
+import io
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional; only the Parquet export needs it
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+
+# (name, Python type) per column, e.g. DatabaseRepository.EXPORT_COLUMNS
+Columns = Sequence[tuple[str, type]]
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def csv_chunks(columns: Columns, batches: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    """Encode batches of rows as CSV, one chunk per batch.
+
+    Starts with a UTF-8 BOM so spreadsheet programs detect the encoding of the Chinese
+    text; NULL becomes an empty field.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(name for name, _ in columns)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last ``drain``.
+
+    ``tell`` keeps counting across drains, which is all the Parquet writer needs to
+    record column chunk offsets.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def parquet_chunks(
+    columns: Columns, batches: Iterable[Sequence[tuple]], compression: str = "zstd"
+) -> Iterator[bytes]:
+    """Encode batches of rows as one Parquet file, one row group per batch.
+
+    Each row group is sent as soon as it is written, so only one batch is held in
+    memory; the footer follows the last group.
+    """
+    if pq is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+    arrow_types = {int: pa.int64(), str: pa.string(), date: pa.date32()}
+    schema = pa.schema(pa.field(name, arrow_types[kind]) for name, kind in columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=compression)
+    for batch in batches:
+        arrays = [
+            pa.array(values, type=field.type)
+            for values, field in zip(zip(*batch, strict=True), schema, strict=True)
+        ]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema), row_group_size=len(batch))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
@@ -1,14 +1,93 @@
 """FastAPI application entry point for Job Market Dashboard API."""
 
-from fastapi import FastAPI
+import logging
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import sqlalchemy as sa
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.routers import dashboard_router
+from src.cache import VersionedLRUCache
+from src.db import (
+    AsyncDatabaseRepository,
+    DatabaseRepository,
+    DataVersionTracker,
+    DescriptionIndexStore,
+    JobNameIndexStore,
+    SimilarityIndexStore,
+    SkillGraphStore,
+    SnapshotStore,
+    create_engine_from_env,
+    pool_capacity,
+)
+from src.responses import ORJSONResponse
+from src.routers import dashboard_router, jobs_router, skills_router
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create the pooled engine once and share one repository across requests."""
+    engine = create_engine_from_env()
+    repository = DatabaseRepository(
+        engine, search_mode=os.getenv("JOB_NAME_SEARCH_MODE", "fulltext")
+    )
+    # DASHBOARD_ENGINE=snapshot answers dashboard queries from an in-process NumPy snapshot
+    snapshot_store = (
+        SnapshotStore(engine) if os.getenv("DASHBOARD_ENGINE", "mysql") == "snapshot" else None
+    )
+    # Streamed exports keep a connection checked out for the whole download, so they get
+    # their own slots and the query limiter gets the rest of the pool
+    max_exports = int(os.getenv("EXPORT_CONCURRENCY", "2"))
+    if not 0 < max_exports < pool_capacity():
+        raise ValueError("EXPORT_CONCURRENCY must be between 1 and the pool capacity - 1")
+    app.state.repository = AsyncDatabaseRepository(
+        repository,
+        max_concurrency=pool_capacity() - max_exports,
+        snapshot_store=snapshot_store,
+        max_exports=max_exports,
+    )
+    app.state.version_tracker = DataVersionTracker(
+        repository, check_interval=float(os.getenv("DATA_VERSION_CHECK_INTERVAL", "5"))
+    )
+    app.state.dashboard_cache = VersionedLRUCache(
+        max_entries=int(os.getenv("DASHBOARD_CACHE_SIZE", "1024")),
+        ttl=float(os.getenv("DASHBOARD_CACHE_TTL", "600")),
+    )
+    app.state.job_name_index = JobNameIndexStore(repository)
+    app.state.skill_graphs = SkillGraphStore(repository)
+    app.state.similarity_index = SimilarityIndexStore(repository)
+    # Published by the crawler's ETL; shared through a volume in docker-compose
+    app.state.description_index = DescriptionIndexStore(
+        Path(os.getenv("DESCRIPTION_INDEX_DIR", "data/description_index"))
+    )
+    # Warm up so the first request does not pay for the loads
+    try:
+        version = await app.state.version_tracker.current()
+        await app.state.job_name_index.get(version.id)
+        await app.state.skill_graphs.get(version.id)
+        await app.state.similarity_index.get(version.id)
+        await app.state.description_index.get(version.id)
+        if snapshot_store is not None:
+            await snapshot_store.get(version.id)
+    except sa.exc.SQLAlchemyError:
+        logger.exception("Initial index/snapshot load failed; retrying on the first request")
+    try:
+        yield
+    finally:
+        engine.dispose()
+
 
 app = FastAPI(
     title="Job Market Dashboard API",
     description="Data pipeline and API for Taiwan Job Market Dashboard",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware for frontend access
@@ -22,9 +101,62 @@ app.add_middleware(
 
 # Include routers
 app.include_router(dashboard_router)
+app.include_router(jobs_router)
+app.include_router(skills_router)
 
 
 @app.get("/health")
 async def health_check() -> dict[str, str]:
     """Health check endpoint."""
     return {"status": "ok"}
+
+
+@app.get("/health/db")
+async def db_pool_stats(request: Request) -> dict[str, int | str]:
+    """Connection pool and query coalescing statistics for monitoring."""
+    repo: AsyncDatabaseRepository = request.app.state.repository
+    return {**repo.repository.pool_stats(), **repo.flight_stats()}
+
+
+@app.get("/health/cache")
+async def dashboard_cache_stats(request: Request) -> dict[str, int | None]:
+    """Dashboard response cache statistics for monitoring."""
+    cache: VersionedLRUCache = request.app.state.dashboard_cache
+    return cache.stats()
+
+
+@app.get("/health/snapshot")
+async def snapshot_stats(request: Request) -> dict[str, int | float | bool | None]:
+    """In-process snapshot statistics (``enabled`` is false with DASHBOARD_ENGINE=mysql)."""
+    store: SnapshotStore | None = request.app.state.repository.snapshot_store
+    if store is None:
+        return {"enabled": False}
+    return {"enabled": True, **store.stats()}
+
+
+@app.get("/health/suggest")
+async def job_name_index_stats(request: Request) -> dict[str, int | float | None]:
+    """Job name typeahead index statistics for monitoring."""
+    store: JobNameIndexStore = request.app.state.job_name_index
+    return store.stats()
+
+
+@app.get("/health/skills")
+async def skill_graph_stats(request: Request) -> dict[str, dict[str, int | float | None]]:
+    """Skill co-occurrence graph statistics per kind for monitoring."""
+    store: SkillGraphStore = request.app.state.skill_graphs
+    return store.stats()
+
+
+@app.get("/health/similar")
+async def similarity_index_stats(request: Request) -> dict[str, int | float | None]:
+    """Similar-jobs index statistics for monitoring."""
+    store: SimilarityIndexStore = request.app.state.similarity_index
+    return store.stats()
+
+
+@app.get("/health/search")
+async def description_index_stats(request: Request) -> dict[str, int | float | str | None]:
+    """Memory-mapped job description index statistics for monitoring."""
+    store: DescriptionIndexStore = request.app.state.description_index
+    return store.stats()
@@ -1,5 +1,44 @@
 """Models package."""
 
-from .dashboard import CategoryPoint, DashboardData, DashboardMeta, TimeSeriesPoint
+from .dashboard import (
+    CategoryPoint,
+    ComparisonData,
+    ComparisonSeries,
+    DashboardData,
+    DashboardMeta,
+    DrilldownData,
+    DrilldownPoint,
+    TimeSeriesPoint,
+)
+from .jobs import (
+    JobNameSuggestion,
+    JobNameSuggestions,
+    JobPage,
+    JobPosting,
+    JobSearchResults,
+    SimilarJobPosting,
+    SimilarJobs,
+)
+from .skills import RelatedSkillPoint, RelatedSkills, RisingSkillPoint, RisingSkills
 
-__all__ = ["TimeSeriesPoint", "CategoryPoint", "DashboardMeta", "DashboardData"]
+__all__ = [
+    "TimeSeriesPoint",
+    "CategoryPoint",
+    "DashboardMeta",
+    "DashboardData",
+    "ComparisonSeries",
+    "ComparisonData",
+    "DrilldownPoint",
+    "DrilldownData",
+    "JobNameSuggestion",
+    "JobNameSuggestions",
+    "JobPosting",
+    "JobPage",
+    "JobSearchResults",
+    "SimilarJobPosting",
+    "SimilarJobs",
+    "RelatedSkillPoint",
+    "RelatedSkills",
+    "RisingSkillPoint",
+    "RisingSkills",
+]
@@ -9,6 +9,7 @@ class TimeSeriesPoint(BaseModel):
     date: str
     jobCount: int
     avgSalary: float
+    uniqueCount: int  # jobCount without near-duplicate reposts
 
 
 class CategoryPoint(BaseModel):
@@ -27,11 +28,38 @@ class DashboardMeta(BaseModel):
 
 
 class DashboardData(BaseModel):
-    """Complete dashboard response schema."""
-
-    meta: DashboardMeta
-    trend: list[TimeSeriesPoint]
-    skills: list[CategoryPoint]
-    regions: list[CategoryPoint]
-    industries: list[CategoryPoint]
-    salaryDist: list[CategoryPoint]
+    """Dashboard response schema; only the panels selected with ``panels=`` are present."""
+
+    meta: DashboardMeta | None = None
+    trend: list[TimeSeriesPoint] | None = None
+    skills: list[CategoryPoint] | None = None
+    regions: list[CategoryPoint] | None = None
+    industries: list[CategoryPoint] | None = None
+    salaryDist: list[CategoryPoint] | None = None
+
+
+class ComparisonSeries(DashboardData):
+    """Dashboard panels of one compared job_name term."""
+
+    jobName: str
+
+
+class ComparisonData(BaseModel):
+    """Comparison response schema: one series per job_name term, in request order."""
+
+    series: list[ComparisonSeries]
+
+
+class DrilldownPoint(BaseModel):
+    """One member of the drill-down dimension; ``label`` is ``YYYY-MM`` for months."""
+
+    label: str
+    jobCount: int
+    avgSalary: float | None = None
+
+
+class DrilldownData(BaseModel):
+    """Drill-down response schema: the slice rolled up along ``by``."""
+
+    by: str
+    points: list[DrilldownPoint]
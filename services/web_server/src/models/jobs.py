@@ -0,0 +1,63 @@
+"""Pydantic models for the job name and job listing API responses."""
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class JobNameSuggestion(BaseModel):
+    """Typeahead entry: a job family label or a distinct job name."""
+
+    label: str
+    kind: Literal["jobName", "jobFamily"]
+    count: int
+
+
+class JobNameSuggestions(BaseModel):
+    """Typeahead response schema, best matches first."""
+
+    suggestions: list[JobNameSuggestion]
+
+
+class JobPosting(BaseModel):
+    """One job of the listing; salaries are in the posting's own unit except the monthly one."""
+
+    id: int
+    jobId: str
+    jobName: str
+    jobFamily: str | None = None
+    company: str | None = None
+    area: str
+    region: str
+    salaryMin: int
+    salaryMax: int
+    salaryMonthly: int | None = None
+    appearDate: str
+
+
+class SimilarJobPosting(JobPosting):
+    """A similar job and its cosine similarity (0-1) to the queried one."""
+
+    score: float
+
+
+class SimilarJobs(BaseModel):
+    """Similar jobs response schema, most similar first."""
+
+    id: int
+    similar: list[SimilarJobPosting]
+
+
+class JobSearchResults(BaseModel):
+    """Description search response schema: the total match count and one page, newest first."""
+
+    query: str
+    total: int
+    jobs: list[JobPosting]
+
+
+class JobPage(BaseModel):
+    """Job listing response schema; pass ``nextCursor`` as ``cursor`` for the next page."""
+
+    jobs: list[JobPosting]
+    nextCursor: str | None = None
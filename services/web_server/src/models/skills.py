@@ -0,0 +1,37 @@
+"""Pydantic models for the skill analytics API responses."""
+
+from pydantic import BaseModel
+
+
+class RelatedSkillPoint(BaseModel):
+    """A skill required together with the queried one; ``share`` is of its jobs."""
+
+    label: str
+    jobCount: int
+    share: float
+
+
+class RelatedSkills(BaseModel):
+    """Co-occurrence response schema, most frequent first."""
+
+    skill: str
+    jobCount: int
+    related: list[RelatedSkillPoint]
+
+
+class RisingSkillPoint(BaseModel):
+    """Job counts of a skill in the recent and the previous window."""
+
+    label: str
+    recentCount: int
+    previousCount: int
+    growth: float
+
+
+class RisingSkills(BaseModel):
+    """Rising skills response schema, fastest growing first."""
+
+    weeks: int
+    recentFrom: str | None = None
+    recentTo: str | None = None
+    skills: list[RisingSkillPoint]
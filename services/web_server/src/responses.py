@@ -0,0 +1,120 @@
+"""Response classes and HTTP caching helpers shared by the API."""
+
+from __future__ import annotations
+
+import gzip
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from src.db import DataVersion
+
+try:
+    import brotli
+except ImportError:  # optional extra (`uv sync --extra brotli`); responses fall back to gzip
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed; the saving is not worth the CPU
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson.
+
+    Endpoints return plain dicts/lists (or pre-rendered bytes) with this class, so the
+    body is encoded once, without a second validation pass through Pydantic.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            # Already rendered, e.g. a cached response body
+            return content
+        return orjson.dumps(content)
+
+
+def version_headers(version: DataVersion) -> dict[str, str]:
+    """Validators of a response computed from ``version`` of the silver data.
+
+    The ETag is weak because the body's bytes differ with the content encoding.
+    ``Cache-Control: no-cache`` lets browsers and proxies store the response but
+    revalidate it on every use, which costs a 304 until the next ETL run.
+    """
+    headers = {"ETag": f'W/"v{version.id}"', "Cache-Control": "no-cache"}
+    if version.finished_at is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(version.finished_at), usegmt=True)
+    return headers
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # etl_runs.finished_at is a naive DATETIME in the MySQL server's time zone (UTC)
+    return moment.replace(tzinfo=UTC) if moment.tzinfo is None else moment
+
+
+def is_not_modified(request: Request, version: DataVersion) -> bool:
+    """Whether the client's cached copy (``If-None-Match``/``If-Modified-Since``) is current.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only consulted
+    without it, as in RFC 9110.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = version_headers(version)["ETag"].removeprefix("W/")
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or version.finished_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have second precision
+    return _as_utc(version.finished_at).replace(microsecond=0) <= since
+
+
+def not_modified_response(version: DataVersion) -> Response:
+    """Empty 304 response carrying the current validators."""
+    headers = {**version_headers(version), "Vary": "Accept-Encoding"}
+    return Response(status_code=304, headers=headers)
+
+
+def _accepted_encoding(request: Request) -> str | None:
+    """Best supported content coding the client accepts: ``br``, then ``gzip``."""
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        weight = params.replace(" ", "").lower()
+        if weight.startswith("q="):
+            try:
+                if float(weight[2:]) == 0:
+                    continue  # explicitly refused
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def versioned_response(request: Request, body: bytes, version: DataVersion) -> Response:
+    """JSON ``body`` with validators for ``version``, compressed when large enough."""
+    headers = {**version_headers(version), "Vary": "Accept-Encoding"}
+    encoding = _accepted_encoding(request) if len(body) >= MIN_COMPRESS_SIZE else None
+    if encoding == "br":
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    elif encoding == "gzip":
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return ORJSONResponse(body, headers=headers)
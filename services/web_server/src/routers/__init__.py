@@ -1,5 +1,7 @@
 """Routers package."""
 
 from .dashboard import router as dashboard_router
+from .jobs import router as jobs_router
+from .skills import router as skills_router
 
-__all__ = ["dashboard_router"]
+__all__ = ["dashboard_router", "jobs_router", "skills_router"]
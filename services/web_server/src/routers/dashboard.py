@@ -1,19 +1,144 @@
 """Dashboard API router with MySQL data support."""
 
-from datetime import datetime
-from typing import Optional
+from collections.abc import Sequence
+from dataclasses import replace
+from datetime import date, datetime
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
-from src.db import DatabaseRepository
-from src.models import CategoryPoint, DashboardData, DashboardMeta, TimeSeriesPoint
+from src.cache import VersionedLRUCache
+from src.db import (
+    DASHBOARD_PANELS,
+    AsyncDatabaseRepository,
+    DashboardPanels,
+    DataVersion,
+    DataVersionTracker,
+    JobFilters,
+)
+from src.models import ComparisonData, DashboardData, DrilldownData
+from src.responses import (
+    ORJSONResponse,
+    is_not_modified,
+    not_modified_response,
+    versioned_response,
+)
 
 router = APIRouter(prefix="/api", tags=["dashboard"])
 
+PanelName = Literal["meta", "trend", "skills", "regions", "industries", "salary"]
+DrilldownDimension = Literal["area", "region", "job_family", "month"]
+# Dashboard panel -> key in the DashboardData response
+PANEL_RESPONSE_KEYS: dict[str, str] = {
+    "meta": "meta",
+    "trend": "trend",
+    "skills": "skills",
+    "regions": "regions",
+    "industries": "industries",
+    "salary": "salaryDist",
+}
 
-def get_repository() -> DatabaseRepository:
-    """Dependency injection for database repository."""
-    return DatabaseRepository()
+# Cache key: (normalized filters, panel); values are the panel's JSON
+DashboardKey = tuple[JobFilters, str]
+
+MAX_COMPARE_TERMS = 10
+
+
+def get_repository(request: Request) -> AsyncDatabaseRepository:
+    """Dependency injection for the repository shared across requests (see lifespan)."""
+    return request.app.state.repository
+
+
+def get_version_tracker(request: Request) -> DataVersionTracker:
+    """Dependency injection for the shared data version tracker."""
+    return request.app.state.version_tracker
+
+
+def get_dashboard_cache(request: Request) -> VersionedLRUCache[DashboardKey, bytes]:
+    """Dependency injection for the shared dashboard response cache."""
+    return request.app.state.dashboard_cache
+
+
+def normalize_job_name(job_name: str | None) -> str | None:
+    """Normalize the job_name filter; LIKE is case-insensitive, so case is folded too."""
+    if job_name is None:
+        return None
+    return job_name.strip().lower() or None
+
+
+def normalize_job_family(job_family: str | None) -> str | None:
+    """Normalize the job_family filter (exact match, so only whitespace is stripped)."""
+    if job_family is None:
+        return None
+    return job_family.strip() or None
+
+
+def _strip(value: str | None) -> str | None:
+    return (value.strip() or None) if value else None
+
+
+def get_dimension_filters(
+    job_family: str | None = Query(None, description="Filter by job family (exact match)"),
+    area: str | None = Query(None, description="Filter by address area (exact match)"),
+    region: str | None = Query(None, description="Filter by address region (exact match)"),
+    skill: str | None = Query(None, description="Filter by skill name (exact match)"),
+    salary_type: int | None = Query(None, description="Filter by salary type code"),
+    edu: str | None = Query(None, description="Filter by education requirement (exact match)"),
+    work_exp: str | None = Query(None, description="Filter by work experience (exact match)"),
+    salary_min: int | None = Query(None, ge=0, description="Min monthly salary (inclusive)"),
+    salary_max: int | None = Query(None, ge=0, description="Max monthly salary (exclusive)"),
+    date_from: date | None = Query(None, description="Earliest appear date (inclusive)"),
+    date_to: date | None = Query(None, description="Latest appear date (inclusive)"),
+) -> JobFilters:
+    """Dependency parsing every filter except job_name from the query string."""
+    return JobFilters(
+        job_family=normalize_job_family(job_family),
+        area=_strip(area),
+        region=_strip(region),
+        skill=_strip(skill),
+        salary_type=salary_type,
+        edu=_strip(edu),
+        work_exp=_strip(work_exp),
+        salary_min=salary_min,
+        salary_max=salary_max,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+
+def get_job_filters(
+    job_name: str | None = Query(None, description="Filter by job name (partial match)"),
+    filters: JobFilters = Depends(get_dimension_filters),
+) -> JobFilters:
+    """Dependency parsing all filters; normalized, so equal filters share cache entries."""
+    return replace(filters, job_name=normalize_job_name(job_name))
+
+
+def parse_panels(panels: str | None) -> tuple[str, ...]:
+    """Parse a comma-separated ``panels=`` selection; all panels when omitted."""
+    if not panels:
+        return DASHBOARD_PANELS
+    selected = {panel.strip() for panel in panels.split(",") if panel.strip()}
+    unknown = selected - PANEL_RESPONSE_KEYS.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown panels: {sorted(unknown)}; choose from {list(DASHBOARD_PANELS)}",
+        )
+    return tuple(panel for panel in DASHBOARD_PANELS if panel in selected)
+
+
+def parse_compare_terms(job_names: Sequence[str]) -> tuple[str, ...]:
+    """Normalize and deduplicate the compared job_name terms, keeping their order."""
+    terms = tuple(dict.fromkeys(filter(None, map(normalize_job_name, job_names))))
+    if not terms:
+        raise HTTPException(status_code=422, detail="At least one non-empty job_name is required")
+    if len(terms) > MAX_COMPARE_TERMS:
+        raise HTTPException(
+            status_code=422, detail=f"At most {MAX_COMPARE_TERMS} job_name terms can be compared"
+        )
+    return terms
 
 
 def calculate_percentage(value: int, total: int) -> float:
@@ -21,89 +146,323 @@ def calculate_percentage(value: int, total: int) -> float:
     return round(value / total * 100, 1) if total > 0 else 0.0
 
 
-@router.get("/dashboard", response_model=DashboardData)
+async def load_panels(
+    panels: Sequence[str],
+    filters: JobFilters,
+    repo: AsyncDatabaseRepository,
+    version: DataVersion,
+    cache: VersionedLRUCache[DashboardKey, bytes],
+) -> dict[str, bytes]:
+    """Serialized JSON of each requested panel at ``version``, from the cache or queried.
+
+    Panels are cached individually, so ``/api/dashboard`` (any ``panels=`` selection) and
+    the per-panel endpoints share entries and only the missing panels hit the database.
+    """
+    bodies: dict[str, bytes] = {}
+    missing = []
+    for panel in panels:
+        cached = cache.get((filters, panel), version.id)
+        if cached is None:
+            missing.append(panel)
+        else:
+            bodies[panel] = cached
+
+    if missing:
+        # Run only the missing panels' queries, concurrently and off the event loop
+        fetched = await repo.fetch_dashboard(filters, version.id, panels=missing)
+        for panel in missing:
+            body = orjson.dumps(render_panel(panel, fetched, version.finished_at))
+            cache.put((filters, panel), version.id, body)
+            bodies[panel] = body
+    return bodies
+
+
+async def load_comparison(
+    panels: Sequence[str],
+    job_names: Sequence[str],
+    filters: JobFilters,
+    repo: AsyncDatabaseRepository,
+    version: DataVersion,
+    cache: VersionedLRUCache[DashboardKey, bytes],
+) -> dict[str, dict[str, bytes]]:
+    """Serialized JSON of each requested panel per job_name term, keyed by term.
+
+    ``filters`` apply to every term. Entries are shared with the single-term dashboard
+    cache. Terms and panels with any cache miss are fetched in one batch, which costs one
+    grouped query per missing panel.
+    """
+    bodies: dict[str, dict[str, bytes]] = {job_name: {} for job_name in job_names}
+    missing_terms: list[str] = []
+    missing_panels: set[str] = set()
+    for job_name in job_names:
+        for panel in panels:
+            cached = cache.get((replace(filters, job_name=job_name), panel), version.id)
+            if cached is None:
+                missing_panels.add(panel)
+                if not missing_terms or missing_terms[-1] != job_name:
+                    missing_terms.append(job_name)
+            else:
+                bodies[job_name][panel] = cached
+
+    if missing_terms:
+        selected = [panel for panel in panels if panel in missing_panels]
+        fetched = await repo.fetch_comparison(missing_terms, filters, version.id, panels=selected)
+        for job_name, term_panels in fetched.items():
+            term_filters = replace(filters, job_name=job_name)
+            for panel in selected:
+                body = orjson.dumps(render_panel(panel, term_panels, version.finished_at))
+                cache.put((term_filters, panel), version.id, body)
+                bodies[job_name][panel] = body
+    return bodies
+
+
+@router.get("/dashboard", response_model=DashboardData, response_class=ORJSONResponse)
 async def get_dashboard_data(
-    job_name: Optional[str] = Query(None, description="Filter by job name (partial match)"),
-    repo: DatabaseRepository = Depends(get_repository),
-) -> DashboardData:
+    request: Request,
+    filters: JobFilters = Depends(get_job_filters),
+    panels: str | None = Query(
+        None,
+        description="Comma-separated panels to include (meta, trend, skills, regions, "
+        "industries, salary); all when omitted",
+    ),
+    repo: AsyncDatabaseRepository = Depends(get_repository),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+    cache: VersionedLRUCache[DashboardKey, bytes] = Depends(get_dashboard_cache),
+) -> Response:
     """
     Get aggregated dashboard data from MySQL.
 
+    With at most a job_family filter the panels are read from the ETL's pre-aggregated
+    tables; any other filter combination is ANDed over ``dim_job``. Each panel is cached
+    as serialized JSON per normalized filter combination until the next ETL run changes
+    the data version (or the cache TTL expires).
+
+    ``DashboardData`` only documents the response shape; the body is built from plain
+    dicts and encoded with orjson, without per-row Pydantic models.
+
+    The response carries an ETag and ``Last-Modified`` of the data version; a matching
+    ``If-None-Match`` (or ``If-Modified-Since``) gets a 304 without touching the cache
+    or the database. Large bodies are compressed with brotli or gzip.
+
     Args:
-        job_name: Optional job name filter for partial matching
+        request: Incoming request (conditional and ``Accept-Encoding`` headers)
+        filters: job_name (partial match), job_family, area, region, skill, salary_type,
+            edu, work_exp, salary_min/salary_max (monthly) and date_from/date_to filters,
+            ANDed (injected from the query string)
+        panels: Optional panel selection; unselected panels are neither queried nor returned
         repo: Database repository (injected)
+        version_tracker: Current data version (injected)
+        cache: Dashboard response cache (injected)
 
     Returns:
         Aggregated dashboard statistics
     """
-    # Fetch all data from MySQL
-    trend_df = repo.get_job_count_by_date(job_name)
-    skills_df = repo.get_top_skills(job_name)
-    regions_df = repo.get_jobs_by_region(job_name)
-    industries_df = repo.get_jobs_by_industry(job_name)
-    salary_df = repo.get_salary_distribution(job_name)
-    total_jobs = repo.get_total_jobs(job_name)
-
-    # Transform trend data
-    trend = [
-        TimeSeriesPoint(
-            date=row["date"].strftime("%Y-%m-%d")
-            if hasattr(row["date"], "strftime")
-            else str(row["date"]),
-            jobCount=int(row["jobCount"]),
-            avgSalary=float(row["avgSalary"] or 0),
-        )
-        for _, row in trend_df.iterrows()
-    ]
-    trend.reverse()  # Oldest first
+    selected = parse_panels(panels)
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    bodies = await load_panels(selected, filters, repo, version, cache)
+    # Cached panel bodies are embedded as-is, without decoding them again
+    body = orjson.dumps(
+        {PANEL_RESPONSE_KEYS[panel]: orjson.Fragment(bodies[panel]) for panel in selected}
+    )
+    return versioned_response(request, body, version)
 
-    # Transform skills data
-    skills = [
-        CategoryPoint(label=row["label"], value=int(row["value"]))
-        for _, row in skills_df.iterrows()
-    ]
 
-    # Transform regions data with percentage
-    total_region_jobs = int(regions_df["value"].sum()) if not regions_df.empty else 0
-    regions = [
-        CategoryPoint(
-            label=row["label"],
-            value=int(row["value"]),
-            percentage=calculate_percentage(int(row["value"]), total_region_jobs),
-        )
-        for _, row in regions_df.iterrows()
-    ]
+@router.get("/dashboard/{panel}", response_class=ORJSONResponse)
+async def get_dashboard_panel(
+    request: Request,
+    panel: PanelName,
+    filters: JobFilters = Depends(get_job_filters),
+    repo: AsyncDatabaseRepository = Depends(get_repository),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+    cache: VersionedLRUCache[DashboardKey, bytes] = Depends(get_dashboard_cache),
+) -> Response:
+    """Get a single dashboard panel, i.e. the value of its key in ``/api/dashboard``."""
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    bodies = await load_panels((panel,), filters, repo, version, cache)
+    return versioned_response(request, bodies[panel], version)
 
-    # Transform industries data with percentage
-    total_industry_jobs = int(industries_df["value"].sum()) if not industries_df.empty else 0
-    industries = [
-        CategoryPoint(
-            label=row["label"],
-            value=int(row["value"]),
-            percentage=calculate_percentage(int(row["value"]), total_industry_jobs),
-        )
-        for _, row in industries_df.iterrows()
-    ]
 
-    # Transform salary distribution with percentage
-    total_salary_jobs = int(salary_df["value"].sum()) if not salary_df.empty else 0
-    salary_dist = [
-        CategoryPoint(
-            label=row["label"],
-            value=int(row["value"]),
-            percentage=calculate_percentage(int(row["value"]), total_salary_jobs),
-        )
-        for _, row in salary_df.iterrows()
-    ]
+@router.get("/compare", response_model=ComparisonData, response_class=ORJSONResponse)
+async def get_comparison(
+    request: Request,
+    job_name: list[str] = Query(..., description="Job names to compare (repeated parameter)"),
+    filters: JobFilters = Depends(get_dimension_filters),
+    panels: str | None = Query(
+        None,
+        description="Comma-separated panels to include (meta, trend, skills, regions, "
+        "industries, salary); all when omitted",
+    ),
+    repo: AsyncDatabaseRepository = Depends(get_repository),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+    cache: VersionedLRUCache[DashboardKey, bytes] = Depends(get_dashboard_cache),
+) -> Response:
+    """
+    Compare the dashboard panels of several job names in one request.
+
+    Each series equals ``/api/dashboard?job_name=<term>`` for its term, but every panel
+    is computed for all terms at once, so comparing N roles costs about one query per
+    panel instead of N.
 
-    return DashboardData(
-        meta=DashboardMeta(
-            lastUpdated=datetime.now().isoformat(),
-            totalJobs=total_jobs,
-        ),
-        trend=trend,
-        skills=skills,
-        regions=regions,
-        industries=industries,
-        salaryDist=salary_dist,
+    Args:
+        request: Incoming request (conditional and ``Accept-Encoding`` headers)
+        job_name: Up to ``MAX_COMPARE_TERMS`` job name terms (partial match each)
+        filters: Filters other than job_name, applied to every term (injected)
+        panels: Optional panel selection, as in ``/api/dashboard``
+        repo: Database repository (injected)
+        version_tracker: Current data version (injected)
+        cache: Dashboard response cache (injected)
+
+    Returns:
+        One series of panels per distinct normalized term, in request order
+    """
+    selected = parse_panels(panels)
+    terms = parse_compare_terms(job_name)
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    bodies = await load_comparison(selected, terms, filters, repo, version, cache)
+    body = orjson.dumps(
+        {
+            "series": [
+                {
+                    "jobName": term,
+                    **{
+                        PANEL_RESPONSE_KEYS[panel]: orjson.Fragment(bodies[term][panel])
+                        for panel in selected
+                    },
+                }
+                for term in terms
+            ]
+        }
     )
+    return versioned_response(request, body, version)
+
+
+@router.get("/drilldown", response_model=DrilldownData, response_class=ORJSONResponse)
+async def get_drilldown(
+    request: Request,
+    by: DrilldownDimension = Query("area", description="Dimension to break the slice down by"),
+    area: str | None = Query(None, description="Slice: address area (exact match)"),
+    region: str | None = Query(None, description="Slice: address region (exact match)"),
+    job_family: str | None = Query(None, description="Slice: job family (exact match)"),
+    month_from: date | None = Query(None, description="Slice: first month (any day in it)"),
+    month_to: date | None = Query(None, description="Slice: last month (any day in it)"),
+    repo: AsyncDatabaseRepository = Depends(get_repository),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+) -> Response:
+    """
+    Drill down region -> district -> job family -> month.
+
+    Answered from the ``agg_region_cube`` table the ETL maintains, so e.g. all of 台北市
+    by district (``area=台北市&by=region``) or one district by month
+    (``area=台北市&region=信義區&by=month``) never scans ``dim_job``.
+
+    Args:
+        request: Incoming request (conditional and ``Accept-Encoding`` headers)
+        by: Dimension of the returned points
+        area, region, job_family: Optional slice of the cube
+        month_from, month_to: Optional month range, inclusive
+        repo: Database repository (injected)
+        version_tracker: Current data version (injected)
+
+    Returns:
+        Job count and average monthly salary per member of ``by``
+    """
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    filters = JobFilters(
+        job_family=normalize_job_family(job_family),
+        area=_strip(area),
+        region=_strip(region),
+        date_from=month_from,
+        date_to=month_to,
+    )
+    rows = await repo.fetch_region_cube(by, filters, version.id)
+    body = orjson.dumps(
+        {
+            "by": by,
+            "points": [
+                {
+                    "label": label.strftime("%Y-%m") if by == "month" else label,
+                    "jobCount": int(job_count),
+                    "avgSalary": None if avg_salary is None else float(avg_salary),
+                }
+                for label, job_count, avg_salary in rows
+            ],
+        }
+    )
+    return versioned_response(request, body, version)
+
+
+@router.get("/salary/percentiles", response_class=ORJSONResponse)
+async def get_salary_percentiles(
+    request: Request,
+    filters: JobFilters = Depends(get_job_filters),
+    repo: AsyncDatabaseRepository = Depends(get_repository),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+) -> Response:
+    """Monthly salary quartiles (25th, 50th, 75th percentile) of the matching jobs."""
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    percentiles = await repo.fetch_salary_percentiles(filters, version.id)
+    body = orjson.dumps(
+        {"percentiles": [{"percentile": p, "salary": salary} for p, salary in percentiles.items()]}
+    )
+    return versioned_response(request, body, version)
+
+
+def _category_points(rows: list[tuple[str, int]], with_percentage: bool) -> list[dict[str, Any]]:
+    """(label, value) rows to CategoryPoint dicts, optionally with each row's share."""
+    total = sum(int(value) for _, value in rows) if with_percentage else 0
+    return [
+        {
+            "label": label,
+            "value": int(value),
+            "percentage": calculate_percentage(int(value), total) if with_percentage else None,
+        }
+        for label, value in rows
+    ]
+
+
+def render_panel(panel: str, panels: DashboardPanels, last_updated: datetime | None = None) -> Any:
+    """Transform one panel's raw rows into its ``DashboardData`` value.
+
+    ``last_updated`` is the finish time of the ETL run the rows come from; the current
+    time is reported only before the first recorded run.
+    """
+    if panel == "meta":
+        updated = last_updated or datetime.now()
+        return {"lastUpdated": updated.isoformat(), "totalJobs": panels.total_jobs}
+    if panel == "trend":
+        # Oldest first
+        return [
+            {
+                "date": day.strftime("%Y-%m-%d") if hasattr(day, "strftime") else str(day),
+                "jobCount": int(job_count),
+                "avgSalary": float(avg_salary or 0),
+                "uniqueCount": int(unique_count),
+            }
+            for day, job_count, avg_salary, unique_count in reversed(panels.trend or [])
+        ]
+    rows = {
+        "skills": panels.skills,
+        "regions": panels.regions,
+        "industries": panels.industries,
+        "salary": panels.salary,
+    }[panel]
+    return _category_points(rows or [], with_percentage=panel != "skills")
+
+
+def build_dashboard(
+    panels: DashboardPanels, last_updated: datetime | None = None
+) -> dict[str, Any]:
+    """Transform the raw rows of all panels into a ``DashboardData``-shaped dict."""
+    return {
+        key: render_panel(panel, panels, last_updated) for panel, key in PANEL_RESPONSE_KEYS.items()
+    }
@@ -0,0 +1,292 @@
+"""Job name, job listing, description search and export API router."""
+
+import base64
+from datetime import date
+from typing import Any, Literal
+
+import orjson
+from anyio.to_thread import run_sync
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from src.db import (
+    AsyncDatabaseRepository,
+    DatabaseRepository,
+    DataVersionTracker,
+    DescriptionIndexStore,
+    ExportLimitError,
+    JobCursor,
+    JobFilters,
+    JobNameIndexStore,
+    JobRow,
+    SimilarityIndexStore,
+)
+from src.export import EXPORT_FORMATS, csv_chunks, parquet_available, parquet_chunks
+from src.models import JobNameSuggestions, JobPage, JobSearchResults, SimilarJobs
+from src.responses import (
+    ORJSONResponse,
+    is_not_modified,
+    not_modified_response,
+    versioned_response,
+)
+from src.routers.dashboard import (
+    get_job_filters,
+    get_repository,
+    get_version_tracker,
+)
+
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+
+def get_job_name_index(request: Request) -> JobNameIndexStore:
+    """Dependency injection for the shared job name typeahead index."""
+    return request.app.state.job_name_index
+
+
+def get_similarity_index(request: Request) -> SimilarityIndexStore:
+    """Dependency injection for the shared similar-jobs index."""
+    return request.app.state.similarity_index
+
+
+def get_description_index(request: Request) -> DescriptionIndexStore:
+    """Dependency injection for the memory-mapped job description index."""
+    return request.app.state.description_index
+
+
+@router.get("/job-names/suggest", response_model=JobNameSuggestions, response_class=ORJSONResponse)
+async def suggest_job_names(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100, description="Typed search text"),
+    limit: int = Query(10, ge=1, le=50, description="Max suggestions"),
+    index_store: JobNameIndexStore = Depends(get_job_name_index),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+) -> Response:
+    """
+    Suggest job families and job names containing ``q`` (case-insensitive).
+
+    Answered from the in-memory index of the current data version, without MySQL.
+    Matching job families come first, then job names starting with ``q``, then job
+    names containing it; each group is ranked by job count.
+
+    Args:
+        request: Incoming request (conditional headers)
+        q: Typed search text
+        limit: Max number of suggestions
+        index_store: Job name typeahead index (injected)
+        version_tracker: Current data version (injected)
+
+    Returns:
+        Suggestions, best first
+    """
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    index = await index_store.get(version.id)
+    body = orjson.dumps(
+        {
+            "suggestions": [
+                {"label": s.label, "kind": s.kind, "count": s.count}
+                for s in index.suggest(q, limit)
+            ]
+        }
+    )
+    return versioned_response(request, body, version)
+
+
+def encode_cursor(appear_date: date, job_uid: int) -> str:
+    """Opaque page cursor from the last job's ``(appear_date, id)``."""
+    return base64.urlsafe_b64encode(f"{appear_date.isoformat()}_{job_uid}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> JobCursor:
+    """Inverse of ``encode_cursor``; malformed cursors are rejected with 422."""
+    try:
+        appear_date, job_uid = base64.urlsafe_b64decode(cursor.encode()).decode().split("_")
+        return date.fromisoformat(appear_date), int(job_uid)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail="Invalid cursor") from exc
+
+
+def render_job(row: JobRow) -> dict[str, Any]:
+    """Job row to a ``JobPosting``-shaped dict."""
+    (uid, job_id, job_name, job_family, company, area, region, s_min, s_max, monthly, day) = row
+    return {
+        "id": uid,
+        "jobId": job_id,
+        "jobName": job_name,
+        "jobFamily": job_family,
+        "company": company,
+        "area": area,
+        "region": region,
+        "salaryMin": s_min,
+        "salaryMax": s_max,
+        "salaryMonthly": monthly,
+        "appearDate": day.isoformat(),
+    }
+
+
+@router.get("/jobs", response_model=JobPage, response_class=ORJSONResponse)
+async def list_jobs(
+    request: Request,
+    filters: JobFilters = Depends(get_job_filters),
+    cursor: str | None = Query(None, description="nextCursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Jobs per page"),
+    repo: AsyncDatabaseRepository = Depends(get_repository),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+) -> Response:
+    """
+    List matching jobs, newest first, with keyset pagination.
+
+    Pages continue after the ``(appear_date, id)`` encoded in ``cursor`` instead of
+    using an OFFSET, so a deep page costs the same as the first one. The filters match
+    the dashboard panels (e.g. a skills bar is ``skill=<label>``, a salary bar is its
+    ``salary_min``/``salary_max``), so the jobs behind a chart can be listed.
+
+    Args:
+        request: Incoming request (conditional and ``Accept-Encoding`` headers)
+        filters: The dashboard filters (job_name, job_family, area, region, skill,
+            salary_type, edu, work_exp, salary and date ranges), injected
+        cursor: Cursor of the previous page; first page when omitted
+        limit: Page size
+        repo: Database repository (injected)
+        version_tracker: Current data version (injected)
+
+    Returns:
+        One page of jobs and the cursor of the next page (None on the last page)
+    """
+    after = decode_cursor(cursor) if cursor else None
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    # One extra row tells whether another page follows
+    rows = await repo.fetch_jobs(filters, after, limit + 1)
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1][-1], page[-1][0]) if len(rows) > limit else None
+    body = orjson.dumps({"jobs": [render_job(row) for row in page], "nextCursor": next_cursor})
+    return versioned_response(request, body, version)
+
+
+@router.get("/jobs/search", response_model=JobSearchResults, response_class=ORJSONResponse)
+async def search_job_descriptions(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=100, description="Words or CJK phrases"),
+    offset: int = Query(0, ge=0, le=10_000, description="Matches to skip"),
+    limit: int = Query(20, ge=1, le=100, description="Jobs per page"),
+    index_store: DescriptionIndexStore = Depends(get_description_index),
+    repo: AsyncDatabaseRepository = Depends(get_repository),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+) -> Response:
+    """
+    Jobs whose description contains every term of ``q``, newest first.
+
+    ``q`` is tokenized like the descriptions (Latin words, CJK bigrams) and the sorted
+    postings of its terms are intersected in the memory-mapped index the ETL publishes;
+    only the listing rows of the returned page are read from MySQL. Matches live in
+    memory-mapped arrays, so ``offset`` paging costs nothing extra.
+
+    Args:
+        request: Incoming request (conditional and ``Accept-Encoding`` headers)
+        q: Search text, e.g. ``Kubernetes`` or ``微服務``
+        offset: Number of matches to skip
+        limit: Page size
+        index_store: Job description index (injected)
+        repo: Database repository (injected)
+        version_tracker: Current data version (injected)
+
+    Returns:
+        The number of matching jobs and one page of them
+    """
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    index = await index_store.get(version.id)
+    if index is None:
+        raise HTTPException(status_code=503, detail="Description index is not built yet")
+    total, job_uids = await run_sync(index.search, q, offset, limit)
+    rows = {row[0]: row for row in await repo.fetch_jobs_by_ids(job_uids)}
+    body = orjson.dumps(
+        {
+            "query": q,
+            "total": total,
+            "jobs": [render_job(rows[uid]) for uid in job_uids if uid in rows],
+        }
+    )
+    return versioned_response(request, body, version)
+
+
+@router.get("/jobs/{job_uid}/similar", response_model=SimilarJobs, response_class=ORJSONResponse)
+async def get_similar_jobs(
+    request: Request,
+    job_uid: int,
+    limit: int = Query(10, ge=1, le=50, description="Max similar jobs"),
+    index_store: SimilarityIndexStore = Depends(get_similarity_index),
+    repo: AsyncDatabaseRepository = Depends(get_repository),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+) -> Response:
+    """
+    Jobs most similar to job ``job_uid`` (``dim_job.id``).
+
+    Similarity is the cosine of TF-IDF vectors over the jobs' skills, specialties,
+    categories and description bigrams, searched in the in-memory index of the current
+    data version; only the neighbours' listing rows are read from MySQL.
+
+    Args:
+        request: Incoming request (conditional and ``Accept-Encoding`` headers)
+        job_uid: Job id, as ``id`` in ``/api/jobs``
+        limit: Max number of similar jobs
+        index_store: Similar-jobs index (injected)
+        repo: Database repository (injected)
+        version_tracker: Current data version (injected)
+
+    Returns:
+        Similar jobs with their scores, most similar first
+    """
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    index = await index_store.get(version.id)
+    if job_uid not in index.rows:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_uid}")
+    similar = (await run_sync(index.search, [job_uid], limit))[job_uid]
+    rows = {row[0]: row for row in await repo.fetch_jobs_by_ids([s.job_uid for s in similar])}
+    body = orjson.dumps(
+        {
+            "id": job_uid,
+            "similar": [
+                {**render_job(rows[s.job_uid]), "score": s.score}
+                for s in similar
+                if s.job_uid in rows
+            ],
+        }
+    )
+    return versioned_response(request, body, version)
+
+
+@router.get("/export")
+async def export_jobs(
+    fmt: Literal["csv", "parquet"] = Query("csv", alias="format", description="csv or parquet"),
+    filters: JobFilters = Depends(get_job_filters),
+    repo: AsyncDatabaseRepository = Depends(get_repository),
+) -> StreamingResponse:
+    """
+    Export the matching jobs with details and skill/specialty/category/major/language lists.
+
+    Takes the same filters as ``/api/jobs``. Rows are streamed from a server-side cursor
+    and encoded batch by batch (one Parquet row group per batch), so memory use does not
+    depend on the size of the export.
+    """
+    if fmt == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    columns = DatabaseRepository.EXPORT_COLUMNS
+    try:
+        batches = repo.open_export(filters)
+    except ExportLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"}) from e
+    chunks = csv_chunks(columns, batches) if fmt == "csv" else parquet_chunks(columns, batches)
+    filename = f"jobs-{date.today():%Y%m%d}.{fmt}"
+    # A sync iterator: Starlette pulls each chunk in a worker thread
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
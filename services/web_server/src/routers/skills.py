@@ -0,0 +1,124 @@
+"""Skill co-occurrence and rising skills API router."""
+
+from typing import Literal
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from src.db import DataVersionTracker, SkillGraphStore
+from src.models import RelatedSkills, RisingSkills
+from src.responses import (
+    ORJSONResponse,
+    is_not_modified,
+    not_modified_response,
+    versioned_response,
+)
+from src.routers.dashboard import get_version_tracker, normalize_job_family
+
+router = APIRouter(prefix="/api/skills", tags=["skills"])
+
+# bridge_skills (skill tags) or bridge_specialties (specialties)
+SkillKind = Literal["skill", "specialty"]
+
+
+def get_skill_graphs(request: Request) -> SkillGraphStore:
+    """Dependency injection for the shared skill co-occurrence graphs."""
+    return request.app.state.skill_graphs
+
+
+@router.get("/related", response_model=RelatedSkills, response_class=ORJSONResponse)
+async def get_related_skills(
+    request: Request,
+    skill: str = Query(..., min_length=1, max_length=250, description="Skill name"),
+    kind: SkillKind = Query("skill", description="skill or specialty"),
+    limit: int = Query(10, ge=1, le=50, description="Max related skills"),
+    graphs: SkillGraphStore = Depends(get_skill_graphs),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+) -> Response:
+    """
+    Skills most often required together with ``skill``.
+
+    Answered from the co-occurrence matrix precomputed for the current data version, so
+    no bridge table self-join runs per request.
+
+    Args:
+        request: Incoming request (conditional headers)
+        skill: Skill name (exact, or case-insensitive when no exact match)
+        kind: Skill tags or specialties
+        limit: Max number of related skills
+        graphs: Skill co-occurrence graphs (injected)
+        version_tracker: Current data version (injected)
+
+    Returns:
+        The skill's job count and its related skills with the share of its jobs
+    """
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    graph = await graphs.get(version.id, kind)
+    code = graph.code(skill)
+    if code is None:
+        raise HTTPException(status_code=404, detail=f"Unknown {kind}: {skill}")
+    body = orjson.dumps(
+        {
+            "skill": graph.labels[code],
+            "jobCount": int(graph.job_counts[code]),
+            "related": [
+                {"label": r.label, "jobCount": r.job_count, "share": r.share}
+                for r in graph.related(code, limit)
+            ],
+        }
+    )
+    return versioned_response(request, body, version)
+
+
+@router.get("/rising", response_model=RisingSkills, response_class=ORJSONResponse)
+async def get_rising_skills(
+    request: Request,
+    weeks: int = Query(4, ge=1, le=26, description="Length of each compared window"),
+    job_family: str | None = Query(None, description="Filter by job family (exact match)"),
+    kind: SkillKind = Query("skill", description="skill or specialty"),
+    limit: int = Query(10, ge=1, le=50, description="Max skills"),
+    graphs: SkillGraphStore = Depends(get_skill_graphs),
+    version_tracker: DataVersionTracker = Depends(get_version_tracker),
+) -> Response:
+    """
+    Fastest-growing skills: the latest ``weeks`` weeks vs. the ``weeks`` before them.
+
+    Computed from the weekly counts the ETL maintains incrementally. Skills with fewer
+    than ``SkillGraph.MIN_RISING_COUNT`` recent jobs are left out.
+
+    Args:
+        request: Incoming request (conditional headers)
+        weeks: Number of weeks in each window
+        job_family: Optional job family filter
+        kind: Skill tags or specialties
+        limit: Max number of skills
+        graphs: Skill co-occurrence graphs (injected)
+        version_tracker: Current data version (injected)
+
+    Returns:
+        The recent window and its skills, fastest growing first
+    """
+    version = await version_tracker.current()
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    graph = await graphs.get(version.id, kind)
+    window, rising = graph.rising(weeks, normalize_job_family(job_family), limit)
+    body = orjson.dumps(
+        {
+            "weeks": weeks,
+            "recentFrom": window[0].isoformat() if window else None,
+            "recentTo": window[1].isoformat() if window else None,
+            "skills": [
+                {
+                    "label": s.label,
+                    "recentCount": s.recent,
+                    "previousCount": s.previous,
+                    "growth": s.growth,
+                }
+                for s in rising
+            ],
+        }
+    )
+    return versioned_response(request, body, version)
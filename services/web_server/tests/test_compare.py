@@ -0,0 +1,54 @@
+"""The grouped compare queries must return what one single-term query per term returns."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+
+from src.db import DatabaseRepository, JobFilters
+from src.db.async_repository import COMPARE_QUERIES, PANEL_QUERIES
+
+NAMES_QUERY = """
+SELECT job_name FROM dim_job
+WHERE CHAR_LENGTH(job_name) >= 2
+ORDER BY appear_date DESC, id DESC
+LIMIT 200
+"""
+
+
+@pytest.fixture(scope="module")
+def terms(engine: sa.Engine) -> list[str]:
+    """Two ngram-searchable terms and a one-character term, which falls back to LIKE."""
+    with engine.connect() as conn:
+        names = conn.execute(sa.text(NAMES_QUERY)).scalars().all()
+    prefixes = list(dict.fromkeys(name[: DatabaseRepository.NGRAM_TOKEN_SIZE] for name in names))
+    if len(prefixes) < 2:
+        pytest.skip("dim_job has too few distinct job names to compare")
+    return [*prefixes[:2], prefixes[0][0]]
+
+
+def normalize(panel: str, rows: Any) -> Any:
+    """Rows in a comparable form: order among equal values is not defined."""
+    if panel == "meta":
+        return int(rows)
+    if panel == "skills":
+        # Skills tied at the ``limit`` cut may differ by name, never by count
+        return sorted(int(value) for _, value in rows)
+    return sorted((tuple(row) for row in rows), key=repr)
+
+
+@pytest.mark.parametrize("scoped", [False, True], ids=["all", "area"])
+@pytest.mark.parametrize("panel", list(COMPARE_QUERIES))
+def test_compare_matches_single_term_queries(repository, filter_values, terms, panel, scoped):
+    filters = JobFilters(area=filter_values["area"]) if scoped else JobFilters()
+
+    grouped = getattr(repository, COMPARE_QUERIES[panel])(terms, filters)
+
+    _, method = PANEL_QUERIES[panel]
+    assert list(grouped) == terms
+    for term in terms:
+        single = getattr(repository, method)(replace(filters, job_name=term))
+        assert normalize(panel, grouped[term]) == normalize(panel, single), term
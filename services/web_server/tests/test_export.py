@@ -0,0 +1,51 @@
+"""The job export streams every matching row without holding the result in memory."""
+
+from __future__ import annotations
+
+import pytest
+import sqlalchemy as sa
+
+from src.db import DatabaseRepository, JobFilters
+
+BATCH_SIZE = 50
+
+
+@pytest.fixture(params=["area", "date_from"])
+def filters(request, filter_values) -> JobFilters:
+    """A filter matching a day's or an area's jobs: more than one batch, not the table."""
+    return JobFilters(**{request.param: filter_values[request.param]})
+
+
+def test_export_streams_matching_jobs_in_batches(engine, repository, filters):
+    conditions, params = repository._job_filter(filters, alias="dj")
+    query = f"""
+    SELECT dj.id FROM dim_job dj
+    {repository._where(conditions)}
+    ORDER BY dj.appear_date DESC, dj.id DESC
+    """
+    with engine.connect() as conn:
+        expected = conn.execute(sa.text(query), params).scalars().all()
+
+    batches = list(repository.stream_jobs_export(filters, batch_size=BATCH_SIZE))
+
+    assert all(0 < len(batch) <= BATCH_SIZE for batch in batches)
+    rows = [row for batch in batches for row in batch]
+    assert all(len(row) == len(DatabaseRepository.EXPORT_COLUMNS) for row in rows)
+    assert [row[0] for row in rows] == expected
+    assert engine.pool.checkedout() == 0
+
+
+def test_closing_export_early_releases_the_connection(engine, repository):
+    """A client that disconnects mid-download must not leave a connection checked out.
+
+    With mysql-connector the unread rows are not drained: the connection is invalidated
+    and the pool opens a new one for the next query.
+    """
+    batches = repository.stream_jobs_export(JobFilters(), batch_size=BATCH_SIZE)
+
+    assert len(next(batches)) == BATCH_SIZE
+    batches.close()
+
+    assert engine.pool.checkedout() == 0
+    with engine.connect() as conn:
+        assert conn.execute(sa.text("SELECT 1")).scalar() == 1
@@ -0,0 +1,57 @@
+"""Query plans of the dashboard panels: every filter must be served by a ``dim_job`` index."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.db import DatabaseRepository, JobFilters
+from src.db.async_repository import PANEL_QUERIES
+
+PANEL_METHODS = [
+    *(method for _, method in PANEL_QUERIES.values()),
+    "get_salary_percentiles",
+    "get_jobs",
+]
+# Filters without an index of their own: idx_location and idx_edu_exp lead with another
+# filter column, so these are checked together with it
+COMPANION_FILTERS = {"region": ("area",), "work_exp": ("edu",)}
+# dim_job as named in the EXPLAIN output (aliased ``dj`` in most queries)
+DIM_JOB = ("dim_job", "dj")
+
+
+@pytest.mark.parametrize("field", list(DatabaseRepository.FILTER_COLUMNS))
+@pytest.mark.parametrize("method", PANEL_METHODS)
+def test_filtered_panel_does_not_scan_dim_job(
+    repository, filter_values, query_plans, method, field
+):
+    fields = (*COMPANION_FILTERS.get(field, ()), field)
+    filters = JobFilters(**{name: filter_values[name] for name in fields})
+
+    plans = query_plans(lambda: getattr(repository, method)(filters))
+
+    assert plans
+    for statement, plan in plans:
+        scans = [row for row in plan if row["type"] == "ALL" and row["table"] in DIM_JOB]
+        assert not scans, f"{method}({filters}) scans dim_job in full:\n{statement}\n{plan}"
+
+
+@pytest.mark.parametrize(
+    ("field", "index"),
+    [(None, "idx_appear_id"), ("area", "idx_area_appear"), ("job_family", "idx_family_appear")],
+)
+def test_job_listing_reads_pages_in_index_order(
+    repository, filter_values, query_plans, field, index
+):
+    """Each listing page is a range of ``index`` read newest first, without a filesort.
+
+    idx_location also leads with address_area, but continues with address_region, so an
+    area-only listing could not read it in (appear_date, id) order; idx_area_appear is
+    kept for that.
+    """
+    filters = JobFilters(**({field: filter_values[field]} if field else {}))
+
+    [(statement, plan)] = query_plans(lambda: repository.get_jobs(filters))
+
+    [row] = [row for row in plan if row["table"] in DIM_JOB]
+    assert row["key"] == index, f"{statement}\n{plan}"
+    assert "filesort" not in (row["Extra"] or ""), f"{statement}\n{plan}"
@@ -0,0 +1,150 @@
+"""SimilarityIndex checked against dense TF-IDF cosine similarity."""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.db.similar import SimilarityIndex, SimilarityIndexStore, tokenize_description
+
+K = 5
+
+
+def random_documents(seed: int, n_jobs: int = 40) -> dict[int, Counter[str]]:
+    rng = random.Random(seed)
+    terms = [f"{field}:{i}" for field in "spcd" for i in range(15)]
+    return {1000 + uid: Counter(rng.choices(terms, k=rng.randint(0, 12))) for uid in range(n_jobs)}
+
+
+def dense_weights(documents: dict[int, Counter[str]]) -> tuple[list[int], np.ndarray]:
+    """Row-normalized TF-IDF matrix built term by term, as documented on the index."""
+    uids = list(documents)
+    terms = sorted({term for counts in documents.values() for term in counts})
+    tf = np.array([[documents[uid][term] for term in terms] for uid in uids], dtype=float)
+    n = len(uids)
+    df = (tf > 0).sum(axis=0)
+    fields = np.array([term[0] for term in terms])
+    field_weight = np.array([SimilarityIndex.FIELD_WEIGHTS[field] for field in fields])
+    useful = (df >= 2) & ((fields != "d") | (df <= SimilarityIndex.MAX_DF_RATIO * n))
+    idf = np.log((1 + n) / (1 + df)) + 1
+    weights = np.where(tf > 0, 1 + np.log(np.maximum(tf, 1)), 0) * np.where(
+        useful, idf * field_weight, 0
+    )
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return uids, np.divide(weights, norms, out=np.zeros_like(weights), where=norms > 0)
+
+
+def assert_matches_dense(index: SimilarityIndex, documents: dict[int, Counter[str]]) -> None:
+    uids, weights = dense_weights(documents)
+    scores = weights @ weights.T
+    np.fill_diagonal(scores, 0)
+    results = index.search(uids, k=K)
+    for row, uid in enumerate(uids):
+        expected = sorted((score for score in scores[row] if score > 1e-6), reverse=True)[:K]
+        found = results[uid]
+        assert [neighbour.score for neighbour in found] == pytest.approx(expected, abs=1e-4)
+        for neighbour in found:
+            # Ties may be broken either way, but each score must be the pair's cosine
+            other = uids.index(neighbour.job_uid)
+            assert neighbour.score == pytest.approx(scores[row, other], abs=1e-4)
+
+
+def build(documents: dict[int, Counter[str]]) -> SimilarityIndex:
+    index = SimilarityIndex()
+    index.add(documents)
+    index.reweight()
+    return index
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_search_matches_dense_cosine(seed):
+    documents = random_documents(seed)
+
+    assert_matches_dense(build(documents), documents)
+
+
+def test_search_in_small_batches(monkeypatch):
+    monkeypatch.setattr(SimilarityIndex, "MAX_SCORE_CELLS", 50)
+    documents = random_documents(seed=3)
+
+    assert_matches_dense(build(documents), documents)
+
+
+def test_updates_match_a_fresh_build():
+    documents = random_documents(seed=4)
+    index = build(documents)
+    published = index.search(list(documents), k=K)
+
+    updated = index.copy()
+    removed = list(documents)[:15]
+    updated.remove(removed)
+    changed = {uid: Counter({"s:new": 2, "p:1": 1}) for uid in list(documents)[15:20]}
+    updated.add(changed)
+    assert updated.dead_term_ratio > 0
+    updated.compact()
+    updated.reweight()
+
+    current = {uid: counts for uid, counts in documents.items() if uid not in removed}
+    current.update(changed)
+    assert updated.dead_term_ratio == 0
+    assert len(updated.vocabulary) == len({term for counts in current.values() for term in counts})
+    assert_matches_dense(updated, current)
+    # The copy being updated never touches the published index
+    assert index.search(list(documents), k=K) == published
+
+
+class FakeRepository:
+    """Jobs as term lists, with the data version that last loaded each one."""
+
+    def __init__(self) -> None:
+        self.jobs: dict[int, list[tuple[str, int]]] = {}
+        self.loaded: dict[int, int] = {}
+
+    def get_job_uids(self) -> list[int]:
+        return list(self.jobs)
+
+    def get_job_uids_loaded_after(self, version: int) -> list[int]:
+        return [uid for uid, loaded in self.loaded.items() if loaded > version]
+
+    def get_similarity_documents(self, job_uids):
+        terms = [(uid, field, term) for uid in job_uids for field, term in self.jobs[uid]]
+        return terms, []
+
+
+def test_store_reindexes_jobs_reloaded_by_the_etl():
+    repository = FakeRepository()
+    for uid in range(20):
+        repository.jobs[uid] = [("s", uid % 4), ("c", uid % 3)]
+        repository.loaded[uid] = 1
+    store = SimilarityIndexStore(repository)
+    index = store._update(store._index, 1)
+
+    # Job 0 is re-crawled with other skills, jobs 10.. are archived
+    repository.jobs[0] = [("s", 1), ("c", 1)]
+    repository.loaded[0] = 2
+    for uid in range(10, 20):
+        del repository.jobs[uid], repository.loaded[uid]
+    updated = store._update(index, 2)
+
+    documents = {
+        uid: Counter(f"{field}:{term}" for field, term in terms)
+        for uid, terms in repository.jobs.items()
+    }
+    assert sorted(updated.job_uids.tolist()) == sorted(documents)
+    assert_matches_dense(updated, documents)
+
+
+def test_tokenize_description():
+    assert tokenize_description("Python 後端工程師, C++ 與 Go") == [
+        "python",
+        "c++",
+        "go",
+        "後端",
+        "端工",
+        "工程",
+        "程師",
+        "與",
+    ]
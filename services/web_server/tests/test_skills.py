@@ -0,0 +1,77 @@
+"""SkillGraph co-occurrence checked against a dense ``A.T @ A``."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.db.skills import RelatedSkill, SkillGraph
+
+N_SKILLS = 12
+# Dictionary ids are sparse; 999 is not in the dictionary and must be ignored
+SKILL_IDS = list(range(10, 10 + 2 * N_SKILLS, 2))
+UNKNOWN_ID = 999
+
+
+def random_incidence(seed: int, n_jobs: int = 80) -> tuple[np.ndarray, list[tuple[int, int]]]:
+    """A random job x skill matrix and its (job_uid, skill_id) rows, ordered by job_uid."""
+    rng = np.random.default_rng(seed)
+    matrix = rng.random((n_jobs, N_SKILLS)) < 0.3
+    incidence = [(100 + int(job), SKILL_IDS[skill]) for job, skill in np.argwhere(matrix)]
+    incidence += [(100 + int(job), UNKNOWN_ID) for job in rng.choice(n_jobs, 5, replace=False)]
+    return matrix.astype(np.int64), sorted(incidence)
+
+
+def build(incidence: list[tuple[int, int]]) -> SkillGraph:
+    names = [(skill_id, f"skill-{skill_id}") for skill_id in SKILL_IDS]
+    return SkillGraph(1, "skill", names, incidence, [])
+
+
+@pytest.mark.parametrize("pair_chunk", [SkillGraph.PAIR_CHUNK, 7], ids=["one-chunk", "chunked"])
+@pytest.mark.parametrize("seed", range(3))
+def test_cooccurrence_pairs_match_dense_product(monkeypatch, seed, pair_chunk):
+    monkeypatch.setattr(SkillGraph, "PAIR_CHUNK", pair_chunk)
+    matrix, incidence = random_incidence(seed)
+
+    graph = build(incidence)
+    keys, counts = graph._cooccurrence_pairs()
+
+    cooccurrence = matrix.T @ matrix
+    np.fill_diagonal(cooccurrence, 0)
+    rows, cols = np.nonzero(cooccurrence)
+    assert keys.tolist() == (rows * N_SKILLS + cols).tolist()
+    assert counts.tolist() == cooccurrence[rows, cols].tolist()
+    assert graph.job_counts.tolist() == np.diag(matrix.T @ matrix).tolist()
+
+
+@pytest.mark.parametrize("top_related", [SkillGraph.TOP_RELATED, 3])
+def test_related_is_top_of_dense_row(monkeypatch, top_related):
+    monkeypatch.setattr(SkillGraph, "TOP_RELATED", top_related)
+    matrix, incidence = random_incidence(seed=7)
+    cooccurrence = matrix.T @ matrix
+
+    graph = build(incidence)
+
+    for code in range(N_SKILLS):
+        # Largest count first, ties by dictionary order
+        others = sorted(
+            (other for other in range(N_SKILLS) if other != code and cooccurrence[code, other]),
+            key=lambda other: (-cooccurrence[code, other], other),
+        )[: min(top_related, 5)]
+        expected = [
+            RelatedSkill(
+                f"skill-{SKILL_IDS[other]}",
+                int(cooccurrence[code, other]),
+                round(int(cooccurrence[code, other]) / int(cooccurrence[code, code]), 4),
+            )
+            for other in others
+        ]
+        assert graph.related(code, limit=5) == expected
+
+
+def test_empty_graph():
+    graph = build([])
+
+    assert graph.nnz == 0
+    assert graph.related(0) == []
+    assert graph.code("SKILL-10") == 0
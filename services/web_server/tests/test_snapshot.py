@@ -0,0 +1,194 @@
+"""JobSnapshot and SubstringIndex checked against brute-force filtering in Python."""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from src.db.repository import DatabaseRepository, JobFilters
+from src.db.snapshot import JobSnapshot, SubstringIndex
+
+FAMILIES = ["軟體工程", "資料科學", "Data", "data ", None]
+AREAS = ["台北市", "新北市", "台中市", None]
+REGIONS = ["信義區", "板橋區", "西屯區", None]
+EDUS = ["大學", "碩士", None]
+WORK_EXPS = ["不拘", "3年以上", None]
+INDUSTRIES = ["軟體業", "金融業", None]
+SKILLS = ["Python", "python", "SQL", "Go", "Docker", "AWS"]
+NAME_CHARS = "ABab後端工程師資料"
+START = date(2024, 1, 1)
+
+
+def random_name(rng: random.Random) -> str:
+    return "".join(rng.choices(NAME_CHARS, k=rng.randint(0, 8)))
+
+
+def random_jobs(seed: int, n_jobs: int = 200) -> tuple[list[tuple], list[tuple[int, str]]]:
+    rng = random.Random(seed)
+    job_rows = [
+        (
+            uid,
+            START + timedelta(days=rng.randrange(45)),
+            rng.choice([None, *range(20000, 130000, 5000)]),
+            rng.choice(AREAS),
+            rng.choice(REGIONS),
+            rng.choice([None, 10, 50]),
+            rng.choice(EDUS),
+            rng.choice(WORK_EXPS),
+            rng.choice(FAMILIES),
+            rng.choice(INDUSTRIES),
+            rng.random() < 0.8,
+            rng.choice([None, random_name(rng)]),
+            rng.random() < 0.7,
+        )
+        for uid in range(100, 100 + 2 * n_jobs, 2)
+    ]
+    # Includes bridge rows of job uids that are not in dim_job (odd ids)
+    skill_rows = [
+        (uid, skill)
+        for uid in range(90, 100 + 2 * n_jobs + 10)
+        for skill in rng.sample(SKILLS, rng.randint(0, 3))
+    ]
+    return job_rows, skill_rows
+
+
+def fold(value: str) -> str:
+    return value.strip().casefold()
+
+
+def random_filters(rng: random.Random) -> JobFilters:
+    def maybe(values: list) -> object:
+        value = rng.choice(values) if rng.random() < 0.2 else None
+        if isinstance(value, str) and rng.random() < 0.5:
+            # The collation of the columns ignores case; stray spaces are trimmed
+            value = rng.choice([str.upper, str.lower, str.title])(value) + " " * rng.randint(0, 1)
+        return value
+
+    date_from = maybe([START + timedelta(days=d) for d in range(0, 50, 7)])
+    return JobFilters(
+        job_name=maybe(["a", "B", "工程", "資料", "ab後", "zz"]),
+        job_family=maybe([*FAMILIES[:-1], "不存在"]),
+        area=maybe(AREAS[:-1]),
+        region=maybe(REGIONS[:-1]),
+        skill=maybe([*SKILLS, "Rust"]),
+        salary_type=maybe([10, 50]),
+        edu=maybe(EDUS[:-1]),
+        work_exp=maybe(WORK_EXPS[:-1]),
+        salary_min=maybe([30000, 45000, 80000]),
+        salary_max=maybe([40000, 60000, 100000]),
+        date_from=date_from,
+        date_to=maybe([START + timedelta(days=d) for d in range(10, 50, 7)]),
+    )
+
+
+def matches(job: tuple, skills: set[str], filters: JobFilters) -> bool:
+    """One job against the filters, spelled out like ``DatabaseRepository._job_filter``."""
+    (_, day, salary, area, region, salary_type, edu, work_exp, family, _, _, name, _) = job
+    for value, column in (
+        (filters.job_family, family),
+        (filters.area, area),
+        (filters.region, region),
+        (filters.edu, edu),
+        (filters.work_exp, work_exp),
+    ):
+        if value and (column is None or fold(column) != fold(value)):
+            return False
+    if filters.salary_type is not None and salary_type != filters.salary_type:
+        return False
+    if filters.salary_min is not None and (salary is None or salary < filters.salary_min):
+        return False
+    if filters.salary_max is not None and (salary is None or salary >= filters.salary_max):
+        return False
+    if filters.date_from is not None and day < filters.date_from:
+        return False
+    if filters.date_to is not None and day > filters.date_to:
+        return False
+    if filters.skill and fold(filters.skill) not in {fold(skill) for skill in skills}:
+        return False
+    return not filters.job_name or (name is not None and filters.job_name.lower() in name.lower())
+
+
+def assert_counts(rows: list[tuple[str, int]], expected: Counter[str]) -> None:
+    """Same counts per label, largest first (ties may come in either order)."""
+    assert dict(rows) == dict(expected)
+    assert len(rows) == len(expected)
+    counts = [count for _, count in rows]
+    assert counts == sorted(counts, reverse=True)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_substring_index_matches_brute_force(seed: int) -> None:
+    rng = random.Random(seed)
+    names = [random_name(rng) for _ in range(300)]
+    index = SubstringIndex(names)
+    terms = [random_name(rng)[:4] for _ in range(50)]
+    terms += [name[i : i + n] for name in rng.sample(names, 30) for i, n in [(1, 2), (0, 3)]]
+    for term in filter(None, terms):
+        expected = [row for row, name in enumerate(names) if term.lower() in name.lower()]
+        assert index.search(term).tolist() == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_snapshot_panels_match_brute_force(seed: int) -> None:
+    job_rows, skill_rows = random_jobs(seed)
+    snapshot = JobSnapshot(1, job_rows, skill_rows)
+    skills_of: dict[int, set[str]] = {}
+    for uid, skill in skill_rows:
+        skills_of.setdefault(uid, set()).add(skill)
+
+    rng = random.Random(seed)
+    for filters in [JobFilters(), *(random_filters(rng) for _ in range(40))]:
+        jobs = [job for job in job_rows if matches(job, skills_of.get(job[0], set()), filters)]
+        assert snapshot.get_total_jobs(filters) == len(jobs)
+
+        assert_counts(snapshot.get_jobs_by_region(filters), Counter(job[3] or "" for job in jobs))
+        assert_counts(
+            snapshot.get_jobs_by_industry(filters),
+            Counter(job[9] or "" for job in jobs if job[10]),
+        )
+        skill_counts = Counter(skill for job in jobs for skill in skills_of.get(job[0], ()))
+        top = snapshot.get_top_skills(filters, limit=3)
+        assert [count for _, count in top] == sorted(skill_counts.values(), reverse=True)[:3]
+        assert all(skill_counts[label] == count for label, count in top)
+
+        salaries = [job[2] for job in jobs if job[2] is not None]
+        expected_buckets = [
+            (label, sum(lower <= s < upper for s in salaries))
+            for label, lower, upper in DatabaseRepository.SALARY_BUCKETS
+        ]
+        assert snapshot.get_salary_distribution(filters) == [
+            bucket for bucket in expected_buckets if bucket[1]
+        ]
+        percentiles = snapshot.get_salary_percentiles(filters)
+        if salaries:
+            expected = np.percentile(salaries, [25, 50, 75])
+            assert list(percentiles.values()) == pytest.approx(expected)
+        else:
+            assert percentiles == {25: None, 50: None, 75: None}
+
+        days = sorted({job[1] for job in jobs}, reverse=True)[: DatabaseRepository.TREND_DAYS]
+        expected_trend = []
+        for day in days:
+            of_day = [job for job in jobs if job[1] == day]
+            paid = [job[2] for job in of_day if job[2] is not None]
+            average = sum(paid) / len(paid) if paid else None
+            unique = sum(job[12] for job in of_day)
+            expected_trend.append((day, len(of_day), average, unique))
+        trend = snapshot.get_job_count_by_date(filters)
+        assert [(d, n, u) for d, n, _, u in trend] == [(d, n, u) for d, n, _, u in expected_trend]
+        assert [avg for _, _, avg, _ in trend] == pytest.approx(
+            [avg for _, _, avg, _ in expected_trend]
+        )
+
+
+def test_empty_snapshot() -> None:
+    snapshot = JobSnapshot(1, [], [(1, "Python")])
+    assert snapshot.get_total_jobs() == 0
+    assert snapshot.get_jobs_by_region() == []
+    assert snapshot.get_top_skills() == []
+    assert snapshot.get_job_count_by_date() == []
+    assert snapshot.get_salary_percentiles() == {25: None, 50: None, 75: None}